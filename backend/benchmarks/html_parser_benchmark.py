@@ -0,0 +1,101 @@
+"""
+Micro-benchmark for the HTML parsing backends.
+Parses saved pages with every available backend, runs the scraper's parser
+for the page type on each, and reports time per page alongside any fields
+whose values differ from the html.parser baseline.
+
+benchmarks/fixtures/ holds an Amazon product page, an Amazon search page and
+a business website (what Maps enrichment fetches), with identifying data
+replaced by placeholders. The file name prefix picks the parser
+(amazon_product*, amazon_search*, website*). More pages can be saved there
+(e.g. `page.content()` or a browser "Save page as... HTML only"); run from
+the backend directory:
+
+    python -m benchmarks.html_parser_benchmark
+    python -m benchmarks.html_parser_benchmark path/to/page.html --iterations 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from scrapers.html_parsing import available_backends
+from scrapers.amazon.amazon_parsers import parse_product_html, parse_search_html
+from scrapers.googlemap.google_maps_parsers import parse_website_html
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# Fixture file name prefix -> parser; pages matching none are parsed as products
+PARSERS = {
+    "amazon_search": parse_search_html,
+    "website": parse_website_html,
+    "amazon_product": parse_product_html,
+}
+
+
+def parser_for(path: Path):
+    for prefix, parse in PARSERS.items():
+        if path.name.startswith(prefix):
+            return parse
+    return parse_product_html
+
+
+def time_backend(parse, html: str, backend: str, iterations: int) -> list:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parse(html, backend)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on saved pages")
+    parser.add_argument("fixtures", nargs="*", type=Path, help="HTML files or directories (default: benchmarks/fixtures)")
+    parser.add_argument("--iterations", type=int, default=20, help="Parses per page per backend")
+    args = parser.parse_args()
+
+    paths = []
+    for target in args.fixtures or [DEFAULT_FIXTURES]:
+        paths.extend(sorted(target.glob("*.html")) if target.is_dir() else [target])
+    if not paths:
+        print(f"No fixture pages found. Save page HTML into {DEFAULT_FIXTURES}")
+        return 1
+
+    backends = available_backends()
+    print(f"Backends: {', '.join(backends)} | iterations: {args.iterations}\n")
+
+    totals = {backend: [] for backend in backends}
+    for path in paths:
+        html = path.read_text(encoding="utf-8", errors="replace")
+        parse = parser_for(path)
+        baseline = parse(html, "html.parser")
+        print(f"{path.name} ({len(html) / 1024:.0f} KB, {parse.__name__})")
+
+        for backend in backends:
+            timings = time_backend(parse, html, backend, args.iterations)
+            totals[backend].extend(timings)
+            result = parse(html, backend)
+            diffs = sorted(key for key in set(baseline) | set(result) if baseline.get(key) != result.get(key))
+            print(
+                f"  {backend:<12} median {statistics.median(timings):8.2f} ms"
+                f"  p95 {sorted(timings)[int((len(timings) - 1) * 0.95)]:8.2f} ms"
+                f"  fields differing from html.parser: {', '.join(diffs) or 'none'}"
+            )
+        print()
+
+    baseline_median = statistics.median(totals["html.parser"])
+    print("Overall")
+    for backend in backends:
+        median = statistics.median(totals[backend])
+        print(f"  {backend:<12} median {median:8.2f} ms  speedup x{baseline_median / median:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timezone
 import uuid
 
@@ -18,4 +18,5 @@ class Dataset(BaseModel):
     run_id: str
     user_id: str
     item_count: int = 0
+    fields: List[str] = Field(default_factory=list)  # Union of item keys, in first-seen order
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
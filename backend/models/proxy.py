@@ -14,7 +14,10 @@ class Proxy(BaseModel):
     protocol: str = "http"  # http, https, socks5
     is_active: bool = True
     success_count: int = 0
-    failure_count: int = 0
+    failure_count: int = 0  # Failed health checks; repeated ones deactivate the proxy
+    blocked_count: int = 0  # Failures where the target site blocked or rate limited the proxy
+    timeout_count: int = 0  # Failures where the navigation timed out
+    error_count: int = 0  # Other failed requests (target 5xx, connection errors)
     last_used: Optional[datetime] = None
     last_check: Optional[datetime] = None
     response_time: Optional[float] = None
@@ -21,6 +21,7 @@ class Run(BaseModel):
     actor_name: str
     actor_icon: Optional[str] = None
     status: str = "queued"  # queued, running, succeeded, failed, aborted
+    queue_position: Optional[int] = None  # 1-based position while status is queued
     input_data: Dict[str, Any] = Field(default_factory=dict)
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
@@ -28,10 +29,13 @@ class Run(BaseModel):
     results_count: int = 0
     dataset_id: Optional[str] = None
     error_message: Optional[str] = None
-    logs: List[str] = Field(default_factory=list)
     cost: float = 0.0
     build_number: Optional[str] = None
     origin: str = "Web"
+    schedule_id: Optional[str] = None  # Set for runs started by a schedule
+    delta_mode: bool = False  # Dataset holds only items new/changed/removed since the schedule's previous run
+    delta: Optional[Dict[str, int]] = None  # Item counts per change type for delta runs
+    concurrency: Optional[Dict[str, Any]] = None  # Adaptive per-domain limits and their history
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class RunCreate(BaseModel):
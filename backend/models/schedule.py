@@ -18,6 +18,7 @@ class Schedule(BaseModel):
     timezone: str = "UTC"
     input_data: Dict[str, Any] = Field(default_factory=dict)
     is_enabled: bool = True
+    delta_mode: bool = False  # Store only items new, changed or removed since the previous run
     next_run: Optional[datetime] = None
     last_run: Optional[datetime] = None
     run_count: int = 0
@@ -47,6 +48,7 @@ class ScheduleCreate(BaseModel):
     timezone: str = "UTC"
     input_data: Dict[str, Any] = Field(default_factory=dict)
     is_enabled: bool = True
+    delta_mode: bool = False
     
     @field_validator('cron_expression')
     @classmethod
@@ -67,6 +69,7 @@ class ScheduleUpdate(BaseModel):
     timezone: Optional[str] = None
     input_data: Optional[Dict[str, Any]] = None
     is_enabled: Optional[bool] = None
+    delta_mode: Optional[bool] = None
     
     @field_validator('cron_expression')
     @classmethod
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
-from typing import List, Optional
+from typing import Callable, List, Optional
 from datetime import datetime, timezone, timedelta
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 from models import (
     UserCreate, UserLogin, UserResponse, Actor, ActorCreate, ActorUpdate, ActorPublish,
     Run, RunCreate, Dataset, DatasetItem, Proxy, ProxyCreate,
@@ -9,8 +10,13 @@ from models import (
     OTP, SendOTPRequest, VerifyOTPRequest, OTPResponse
 )
 from auth import create_access_token, get_current_user, hash_password, verify_password
-from services import get_proxy_manager, get_task_manager, LeadChatService, EnhancedGlobalChatService
-from scrapers import ScraperEngine, get_scraper_registry
+from services import get_proxy_manager, get_task_manager, LeadChatService, EnhancedGlobalChatService, DatasetWriter, RunLogSink, RunQueue, EntityCache, DeltaTracker
+from services.delta_tracker import clear_delta_state
+from services.proxy_import import import_proxies, iter_lines, PROXY_PROTOCOLS
+from services.task_manager import priority_for_origin
+from services.run_log import get_run_logs, get_run_log_tail
+from services.run_events import get_run_event_bus
+from scrapers import ScraperEngine, get_scraper_registry, get_browser_pool, get_parse_executor
 from audit_service import log_admin_action
 import logging
 import os
@@ -22,12 +28,19 @@ logger = logging.getLogger(__name__)
 db = None
 proxy_manager = None
 task_manager = None
+run_queue = None
 
 def set_db(database):
-    global db, proxy_manager, task_manager
+    global db, proxy_manager, task_manager, run_queue
     db = database
     proxy_manager = get_proxy_manager(db)
     task_manager = get_task_manager()
+    task_manager.attach_db(db)
+    
+    # In distributed mode the API only enqueues; worker.py processes execute runs
+    if os.getenv('RUN_EXECUTION_MODE', 'local') == 'distributed':
+        run_queue = RunQueue(db)
+        task_manager.attach_run_queue(run_queue)
 
 router = APIRouter()
 
@@ -585,34 +598,91 @@ async def get_actors_used(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============= Run Routes =============
-async def execute_scraping_job(run_id: str, actor_id: str, user_id: str, input_data: dict):
-    """Background task to execute scraping."""
+async def execute_scraping_job(
+    run_id: str,
+    actor_id: str,
+    user_id: str,
+    input_data: dict,
+    owns_run: Optional[Callable[[], bool]] = None
+):
+    """
+    Background task to execute scraping.
+    owns_run (distributed workers) returns False once another worker has taken
+    the run over; nothing is persisted for the run after that.
+    """
+    # Live subscribers (GET /runs/{run_id}/stream) get status, logs and items as they happen
+    event_bus = get_run_event_bus()
+    
     try:
         logger.info(f"🔧 Executing scraping job for run {run_id}")
         logger.info(f"   Input data type: {type(input_data)}")
         logger.info(f"   Input data: {input_data}")
         
         # Update run status to running
-        await db.runs.update_one(
+        run_doc = await db.runs.find_one_and_update(
             {"id": run_id},
             {
                 "$set": {
                     "status": "running",
-                    "started_at": datetime.now(timezone.utc).isoformat()
+                    "started_at": datetime.now(timezone.utc).isoformat(),
+                    "queue_position": None
                 }
-            }
+            },
+            projection={"_id": 0, "schedule_id": 1, "delta_mode": 1}
+        )
+        event_bus.publish(run_id, "status", {"status": "running"})
+        
+        # Delta runs store only items that differ from the schedule's previous run
+        delta = None
+        if run_doc and run_doc.get('delta_mode') and run_doc.get('schedule_id'):
+            delta = DeltaTracker(db, run_doc['schedule_id'], run_id)
+            await delta.load()
+        
+        # Initialize scraper engine (contexts are leased from the shared browser pool);
+        # scheduled runs monitor changes, so they scrape every entity fresh and only refresh the cache
+        engine = ScraperEngine(
+            proxy_manager,
+            browser_pool=get_browser_pool(),
+            entity_cache=EntityCache(db, read=not (run_doc and run_doc.get('schedule_id'))),
+            proxy_session=run_id
         )
-        
-        # Initialize scraper engine
-        engine = ScraperEngine(proxy_manager)
         await engine.initialize()
         
+        # Adaptive concurrency changes go to live subscribers immediately and onto the run with each flush
+        engine.concurrency.on_change = lambda limiter: event_bus.publish(
+            run_id, "concurrency", {"domain": limiter.domain, "limit": limiter.limit}
+        )
+        
+        # Batched writer for dataset items; results_count tracks what has been persisted so far
+        async def update_results_count(total_written: int):
+            update = {"results_count": total_written}
+            if engine.concurrency.limiters:
+                update["concurrency"] = engine.concurrency.get_stats()
+            await db.runs.update_one({"id": run_id}, {"$set": update})
+            event_bus.publish(run_id, "results_count", {"results_count": total_written})
+        
+        async def publish_items(docs: list):
+            if event_bus.has_subscribers(run_id):
+                event_bus.publish(run_id, "items", [
+                    {"id": doc['id'], "data": doc['data'], "created_at": doc['created_at']}
+                    for doc in docs
+                ])
+        
+        writer = DatasetWriter(
+            db,
+            run_id,
+            on_flush=update_results_count,
+            on_items=publish_items,
+            owns_run=owns_run
+        )
+        
+        # Progress messages are buffered and stored in run_logs, not on the run document
+        log_sink = RunLogSink(db, run_id)
+        
         try:
             # Get actor details
             actor = await db.actors.find_one({"id": actor_id})
             
-            results = []
-            
             # Built-in scraper - use registry
             scraper_registry = get_scraper_registry()
             actor_name = actor.get('name') if actor else None
@@ -628,33 +698,41 @@ async def execute_scraping_job(run_id: str, actor_id: str, user_id: str, input_d
                 raise ValueError(f"No scraper registered for actor: {actor_name}")
             
             logger.info(f"✅ Found scraper: {type(scraper).__name__}")
-            logger.info(f"   Calling scraper.scrape() with input_data: {input_data}")
+            logger.info(f"   Calling scraper.scrape_stream() with input_data: {input_data}")
             
             # Progress callback for logging
             async def progress_callback(message: str):
-                await db.runs.update_one(
-                    {"id": run_id},
-                    {"$push": {"logs": f"{datetime.now(timezone.utc).isoformat()}: {message}"}}
-                )
+                await log_sink.add(message)
+                event_bus.publish(run_id, "log", {"message": message})
                 logger.info(f"Run {run_id}: {message}")
             
-            # Execute built-in scraper
-            results = await scraper.scrape(input_data, progress_callback)
+            # Execute built-in scraper, persisting items in batches as they are yielded
+            async for item in scraper.scrape_stream(input_data, progress_callback):
+                if delta:
+                    item = await delta.classify(item)
+                    if item is None:
+                        continue
+                await writer.add(item)
+            if delta:
+                # Removals are only known once the run has produced everything;
+                # items the scraper attempted but lost to errors or throttling are not removals
+                delta.mark_attempted(engine.attempted_keys)
+                for item in await delta.finish():
+                    await writer.add(item)
+                await progress_callback(
+                    f"🔀 Delta: {delta.counts['new']} new, {delta.counts['changed']} changed, "
+                    f"{delta.counts['removed']} removed, {delta.counts['unchanged']} unchanged"
+                    + (f", {delta.counts['failed']} failed" if delta.counts['failed'] else "")
+                )
+            item_count = await writer.close()
             
-            # Create dataset and store results
+            # Create dataset record
             from models import Dataset
-            dataset = Dataset(run_id=run_id, user_id=user_id, item_count=len(results))
+            dataset = Dataset(run_id=run_id, user_id=user_id, item_count=item_count, fields=writer.get_fields())
             dataset_doc = dataset.model_dump()
             dataset_doc['created_at'] = dataset_doc['created_at'].isoformat()
             await db.datasets.insert_one(dataset_doc)
             
-            # Store dataset items
-            for result in results:
-                item = DatasetItem(run_id=run_id, data=result)
-                item_doc = item.model_dump()
-                item_doc['created_at'] = item_doc['created_at'].isoformat()
-                await db.dataset_items.insert_one(item_doc)
-            
             # Calculate duration
             run_doc = await db.runs.find_one({"id": run_id})
             started_at = datetime.fromisoformat(run_doc['started_at'])
@@ -669,20 +747,41 @@ async def execute_scraping_job(run_id: str, actor_id: str, user_id: str, input_d
                         "status": "succeeded",
                         "finished_at": finished_at.isoformat(),
                         "duration_seconds": duration,
-                        "results_count": len(results),
-                        "dataset_id": dataset.id
+                        "results_count": item_count,
+                        "dataset_id": dataset.id,
+                        "delta": delta.get_summary() if delta else None
                     }
                 }
             )
             
+            event_bus.publish(run_id, "status", {
+                "status": "succeeded",
+                "results_count": item_count,
+                "dataset_id": dataset.id,
+                "duration_seconds": duration
+            })
+            
             # Update actor runs count
             await db.actors.update_one({"id": actor_id}, {"$inc": {"runs_count": 1}})
             
-            logger.info(f"Run {run_id} completed successfully with {len(results)} results")
+            logger.info(f"Run {run_id} completed successfully with {item_count} results")
         
         finally:
+            # Keep whatever was extracted before a failure
+            await writer.flush()
+            await log_sink.close()
+            if delta and (owns_run is None or owns_run()):
+                # State for items already stored; a later run will not report them again
+                await delta.flush()
+            if engine.concurrency.limiters:
+                await db.runs.update_one({"id": run_id}, {"$set": {"concurrency": engine.concurrency.get_stats()}})
             await engine.cleanup()
     
+    except asyncio.CancelledError:
+        # Abort routes record the aborted status; let live subscribers know right away
+        event_bus.publish(run_id, "status", {"status": "aborted"})
+        raise
+    
     except Exception as e:
         logger.error(f"Run {run_id} failed: {str(e)}")
         await db.runs.update_one(
@@ -695,6 +794,22 @@ async def execute_scraping_job(run_id: str, actor_id: str, user_id: str, input_d
                 }
             }
         )
+        event_bus.publish(run_id, "status", {"status": "failed", "error_message": str(e)})
+
+async def dispatch_run(run_id: str, actor_id: str, user_id: str, input_data: dict, origin: str = "Web"):
+    """Execute a run in this process or hand it to the distributed worker queue."""
+    priority = priority_for_origin(origin)
+    
+    if run_queue is not None:
+        await run_queue.enqueue(run_id, actor_id, user_id, input_data, priority)
+        return
+    
+    await task_manager.start_task(
+        run_id,
+        execute_scraping_job(run_id, actor_id, user_id, input_data),
+        user_id=user_id,
+        priority=priority
+    )
 
 @router.post("/runs", response_model=Run)
 async def create_run(
@@ -731,18 +846,16 @@ async def create_run(
     
     logger.info(f"✅ Run created: {run.id}")
     
-    # Start scraping in parallel using task manager
-    await task_manager.start_task(
+    # Queue scraping on the worker pool
+    await dispatch_run(
         run.id,
-        execute_scraping_job(
-            run.id,
-            run_data.actor_id,
-            current_user['id'],
-            run_data.input_data
-        )
+        run_data.actor_id,
+        current_user['id'],
+        run_data.input_data,
+        origin=run.origin
     )
     
-    logger.info(f"Run {run.id} queued. Currently running: {task_manager.get_running_count()} tasks")
+    logger.info(f"Run {run.id} queued. Currently running: {task_manager.get_running_count()} tasks, queued: {task_manager.get_queued_count()}")
     
     return run
 
@@ -777,10 +890,11 @@ async def get_runs(
     # Set sort direction
     sort_direction = -1 if sort_order == "desc" else 1
     
-    # Get runs with pagination
+    # Get runs with pagination (legacy runs may still carry an inline logs array;
+    # concurrency history is only returned with run details)
     runs = await db.runs.find(
         query,
-        {"_id": 0}
+        {"_id": 0, "logs": 0, "concurrency": 0}
     ).sort(sort_by, sort_direction).skip(skip).limit(limit).to_list(limit)
     
     # Convert datetime strings
@@ -803,7 +917,7 @@ async def get_runs(
 @router.get("/runs/{run_id}", response_model=Run)
 async def get_run(run_id: str, current_user: dict = Depends(get_current_user)):
     """Get specific run."""
-    run = await db.runs.find_one({"id": run_id, "user_id": current_user['id']}, {"_id": 0})
+    run = await db.runs.find_one({"id": run_id, "user_id": current_user['id']}, {"_id": 0, "logs": 0})
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -817,6 +931,100 @@ async def get_run(run_id: str, current_user: dict = Depends(get_current_user)):
     
     return run
 
+@router.get("/runs/{run_id}/logs")
+async def get_run_log_lines(
+    run_id: str,
+    current_user: dict = Depends(get_current_user),
+    after: int = -1,
+    limit: int = 200,
+    tail: Optional[int] = None
+):
+    """
+    Get progress logs for a run.
+    Page forward (or tail a live run) by passing the returned next_after as `after`;
+    pass `tail` to get only the most recent lines.
+    """
+    run = await db.runs.find_one(
+        {"id": run_id, "user_id": current_user['id']},
+        {"_id": 0, "status": 1, "logs": 1}
+    )
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    limit = max(1, min(limit, 1000))
+    
+    if tail is not None:
+        lines = await get_run_log_tail(db, run_id, max(0, min(tail, 1000)))
+    else:
+        lines = await get_run_logs(db, run_id, after=after, limit=limit)
+    
+    # Runs from before run_logs existed kept their logs inline on the run document
+    if not lines and after < 0 and run.get('logs'):
+        legacy = [
+            {"seq": seq, "message": message}
+            for seq, message in enumerate(run['logs'])
+        ]
+        lines = legacy[-tail:] if tail else legacy[:limit]
+    
+    return {
+        "logs": lines,
+        "next_after": lines[-1]['seq'] if lines else after,
+        "finished": run.get('status') in ("succeeded", "failed", "aborted")
+    }
+
+@router.get("/runs/{run_id}/stream")
+async def stream_run(run_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Server-sent events for a run: status transitions, progress log lines,
+    results_count updates and newly persisted dataset items.
+    The stream starts with a snapshot of the run and ends once it finishes.
+    """
+    from fastapi.responses import StreamingResponse
+    import json
+    
+    run = await db.runs.find_one({"id": run_id, "user_id": current_user['id']}, {"_id": 0, "logs": 0})
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    finished_statuses = ("succeeded", "failed", "aborted")
+    keepalive_seconds = float(os.getenv('RUN_STREAM_KEEPALIVE_SECONDS', '15'))
+    event_bus = get_run_event_bus()
+    
+    def format_event(event: str, data) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    async def event_stream():
+        # Subscribe before sending the snapshot so no transition is missed in between
+        queue = event_bus.subscribe(run_id)
+        try:
+            yield format_event("snapshot", run)
+            if run['status'] in finished_statuses:
+                return
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=keepalive_seconds)
+                except asyncio.TimeoutError:
+                    # Runs executed on another node (or aborted while queued) publish nothing here
+                    current = await db.runs.find_one({"id": run_id}, {"_id": 0, "status": 1, "results_count": 1})
+                    if not current or current['status'] in finished_statuses:
+                        yield format_event("status", current or {"status": "deleted"})
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield format_event(message['event'], message['data'])
+                if message['event'] == "status" and message['data'].get('status') in finished_statuses:
+                    return
+        finally:
+            event_bus.unsubscribe(run_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.delete("/runs/{run_id}/abort")
 async def abort_run(run_id: str, current_user: dict = Depends(get_current_user)):
     """Abort a running or queued scraping job."""
@@ -1070,51 +1278,62 @@ async def get_dataset_items(
 
 @router.get("/datasets/{run_id}/export")
 async def export_dataset(run_id: str, format: str = "json", current_user: dict = Depends(get_current_user)):
-    """Export dataset in various formats."""
+    """Export dataset in various formats, streamed straight from the database cursor."""
     from fastapi.responses import StreamingResponse
-    import io
-    import json
-    import csv
+    from services.dataset_export import (
+        iter_dataset_items, get_dataset_fields, stream_json, stream_ndjson, stream_csv,
+        stream_columnar, build_arrow_schema, HAS_PYARROW
+    )
     
     # Verify run belongs to user
     run = await db.runs.find_one({"id": run_id, "user_id": current_user['id']})
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
-    items = await db.dataset_items.find({"run_id": run_id}, {"_id": 0}).to_list(10000)
-    
     if format == "json":
-        content = json.dumps([item['data'] for item in items], indent=2)
         return StreamingResponse(
-            io.BytesIO(content.encode()),
+            stream_json(iter_dataset_items(db, run_id)),
             media_type="application/json",
             headers={"Content-Disposition": f"attachment; filename=dataset_{run_id}.json"}
         )
     
+    elif format == "ndjson":
+        return StreamingResponse(
+            stream_ndjson(iter_dataset_items(db, run_id)),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename=dataset_{run_id}.ndjson"}
+        )
+    
     elif format == "csv":
-        if not items:
+        fieldnames = await get_dataset_fields(db, run_id)
+        if not fieldnames:
             raise HTTPException(status_code=404, detail="No data to export")
         
-        output = io.StringIO()
-        # Get all unique keys from all items
-        all_keys = set()
-        for item in items:
-            all_keys.update(item['data'].keys())
-        
-        writer = csv.DictWriter(output, fieldnames=sorted(all_keys))
-        writer.writeheader()
-        for item in items:
-            writer.writerow(item['data'])
-        
-        content = output.getvalue()
         return StreamingResponse(
-            io.BytesIO(content.encode()),
+            stream_csv(iter_dataset_items(db, run_id), fieldnames),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=dataset_{run_id}.csv"}
         )
     
+    elif format in ("parquet", "arrow"):
+        if not HAS_PYARROW:
+            raise HTTPException(status_code=400, detail=f"{format} export requires pyarrow to be installed")
+        
+        # Column types come from the scraper's output schema so numbers stay numbers
+        scraper_info = get_scraper_registry().get_scraper_info(run.get('actor_name'))
+        output_schema = scraper_info.get('output_schema', {}) if scraper_info else {}
+        fieldnames = await get_dataset_fields(db, run_id)
+        schema, column_types = build_arrow_schema(output_schema, fieldnames)
+        
+        media_type = "application/vnd.apache.parquet" if format == "parquet" else "application/vnd.apache.arrow.file"
+        return StreamingResponse(
+            stream_columnar(iter_dataset_items(db, run_id), schema, column_types, format),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=dataset_{run_id}.{format}"}
+        )
+    
     else:
-        raise HTTPException(status_code=400, detail="Unsupported format. Use 'json' or 'csv'")
+        raise HTTPException(status_code=400, detail="Unsupported format. Use 'json', 'ndjson', 'csv', 'parquet' or 'arrow'")
 
 # ============= Proxy Routes =============
 @router.get("/proxies", response_model=List[Proxy])
@@ -1146,10 +1365,48 @@ async def add_proxy(proxy_data: ProxyCreate, current_user: dict = Depends(get_cu
     
     doc = proxy.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
-    await db.proxies.insert_one(doc)
+    try:
+        await db.proxies.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Proxy already exists")
+    proxy_manager.pool.add(proxy.model_dump())
     
     return proxy
 
+async def _iter_upload_chunks(request: Request):
+    """Body chunks of a raw text upload, or of the 'file' field of a multipart form."""
+    if request.headers.get('content-type', '').startswith('multipart/form-data'):
+        form = await request.form()
+        upload = form.get('file')
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Multipart uploads need a 'file' field")
+        while True:
+            chunk = await upload.read(64 * 1024)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        async for chunk in request.stream():
+            yield chunk
+
+@router.post("/proxies/import")
+async def import_proxy_list(
+    request: Request,
+    protocol: str = "http",
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Bulk import proxies from host:port[:user:pass] lines (raw text body or multipart 'file').
+    Lines may carry their own protocol:// prefix; `protocol` applies to the rest.
+    """
+    if protocol not in PROXY_PROTOCOLS:
+        raise HTTPException(status_code=400, detail=f"Unsupported protocol. Use one of: {', '.join(PROXY_PROTOCOLS)}")
+    
+    result = await import_proxies(db, iter_lines(_iter_upload_chunks(request)), default_protocol=protocol)
+    if result["accepted"]:
+        proxy_manager.invalidate()
+    return result
+
 @router.post("/proxies/fetch-free")
 async def fetch_free_proxies(current_user: dict = Depends(get_current_user)):
     """Fetch and add free proxies from public sources."""
@@ -1159,9 +1416,9 @@ async def fetch_free_proxies(current_user: dict = Depends(get_current_user)):
 @router.post("/proxies/health-check")
 async def health_check_proxies(current_user: dict = Depends(get_current_user)):
     """Run health check on all proxies."""
-    healthy = await proxy_manager.health_check_all()
+    result = await proxy_manager.health_check_all()
     total = await db.proxies.count_documents({})
-    return {"healthy": healthy, "total": total}
+    return {**result, "total": total}
 
 @router.delete("/proxies/{proxy_id}")
 async def delete_proxy(proxy_id: str, current_user: dict = Depends(get_current_user)):
@@ -1169,6 +1426,7 @@ async def delete_proxy(proxy_id: str, current_user: dict = Depends(get_current_u
     result = await db.proxies.delete_one({"id": proxy_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Proxy not found")
+    proxy_manager.pool.remove(proxy_id)
     return {"message": "Proxy deleted successfully"}
 
 # ============= Lead Chat Routes (AI Engagement Advice) =============
@@ -1346,14 +1604,11 @@ async def global_chat(
                     logger.info(f"🤖 AI Agent starting run {run_id} ({idx+1}/{len(result['run_ids'])}) from chat...")
                     
                     # Use task manager for parallel execution
-                    await task_manager.start_task(
+                    await dispatch_run(
                         run_id,
-                        execute_scraping_job(
-                            run_id,
-                            actor_id,
-                            current_user['id'],
-                            input_data
-                        )
+                        actor_id,
+                        current_user['id'],
+                        input_data
                     )
                     logger.info(f"✓ Run {run_id} started by AI Agent. Active tasks: {task_manager.get_running_count()}")
                 else:
@@ -1367,14 +1622,11 @@ async def global_chat(
             logger.info(f"🤖 AI Agent starting run {run_id} from chat...")
             
             # Use task manager for parallel execution
-            await task_manager.start_task(
+            await dispatch_run(
                 run_id,
-                execute_scraping_job(
-                    run_id,
-                    actor_id,
-                    current_user['id'],
-                    input_data
-                )
+                actor_id,
+                current_user['id'],
+                input_data
             )
             logger.info(f"✓ Run {run_id} started by AI Agent. Active tasks: {task_manager.get_running_count()}")
         
@@ -1469,7 +1721,8 @@ async def create_schedule(
         cron_expression=schedule_data.cron_expression,
         timezone=schedule_data.timezone,
         input_data=schedule_data.input_data,
-        is_enabled=schedule_data.is_enabled
+        is_enabled=schedule_data.is_enabled,
+        delta_mode=schedule_data.delta_mode
     )
     
     # Calculate next run
@@ -1624,6 +1877,13 @@ async def update_schedule(
             {"$set": update_data}
         )
         
+        # Switching delta mode (or changing what the schedule scrapes) invalidates the previous items
+        if (
+            ('delta_mode' in update_data and update_data['delta_mode'] != schedule.get('delta_mode', False))
+            or ('input_data' in update_data and update_data['input_data'] != schedule.get('input_data'))
+        ):
+            await clear_delta_state(db, schedule_id)
+        
         # Get updated schedule
         updated_schedule = await db.schedules.find_one({"id": schedule_id}, {"_id": 0})
         
@@ -1681,6 +1941,7 @@ async def delete_schedule(
     
     # Delete from database
     await db.schedules.delete_one({"id": schedule_id})
+    await clear_delta_state(db, schedule_id)
     
     logger.info(f"✅ Schedule deleted: {schedule_id}")
     
@@ -1779,7 +2040,9 @@ async def run_schedule_now(
         actor_icon=actor.get('icon'),
         input_data=schedule['input_data'],
         status="queued",
-        origin="Manual (Schedule)"
+        origin="Manual (Schedule)",
+        schedule_id=schedule_id,
+        delta_mode=schedule.get('delta_mode', False)
     )
     
     doc = run.model_dump()
@@ -1787,15 +2050,12 @@ async def run_schedule_now(
     await db.runs.insert_one(doc)
     
     # Start scraping
-    from services.task_manager import task_manager
-    await task_manager.start_task(
+    await dispatch_run(
         run.id,
-        execute_scraping_job(
-            run.id,
-            schedule['actor_id'],
-            current_user['id'],
-            schedule['input_data']
-        )
+        schedule['actor_id'],
+        current_user['id'],
+        schedule['input_data'],
+        origin=run.origin
     )
     
     # Update schedule statistics for manual runs
@@ -1838,7 +2098,7 @@ async def get_admin_stats(current_user: dict = Depends(get_current_user)):
     # 3. Recent activity
     recent_runs = await db.runs.find(
         {}, 
-        {"_id": 0}
+        {"_id": 0, "logs": 0, "concurrency": 0}
     ).sort("created_at", -1).limit(5).to_list(5)
     
     # Format recent runs
@@ -1870,6 +2130,35 @@ async def get_admin_stats(current_user: dict = Depends(get_current_user)):
         "recent_activity": formatted_runs
     }
 
+@router.get("/admin/browser-pool")
+async def get_browser_pool_stats(current_user: dict = Depends(get_current_user)):
+    """Get shared browser pool utilization and lease wait metrics."""
+    if current_user.get('role') not in ['admin', 'owner']:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return get_browser_pool().get_stats()
+
+@router.get("/admin/parse-executor")
+async def get_parse_executor_stats(current_user: dict = Depends(get_current_user)):
+    """Get HTML parse executor queue depth and parse time metrics."""
+    if current_user.get('role') not in ['admin', 'owner']:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return get_parse_executor().get_stats()
+
+@router.get("/admin/proxy-pool")
+async def get_proxy_pool_stats(current_user: dict = Depends(get_current_user)):
+    """Get in-memory proxy pool size, stats write-behind, rotation, health check and scraping outcome metrics."""
+    if current_user.get('role') not in ['admin', 'owner']:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {
+        **proxy_manager.pool.get_stats(),
+        "rotation": proxy_manager.rotator.get_stats(),
+        "health_checks": proxy_manager.health_checker.get_stats(),
+        "feedback": proxy_manager.get_outcome_stats()
+    }
+
 @router.get("/admin/users", response_model=List[UserResponse])
 async def get_admin_users(
     current_user: dict = Depends(get_current_user),
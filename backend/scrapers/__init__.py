@@ -1,11 +1,17 @@
 # Scrapers package
 from .base_scraper import BaseScraper
 from .scraper_engine import ScraperEngine
+from .browser_pool import BrowserPool, get_browser_pool
+from .parse_executor import ParseExecutor, get_parse_executor
 from .scraper_registry import ScraperRegistry, get_scraper_registry
 
 __all__ = [
     'BaseScraper',
     'ScraperEngine',
+    'BrowserPool',
+    'get_browser_pool',
+    'ParseExecutor',
+    'get_parse_executor',
     'ScraperRegistry',
     'get_scraper_registry'
 ]
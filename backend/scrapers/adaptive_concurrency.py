@@ -0,0 +1,230 @@
+"""
+Adaptive Concurrency - AIMD limits on how many pages a run loads at once per domain.
+A limiter adds one slot after each healthy window of completions (success rate
+and p95 latency within bounds) and halves when the target throttles us
+(429/503, captcha or block pages, timeouts).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean the target wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# HTTP statuses that mean the target blocked the client outright or is throttling it
+BLOCK_STATUSES = (403,) + THROTTLE_STATUSES
+
+
+class LimiterLease:
+    """One slot held by an in-flight page; the holder reports how it went."""
+
+    __slots__ = ("started_at", "outcome")
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.outcome = "ok"
+
+    def throttled(self):
+        """Rate limited, blocked, captcha'd or timed out."""
+        self.outcome = "throttled"
+
+    def failed(self):
+        """Failed for a reason unrelated to load."""
+        if self.outcome == "ok":
+            self.outcome = "failed"
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one domain that adapts with AIMD.
+
+    Provides:
+    - Additive increase after a healthy window in which the limit was actually reached
+    - Multiplicative decrease on throttling, once per congestion event
+    - A bounded history of limit changes with their reasons
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        initial: int,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        window: Optional[int] = None,
+        min_success_rate: Optional[float] = None,
+        on_change: Optional[Callable[["AdaptiveLimiter"], None]] = None
+    ):
+        self.domain = domain
+        self.min_limit = min_limit or int(os.getenv('ADAPTIVE_CONCURRENCY_MIN', '1'))
+        self.max_limit = max_limit or int(os.getenv('ADAPTIVE_CONCURRENCY_MAX', '16'))
+        if os.getenv('ADAPTIVE_CONCURRENCY_ENABLED', 'true').lower() != 'true':
+            # Fixed limit
+            self.min_limit = self.max_limit = initial
+        self.latency_target = latency_target or float(os.getenv('ADAPTIVE_LATENCY_TARGET_SECONDS', '15'))
+        self.window = window or int(os.getenv('ADAPTIVE_WINDOW_SIZE', '10'))
+        self.min_success_rate = min_success_rate or float(os.getenv('ADAPTIVE_MIN_SUCCESS_RATE', '0.9'))
+        self.on_change = on_change
+
+        self.limit = max(self.min_limit, min(initial, self.max_limit))
+        self.in_flight = 0
+        self._waiters: deque = deque()
+
+        # Current decision window
+        self._latencies: List[float] = []
+        self._failures = 0
+        self._saturated = False
+        # Leases started before the last cut report the same congestion event
+        self._last_decrease = 0.0
+
+        self.completed = 0
+        self.throttled = 0
+        self.failed = 0
+        self.history: deque = deque(maxlen=100)
+        self.history.append(self._history_entry("initial"))
+
+    def _history_entry(self, reason: str) -> Dict[str, Any]:
+        return {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "limit": self.limit,
+            "reason": reason
+        }
+
+    async def acquire(self):
+        """Wait for a free slot under the current limit."""
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken but leaving; pass the slot on
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        if self.in_flight >= self.limit:
+            self._saturated = True
+
+    def release(self, lease: LimiterLease, record: bool = True):
+        """Free a slot and feed the lease's outcome into the limit."""
+        self.in_flight -= 1
+        if record:
+            self._record(lease)
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[LimiterLease]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        lease = LimiterLease(time.monotonic())
+        record = True
+        try:
+            yield lease
+        except asyncio.CancelledError:
+            record = False
+            raise
+        except Exception:
+            lease.failed()
+            raise
+        finally:
+            self.release(lease, record)
+
+    def _record(self, lease: LimiterLease):
+        now = time.monotonic()
+        self.completed += 1
+
+        if lease.outcome == "throttled":
+            self.throttled += 1
+            if lease.started_at >= self._last_decrease:
+                self._last_decrease = now
+                self._set_limit(max(self.min_limit, self.limit // 2), "throttled")
+                self._reset_window()
+            return
+
+        if lease.outcome == "failed":
+            self.failed += 1
+            self._failures += 1
+        self._latencies.append(now - lease.started_at)
+
+        if len(self._latencies) >= self.window:
+            latencies = sorted(self._latencies)
+            p95 = latencies[int((len(latencies) - 1) * 0.95)]
+            success_rate = 1 - self._failures / len(latencies)
+            healthy = success_rate >= self.min_success_rate and p95 <= self.latency_target
+            # Only grow a limit that is actually constraining us
+            if healthy and self._saturated and self.limit < self.max_limit:
+                self._set_limit(self.limit + 1, f"healthy (success {success_rate:.0%}, p95 {p95:.1f}s)")
+            self._reset_window()
+
+    def _reset_window(self):
+        self._latencies = []
+        self._failures = 0
+        self._saturated = self.in_flight >= self.limit
+
+    def _set_limit(self, limit: int, reason: str):
+        if limit == self.limit:
+            return
+        logger.info(f"Concurrency for {self.domain}: {self.limit} -> {limit} ({reason})")
+        self.limit = limit
+        self.history.append(self._history_entry(reason))
+        if self.on_change:
+            try:
+                self.on_change(self)
+            except Exception as e:
+                logger.debug(f"Concurrency change callback error: {e}")
+
+    def _wake(self):
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current limit, counters and limit history."""
+        return {
+            "domain": self.domain,
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "history": list(self.history)
+        }
+
+
+class ConcurrencyController:
+    """Per-run set of adaptive limiters, one per target domain."""
+
+    def __init__(self, on_change: Optional[Callable[[AdaptiveLimiter], None]] = None):
+        self.on_change = on_change
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, domain: str, initial: int) -> AdaptiveLimiter:
+        """Get the domain's limiter, creating it at `initial` slots on first use."""
+        if domain not in self.limiters:
+            self.limiters[domain] = AdaptiveLimiter(domain, initial, on_change=self._changed)
+        return self.limiters[domain]
+
+    def _changed(self, limiter: AdaptiveLimiter):
+        if self.on_change:
+            self.on_change(limiter)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get every domain's limiter stats, keyed by domain (dots replaced for Mongo keys)."""
+        return {domain.replace('.', '_'): limiter.get_stats() for domain, limiter in self.limiters.items()}
@@ -0,0 +1,336 @@
+"""
+Amazon page parsers - pure functions from page HTML to plain data.
+Kept free of browser and engine state so they can run in the parse executor's
+worker processes; inputs are HTML strings and outputs are dicts and lists.
+"""
+
+import re
+import logging
+from typing import List, Dict, Any, Optional
+from ..html_parsing import HtmlNode, parse_html, precompile_selectors
+
+logger = logging.getLogger(__name__)
+
+# CSS selectors for the product page fields, compiled once at import
+PRODUCT_SELECTORS = {
+    'title': 'span#productTitle',
+    'price_whole': 'span.a-price-whole',
+    'price_fraction': 'span.a-price-fraction',
+    'original_price': 'span.a-price.a-text-price',
+    'rating': 'span.a-icon-alt',
+    'review_count': 'span#acrCustomerReviewText',
+    'availability': 'div#availability',
+    'prime': 'i.a-icon-prime',
+    'main_image': 'img#landingImage',
+    'alt_images': 'div#altImages img',
+    'videos': 'div#ivVideoBlock video',
+    'scripts': 'script[type="text/javascript"]',
+    'features': 'div#feature-bullets span.a-list-item',
+    'description': 'div#productDescription',
+    'brand': 'a#bylineInfo',
+    'detail_bullets': 'div#detailBullets_feature_div li',
+    'color': 'div#variation_color_name span.selection',
+    'size': 'div#variation_size_name span.selection',
+    'stock': 'span.a-size-medium.a-color-success',
+    'shipping': 'div#deliveryBlockMessage',
+    'shipping_fallback': 'div#mir-layout-DELIVERY_BLOCK',
+    'seller': 'a#sellerProfileTriggerId',
+    'sold_by': 'div#merchant-info',
+    'breadcrumbs': 'div#wayfinding-breadcrumbs_feature_div a',
+    'rank_rows': 'table#productDetails_detailBullets_sections1 tr',
+}
+SEARCH_RESULT_SELECTOR = 'div[data-asin]'
+REVIEW_SELECTOR = 'div[data-hook="review"]'
+precompile_selectors(list(PRODUCT_SELECTORS.values()) + [
+    SEARCH_RESULT_SELECTOR, REVIEW_SELECTOR, 'a[href*="/dp/"]', 'title',
+    'span.a-offscreen', 'span[data-hook="review-body"]', 'th', 'td'
+])
+
+
+def _fill_product_data(doc: HtmlNode, product_data: Dict[str, Any]):
+    """Fill product_data from a parsed product page."""
+    # Title
+    title_elem = doc.css_first(PRODUCT_SELECTORS['title'])
+    if title_elem:
+        product_data['title'] = title_elem.text().strip()
+    
+    # Price
+    price_whole = doc.css_first(PRODUCT_SELECTORS['price_whole'])
+    price_fraction = doc.css_first(PRODUCT_SELECTORS['price_fraction'])
+    if price_whole:
+        try:
+            price_str = price_whole.text().replace(',', '').strip('.')
+            if price_fraction:
+                price_str += '.' + price_fraction.text().strip()
+            product_data['price'] = float(price_str)
+            product_data['currency'] = 'USD'
+        except:
+            pass
+    
+    # Original price / discount
+    original_price = doc.css_first(PRODUCT_SELECTORS['original_price'])
+    if original_price:
+        try:
+            orig_text = original_price.css_first('span.a-offscreen')
+            if orig_text:
+                orig_price = float(orig_text.text().replace('$', '').replace(',', '').strip())
+                product_data['originalPrice'] = orig_price
+                if 'price' in product_data:
+                    discount = ((orig_price - product_data['price']) / orig_price) * 100
+                    product_data['discount'] = round(discount, 2)
+        except:
+            pass
+    
+    # Rating
+    rating_elem = doc.css_first(PRODUCT_SELECTORS['rating'])
+    if rating_elem:
+        rating_text = rating_elem.text()
+        match = re.search(r'(\d+\.?\d*)\s*out of', rating_text)
+        if match:
+            product_data['rating'] = float(match.group(1))
+    
+    # Review count
+    review_elem = doc.css_first(PRODUCT_SELECTORS['review_count'])
+    if review_elem:
+        review_text = review_elem.text()
+        match = re.search(r'([\d,]+)', review_text)
+        if match:
+            product_data['reviewCount'] = int(match.group(1).replace(',', ''))
+    
+    # Availability
+    avail_elem = doc.css_first(PRODUCT_SELECTORS['availability'])
+    if avail_elem:
+        product_data['availability'] = avail_elem.text().strip()
+    
+    # Prime eligible
+    prime_elem = doc.css_first(PRODUCT_SELECTORS['prime'])
+    product_data['prime'] = prime_elem is not None
+    
+    # Images - Extract both product images and videos
+    images = []
+    videos = []
+    
+    # Try main product image first (high quality)
+    main_image = doc.css_first(PRODUCT_SELECTORS['main_image'])
+    if main_image and main_image.attr('src'):
+        main_src = main_image.attr('src', '')
+        if 'amazon.com' in main_src:
+            # Get highest resolution
+            high_res = main_src.replace('._AC_SX355_', '._AC_SL1500_').replace('._AC_SY355_', '._AC_SL1500_')
+            images.append(high_res)
+    
+    # Get additional images from image block
+    for img in doc.css(PRODUCT_SELECTORS['alt_images']):
+        src = img.attr('src', '')
+        if src and 'amazon.com' in src and src not in images:
+            # Get high-res version
+            high_res = src.replace('_SS40_', '_SL1500_').replace('_US40_', '_SL1500_')
+            if high_res not in images:
+                images.append(high_res)
+    
+    # Extract video if present - Multiple methods for better coverage
+    
+    # Method 1: Check video block
+    for video in doc.css(PRODUCT_SELECTORS['videos']):
+        video_src = video.attr('src', '')
+        if video_src and video_src not in videos:
+            # Ensure it's a full URL
+            if not video_src.startswith('http'):
+                video_src = 'https:' + video_src if video_src.startswith('//') else video_src
+            if video_src.startswith('http'):
+                videos.append(video_src)
+                logger.debug(f"[VIDEO] Method 1 - Found video: {video_src[:100]}")
+    
+    # Method 2: Check for video in image carousel scripts
+    video_scripts = [script.text() for script in doc.css(PRODUCT_SELECTORS['scripts'])]
+    for script in video_scripts:
+        if script and '"videos"' in script:
+            try:
+                import json
+                # Try to extract video URL from JSON
+                match = re.search(r'"videos"\s*:\s*(\[.*?\])', script)
+                if match:
+                    video_data = json.loads(match.group(1))
+                    for vid in video_data:
+                        if isinstance(vid, dict) and 'url' in vid:
+                            video_url = vid['url']
+                            if video_url and video_url not in videos:
+                                if not video_url.startswith('http'):
+                                    video_url = 'https:' + video_url if video_url.startswith('//') else video_url
+                                if video_url.startswith('http'):
+                                    videos.append(video_url)
+                                    logger.debug(f"[VIDEO] Method 2 - Found video: {video_url[:100]}")
+            except Exception as e:
+                logger.debug(f"[VIDEO] Method 2 error: {e}")
+    
+    # Method 3: Look for image/video data in imageBlock scripts  
+    for script in video_scripts:
+        if script and 'colorImages' in script:
+            try:
+                # Look for video URLs in the main image data object
+                video_url_matches = re.findall(r'"(https://[^"]*\.mp4[^"]*)"', script)
+                for video_url in video_url_matches:
+                    if video_url and video_url not in videos:
+                        videos.append(video_url)
+                        logger.debug(f"[VIDEO] Method 3 - Found video: {video_url[:100]}")
+            except Exception as e:
+                logger.debug(f"[VIDEO] Method 3 error: {e}")
+    
+    # Method 4: Look for videos in the imageBlock data
+    for script in video_scripts:
+        if script and 'imageBlock' in script:
+            try:
+                # Find video URLs with better pattern matching
+                # Amazon videos often have patterns like: /videos/...mp4
+                all_video_urls = re.findall(r'"(https?://[^"]*(?:videos?/)[^"]*\.mp4[^"]*)"', script)
+                for video_url in all_video_urls:
+                    if video_url and video_url not in videos:
+                        videos.append(video_url)
+                        logger.debug(f"[VIDEO] Method 4 - Found video: {video_url[:100]}")
+            except Exception as e:
+                logger.debug(f"[VIDEO] Method 4 error: {e}")
+    
+    logger.debug(f"[VIDEO] Total videos found: {len(videos)}")
+    
+    product_data['images'] = images[:10]  # Limit to 10 images
+    product_data['videos'] = videos[:3]  # Limit to 3 videos
+    
+    # Features
+    features = []
+    for item in doc.css(PRODUCT_SELECTORS['features']):
+        text = item.text().strip()
+        if text and len(text) > 10:
+            features.append(text)
+    product_data['features'] = features
+    
+    # Description
+    desc_elem = doc.css_first(PRODUCT_SELECTORS['description'])
+    if desc_elem:
+        product_data['description'] = desc_elem.text().strip()[:500]  # Limit length
+    
+    # Brand - extract from multiple possible locations
+    brand = None
+    brand_elem = doc.css_first(PRODUCT_SELECTORS['brand'])
+    if brand_elem:
+        brand_text = brand_elem.text().strip()
+        if 'Visit the' in brand_text:
+            brand = brand_text.replace('Visit the', '').replace('Store', '').strip()
+        elif 'Brand:' in brand_text:
+            brand = brand_text.replace('Brand:', '').strip()
+        else:
+            brand = brand_text
+    product_data['brand'] = brand
+    
+    # Dimensions and weight
+    dimensions = {}
+    for item in doc.css(PRODUCT_SELECTORS['detail_bullets']):
+        text = item.text().strip()
+        if 'Product Dimensions' in text or 'Package Dimensions' in text:
+            dim_match = re.search(r':\s*(.+)', text)
+            if dim_match:
+                dimensions['size'] = dim_match.group(1).strip()
+        elif 'Item Weight' in text:
+            weight_match = re.search(r':\s*(.+)', text)
+            if weight_match:
+                dimensions['weight'] = weight_match.group(1).strip()
+    product_data['dimensions'] = dimensions
+    
+    # Color and size variants
+    color = None
+    size = None
+    selected_color = doc.css_first(PRODUCT_SELECTORS['color'])
+    if selected_color:
+        color = selected_color.text().strip()
+    
+    selected_size = doc.css_first(PRODUCT_SELECTORS['size'])
+    if selected_size:
+        size = selected_size.text().strip()
+    
+    product_data['color'] = color
+    product_data['size'] = size
+    
+    # Stock quantity (if available)
+    stock_elem = doc.css_first(PRODUCT_SELECTORS['stock'])
+    if stock_elem:
+        stock_text = stock_elem.text().strip()
+        stock_match = re.search(r'(\d+)\s*in stock', stock_text, re.IGNORECASE)
+        if stock_match:
+            product_data['stock'] = int(stock_match.group(1))
+    
+    # Shipping info
+    shipping_elem = doc.css_first(PRODUCT_SELECTORS['shipping'])
+    if not shipping_elem:
+        shipping_elem = doc.css_first(PRODUCT_SELECTORS['shipping_fallback'])
+    if shipping_elem:
+        product_data['shipping'] = shipping_elem.text().strip()[:200]
+    
+    # Seller info
+    seller_elem = doc.css_first(PRODUCT_SELECTORS['seller'])
+    if seller_elem:
+        product_data['seller'] = seller_elem.text().strip()
+    
+    # Sold by
+    soldby_elem = doc.css_first(PRODUCT_SELECTORS['sold_by'])
+    if soldby_elem:
+        product_data['soldBy'] = soldby_elem.text().strip()
+    
+    # Category
+    categories = doc.css(PRODUCT_SELECTORS['breadcrumbs'])
+    if categories:
+        product_data['category'] = categories[-1].text().strip()
+    
+    # Best Sellers Rank
+    for row in doc.css(PRODUCT_SELECTORS['rank_rows']):
+        th = row.css_first('th')
+        if th and 'Best Sellers Rank' in th.text():
+            td = row.css_first('td')
+            if td:
+                product_data['bestSellerRank'] = td.text().strip()[:200]
+
+
+def parse_product_html(html: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Parse a product page into its product fields."""
+    product_data = {}
+    _fill_product_data(parse_html(html, backend), product_data)
+    return product_data
+
+
+def parse_search_html(html: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse a search results page.
+    
+    Returns:
+        title, ASINs from result containers, and ASINs from /dp/ links (in page order)
+    """
+    doc = parse_html(html, backend)
+    
+    title_elem = doc.css_first('title')
+    
+    result_asins = []
+    for div in doc.css(SEARCH_RESULT_SELECTOR):
+        asin = div.attr('data-asin')
+        if asin and asin.strip() and len(asin) == 10:  # Valid ASIN
+            result_asins.append(asin)
+    
+    link_asins = []
+    for link in doc.css('a[href*="/dp/"]'):
+        match = re.search(r'/dp/([A-Z0-9]{10})', link.attr('href', ''))
+        if match:
+            link_asins.append(match.group(1))
+    
+    return {
+        'title': title_elem.text() if title_elem else "No Title",
+        'result_asins': result_asins,
+        'link_asins': link_asins
+    }
+
+
+def parse_reviews_html(html: str, limit: int = 10) -> List[str]:
+    """Parse review texts from a product reviews page."""
+    doc = parse_html(html)
+    reviews = []
+    for div in doc.css(REVIEW_SELECTOR)[:limit]:
+        review_text = div.css_first('span[data-hook="review-body"]')
+        if review_text:
+            reviews.append(review_text.text().strip())
+    return reviews
@@ -4,17 +4,48 @@ Supports: products, prices, reviews, ratings, sellers, shipping info.
 """
 
 import asyncio
-import re
 import logging
-from typing import List, Dict, Any, Optional, Callable
-from ..base_scraper import BaseScraper
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Awaitable
+from ..base_scraper import BaseScraper, DEFAULT_TERM_CONCURRENCY
 from ..scraper_engine import ScraperEngine
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
-from bs4 import BeautifulSoup
-import json
+from ..http_fetcher import HttpFetcher
+from ..adaptive_concurrency import LimiterLease, THROTTLE_STATUSES
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from ..parse_executor import get_parse_executor
+from .amazon_parsers import parse_product_html, parse_search_html, parse_reviews_html
 
 logger = logging.getLogger(__name__)
 
+class BlockedPageError(Exception):
+    """Amazon answered with a robot check, rate limit or error page instead of content."""
+
+
+# Text that marks a robot check or error page instead of real content
+BLOCK_PAGE_MARKERS = (
+    "api-services-support@amazon.com",
+    "Enter the characters you see below",
+    "validateCaptcha",
+    "Sorry! Something went wrong!",
+)
+# Consecutive blocked HTTP fetches after which a run stops trying the HTTP path
+HTTP_BLOCK_LIMIT = 5
+# Starting concurrency for product pages; adapts per run from Amazon's responses
+HTTP_INITIAL_CONCURRENCY = 8
+BROWSER_INITIAL_CONCURRENCY = 3
+
+# Entity cache kind and how old a cached product may be unless the run sets max_age_hours
+# (prices and stock move quickly)
+CACHE_KIND = 'amazon_product'
+DEFAULT_MAX_AGE_HOURS = 6
+
+CAPTCHA_FORM_SELECTOR = 'form[action*="validateCaptcha"]'
+# Search results, an empty result page, or a captcha challenge
+SEARCH_READY_SELECTOR = (
+    'div[data-component-type="s-search-result"], '
+    'div.s-no-outline, '
+    + CAPTCHA_FORM_SELECTOR
+)
+
 
 class AmazonProductScraper(BaseScraper):
     """
@@ -34,6 +65,9 @@ class AmazonProductScraper(BaseScraper):
     def __init__(self, scraper_engine: ScraperEngine):
         super().__init__(scraper_engine)
         self.base_url = "https://www.amazon.com"
+        # Set per run in "http" fetch mode
+        self.http_fetcher: Optional[HttpFetcher] = None
+        self._http_blocks = 0
         
     @classmethod
     def get_name(cls) -> str:
@@ -85,6 +119,23 @@ class AmazonProductScraper(BaseScraper):
                 "type": "number",
                 "description": "Maximum price filter in USD (optional)",
                 "default": None
+            },
+            "fetch_mode": {
+                "type": "string",
+                "description": "'http' fetches product pages directly and uses the browser only when blocked; 'browser' always uses the browser",
+                "default": "http"
+            },
+            "term_concurrency": {
+                "type": "integer",
+                "description": "Search keywords processed at once",
+                "default": DEFAULT_TERM_CONCURRENCY,
+                "min": 1
+            },
+            "max_age_hours": {
+                "type": "number",
+                "description": "Reuse products scraped within this many hours (0 always re-scrapes)",
+                "default": DEFAULT_MAX_AGE_HOURS,
+                "min": 0
             }
         }
     
@@ -117,7 +168,8 @@ class AmazonProductScraper(BaseScraper):
             "soldBy": "string - Sold by (Amazon or 3rd party)",
             "category": "string - Product category",
             "bestSellerRank": "string - Best Sellers Rank",
-            "reviews": "array - Review texts (if extract_reviews=true)"
+            "reviews": "array - Review texts (if extract_reviews=true)",
+            "cachedAt": "string - When the product was scraped, if served from cache"
         }
     
     async def scrape(
@@ -126,6 +178,14 @@ class AmazonProductScraper(BaseScraper):
         progress_callback: Optional[Callable] = None
     ) -> List[Dict[str, Any]]:
         """Main scraping method for Amazon products."""
+        return await self._collect_stream(config, progress_callback)
+    
+    async def scrape_stream(
+        self,
+        config: Dict[str, Any],
+        progress_callback: Optional[Callable] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield Amazon products as each extraction batch completes."""
         
         search_keywords = config.get('search_keywords', [])
         max_results = int(config.get('max_results', 50))  # Convert to int
@@ -136,93 +196,143 @@ class AmazonProductScraper(BaseScraper):
             max_price = float(max_price)  # Convert to float
         else:
             max_price = None  # Treat 0 as no max price
+        fetch_mode = config.get('fetch_mode', 'http')
         
         if not search_keywords:
             raise ValueError("search_keywords is required")
         
-        all_products = []
+        term_concurrency = int(config.get('term_concurrency', DEFAULT_TERM_CONCURRENCY))
+        max_age_hours = float(config.get('max_age_hours', DEFAULT_MAX_AGE_HOURS))
+        
+        total_products = 0
+        # ASINs already claimed by a keyword, so a product found by several keywords is extracted once
+        seen_asins = set()
         
         # Create browser context with anti-detection
         context = await self.engine.create_context(use_proxy=False)
         
-        try:
-            for keyword in search_keywords:
-                await self._log_progress(
-                    f"🔍 Searching Amazon for: {keyword}", 
-                    progress_callback
-                )
-                
+        # Product pages are plain HTML; fetch them without a browser unless blocked
+        if fetch_mode == 'http':
+            self.http_fetcher = HttpFetcher(self.engine.proxy_manager)
+            self._http_blocks = 0
+        
+        # Shared by all keywords, so the limit applies to the whole run
+        # (HTTP fetches are cheap enough to start with more concurrent product pages)
+        limiter = self.engine.concurrency.limiter(
+            'amazon.com',
+            HTTP_INITIAL_CONCURRENCY if self.http_fetcher else BROWSER_INITIAL_CONCURRENCY
+        )
+        
+        async def scrape_keyword(keyword: str) -> AsyncIterator[Dict[str, Any]]:
+            await self._log_progress(
+                f"🔍 Searching Amazon for: {keyword}", 
+                progress_callback
+            )
+            
+            found_asins = []
+            duplicates = 0
+            
+            async def claim_asin(asin: str, emit: Callable[[str], Awaitable[None]]):
+                # Queue a product for extraction unless another keyword already has it
+                nonlocal duplicates
+                found_asins.append(asin)
+                if asin in seen_asins:
+                    duplicates += 1
+                    return
+                seen_asins.add(asin)
+                self.engine.attempted_keys.add(f"asin:{asin}")
+                await emit(asin)
+            
+            async def discover_products(emit: Callable[[str], Awaitable[None]]):
                 # Search and get product links
-                product_asins = await self._search_products(
+                await self._search_products(
                     context, 
                     keyword, 
                     max_results,
-                    progress_callback
+                    progress_callback,
+                    on_asin=lambda asin: claim_asin(asin, emit)
                 )
-                
                 await self._log_progress(
-                    f"✅ Found {len(product_asins)} products for '{keyword}'",
+                    f"✅ Found {len(found_asins)} products for '{keyword}'"
+                    + (f" ({duplicates} already found by other keywords)" if duplicates else ""),
                     progress_callback
                 )
-                
-                # Extract details in batches
-                batch_size = 3  # Process 3 products at a time
-                
-                for i in range(0, len(product_asins), batch_size):
-                    batch = product_asins[i:i+batch_size]
-                    
-                    progress = min(i + batch_size, len(product_asins))
+            
+            async def scrape_product(asin: str) -> Dict[str, Any]:
+                async with limiter.slot() as lease:
+                    return await self._extract_product_details(context, asin, extract_reviews, lease)
+            
+            async def extract_product(asin: str) -> Dict[str, Any]:
+                return await self._from_cache_or_scrape(
+                    CACHE_KIND,
+                    asin,
+                    max_age_hours,
+                    lambda: scrape_product(asin),
+                    required_fields=['reviews'] if extract_reviews else [],
+                    identity_fields=['title', 'price']
+                )
+            
+            # Details are extracted while later search pages are still loading;
+            # enough workers for the highest limit, the limiter decides how many run
+            extracted = 0
+            keyword_products = 0
+            async for result in self._pipeline(discover_products, extract_product, limiter.max_limit):
+                extracted += 1
+                if extracted % BROWSER_INITIAL_CONCURRENCY == 0:
                     await self._log_progress(
-                        f"📊 Extracting details: {progress}/{len(product_asins)}",
+                        f"📊 Extracted details for '{keyword}': {extracted}/{len(found_asins) - duplicates}",
                         progress_callback
                     )
-                    
-                    # Parallel extraction within batch
-                    tasks = [
-                        self._extract_product_details(
-                            context,
-                            asin,
-                            extract_reviews
-                        )
-                        for asin in batch
-                    ]
-                    
-                    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for result in batch_results:
-                        if isinstance(result, dict):
-                            # Apply filters
-                            if min_rating > 0 and result.get('rating', 0) < min_rating:
-                                continue
-                            if max_price and result.get('price', float('inf')) > max_price:
-                                continue
-                            
-                            result['searchKeyword'] = keyword
-                            all_products.append(result)
                 
+                # Apply filters
+                if min_rating > 0 and result.get('rating', 0) < min_rating:
+                    continue
+                if max_price and result.get('price', float('inf')) > max_price:
+                    continue
+                
+                result['searchKeyword'] = keyword
+                keyword_products += 1
+                yield result
+            
+            await self._log_progress(
+                f"✅ Completed scraping for '{keyword}': {keyword_products} products",
+                progress_callback
+            )
+        
+        try:
+            # Keywords run concurrently and share the run's browser context and HTTP pool
+            async for result in self._fan_out(search_keywords, scrape_keyword, term_concurrency):
+                total_products += 1
+                yield result
+            
+            if self.engine.entity_cache is not None and self.engine.entity_cache.hits:
                 await self._log_progress(
-                    f"✅ Completed scraping for '{keyword}': {len([p for p in all_products if p.get('searchKeyword') == keyword])} products",
+                    f"♻️ {self.engine.entity_cache.hits} products served from cache (max age {max_age_hours:g}h)",
                     progress_callback
                 )
-            
             await self._log_progress(
-                f"🎉 Scraping complete! Total products: {len(all_products)}",
+                f"🎉 Scraping complete! Total products: {total_products}",
                 progress_callback
             )
             
         finally:
+            if self.http_fetcher:
+                await self.http_fetcher.close()
+                self.http_fetcher = None
             await context.close()
-        
-        return all_products
     
     async def _search_products(
         self,
         context,
         keyword: str,
         max_results: int,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        on_asin: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> List[str]:
-        """Search Amazon and extract product ASINs with pagination support."""
+        """
+        Search Amazon and extract product ASINs with pagination support.
+        on_asin is awaited with each new ASIN as soon as its results page is parsed.
+        """
         
         page = await context.new_page()
         asins = []
@@ -240,7 +350,7 @@ class AmazonProductScraper(BaseScraper):
                 )
                 
                 await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(5)  # Increased wait time for Amazon
+                await self.engine.wait_for_selector_safe(page, SEARCH_READY_SELECTOR)
                 
                 # Check for error pages (503, dogs, etc.)
                 content = await page.content()
@@ -259,7 +369,7 @@ class AmazonProductScraper(BaseScraper):
                         
                         try:
                             await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                            await asyncio.sleep(5)
+                            await self.engine.wait_for_selector_safe(page, SEARCH_READY_SELECTOR)
                             content = await page.content()
                             if "Sorry! Something went wrong!" not in content and "dogs of amazon" not in content.lower():
                                 retry_success = True
@@ -276,50 +386,43 @@ class AmazonProductScraper(BaseScraper):
                 if "api-services-support@amazon.com" in content or "Enter the characters you see below" in content:
                     logger.warning(f"⚠️ CAPTCHA DETECTED on page {current_page}!")
                     # Try to refresh once
-                    await page.reload()
-                    await asyncio.sleep(5)
+                    await page.reload(wait_until="domcontentloaded")
+                    await self.engine.wait_for_selector_safe(page, SEARCH_READY_SELECTOR)
                     content = await page.content()
                 
                 # Scroll to load products
-                for _ in range(5):  # Increased scrolling
-                    await page.evaluate("window.scrollBy(0, window.innerHeight)")
-                    await asyncio.sleep(0.5)
+                await self.engine.scroll_page(page, max_scrolls=5)
                 
                 # Extract product ASINs from search results
                 content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
+                parsed = await get_parse_executor().run(parse_search_html, content)
                 
                 # Debug logging
-                title = soup.title.string if soup.title else "No Title"
-                logger.info(f"Page Title: {title}")
+                logger.info(f"Page Title: {parsed['title']}")
                 logger.info(f"Page Content Length: {len(content)}")
                 
-                # Find product containers
-                product_divs = soup.find_all('div', {'data-asin': True})
-                
+                # Product containers
                 page_asins_found = 0
-                for div in product_divs:
-                    asin = div.get('data-asin')
-                    if asin and asin.strip() and len(asin) == 10:  # Valid ASIN
+                for asin in parsed['result_asins']:
+                    if asin not in asins:
+                        asins.append(asin)
+                        page_asins_found += 1
+                        if on_asin:
+                            await on_asin(asin)
+                        if len(asins) >= max_results:
+                            break
+                
+                # Try alternate selector if few products found on first page
+                if current_page == 1 and page_asins_found < 5:
+                    for asin in parsed['link_asins']:
                         if asin not in asins:
                             asins.append(asin)
                             page_asins_found += 1
+                            if on_asin:
+                                await on_asin(asin)
                             if len(asins) >= max_results:
                                 break
                 
-                # Try alternate selector if few products found on first page
-                if current_page == 1 and page_asins_found < 5:
-                    links = soup.find_all('a', href=re.compile(r'/dp/[A-Z0-9]{10}'))
-                    for link in links:
-                        match = re.search(r'/dp/([A-Z0-9]{10})', link['href'])
-                        if match:
-                            asin = match.group(1)
-                            if asin not in asins:
-                                asins.append(asin)
-                                page_asins_found += 1
-                                if len(asins) >= max_results:
-                                    break
-                
                 # If no products found on this page, break (reached end of results)
                 if page_asins_found == 0:
                     await self._log_progress(
@@ -335,7 +438,7 @@ class AmazonProductScraper(BaseScraper):
                 # Move to next page if we haven't reached max_results yet
                 if len(asins) < max_results:
                     current_page += 1
-                    await asyncio.sleep(1)  # Small delay between pages
+                    await self.engine.pace()  # Optional anti-bot pacing between pages
             
             await self._log_progress(
                 f"✅ Completed search for '{keyword}': {len(asins)} products found",
@@ -353,313 +456,107 @@ class AmazonProductScraper(BaseScraper):
         self,
         context,
         asin: str,
-        extract_reviews: bool = False
+        extract_reviews: bool = False,
+        lease: Optional[LimiterLease] = None
     ) -> Dict[str, Any]:
-        """Extract detailed information from a product page."""
+        """
+        Extract detailed information from a product page.
+        Throttling (429/503, robot checks, timeouts) is reported on the lease.
+        """
         
-        page = await context.new_page()
         product_data = {
             'asin': asin,
             'url': f"{self.base_url}/dp/{asin}"
         }
         
         try:
-            await page.goto(product_data['url'], wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(2)
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Title
-            title_elem = soup.find('span', {'id': 'productTitle'})
-            if title_elem:
-                product_data['title'] = title_elem.text.strip()
-            
-            # Price
-            price_whole = soup.find('span', {'class': 'a-price-whole'})
-            price_fraction = soup.find('span', {'class': 'a-price-fraction'})
-            if price_whole:
-                try:
-                    price_str = price_whole.text.replace(',', '').strip('.')
-                    if price_fraction:
-                        price_str += '.' + price_fraction.text.strip()
-                    product_data['price'] = float(price_str)
-                    product_data['currency'] = 'USD'
-                except:
-                    pass
-            
-            # Original price / discount
-            original_price = soup.find('span', {'class': 'a-price a-text-price'})
-            if original_price:
-                try:
-                    orig_text = original_price.find('span', {'class': 'a-offscreen'})
-                    if orig_text:
-                        orig_price = float(orig_text.text.replace('$', '').replace(',', '').strip())
-                        product_data['originalPrice'] = orig_price
-                        if 'price' in product_data:
-                            discount = ((orig_price - product_data['price']) / orig_price) * 100
-                            product_data['discount'] = round(discount, 2)
-                except:
-                    pass
-            
-            # Rating
-            rating_elem = soup.find('span', {'class': 'a-icon-alt'})
-            if rating_elem:
-                rating_text = rating_elem.text
-                match = re.search(r'(\d+\.?\d*)\s*out of', rating_text)
-                if match:
-                    product_data['rating'] = float(match.group(1))
-            
-            # Review count
-            review_elem = soup.find('span', {'id': 'acrCustomerReviewText'})
-            if review_elem:
-                review_text = review_elem.text
-                match = re.search(r'([\d,]+)', review_text)
-                if match:
-                    product_data['reviewCount'] = int(match.group(1).replace(',', ''))
-            
-            # Availability
-            avail_elem = soup.find('div', {'id': 'availability'})
-            if avail_elem:
-                product_data['availability'] = avail_elem.text.strip()
-            
-            # Prime eligible
-            prime_elem = soup.find('i', {'class': 'a-icon-prime'})
-            product_data['prime'] = prime_elem is not None
-            
-            # Images - Extract both product images and videos
-            images = []
-            videos = []
-            
-            # Try main product image first (high quality)
-            main_image = soup.find('img', {'id': 'landingImage'})
-            if main_image and main_image.get('src'):
-                main_src = main_image.get('src', '')
-                if 'amazon.com' in main_src:
-                    # Get highest resolution
-                    high_res = main_src.replace('._AC_SX355_', '._AC_SL1500_').replace('._AC_SY355_', '._AC_SL1500_')
-                    images.append(high_res)
-            
-            # Get additional images from image block
-            image_block = soup.find('div', {'id': 'altImages'})
-            if image_block:
-                img_tags = image_block.find_all('img')
-                for img in img_tags:
-                    src = img.get('src', '')
-                    if src and 'amazon.com' in src and src not in images:
-                        # Get high-res version
-                        high_res = src.replace('_SS40_', '_SL1500_').replace('_US40_', '_SL1500_')
-                        if high_res not in images:
-                            images.append(high_res)
-            
-            # Extract video if present - Multiple methods for better coverage
-            
-            # Method 1: Check video block
-            video_block = soup.find('div', {'id': 'ivVideoBlock'})
-            if video_block:
-                video_tags = video_block.find_all('video')
-                for video in video_tags:
-                    video_src = video.get('src', '')
-                    if video_src and video_src not in videos:
-                        # Ensure it's a full URL
-                        if not video_src.startswith('http'):
-                            video_src = 'https:' + video_src if video_src.startswith('//') else video_src
-                        if video_src.startswith('http'):
-                            videos.append(video_src)
-                            print(f"[VIDEO] Method 1 - Found video: {video_src[:100]}")
-            
-            # Method 2: Check for video in image carousel scripts
-            video_scripts = soup.find_all('script', {'type': 'text/javascript'})
-            for script in video_scripts:
-                if script.string and '"videos"' in script.string:
-                    try:
-                        import json
-                        # Try to extract video URL from JSON
-                        match = re.search(r'"videos"\s*:\s*(\[.*?\])', script.string)
-                        if match:
-                            video_data = json.loads(match.group(1))
-                            for vid in video_data:
-                                if isinstance(vid, dict) and 'url' in vid:
-                                    video_url = vid['url']
-                                    if video_url and video_url not in videos:
-                                        if not video_url.startswith('http'):
-                                            video_url = 'https:' + video_url if video_url.startswith('//') else video_url
-                                        if video_url.startswith('http'):
-                                            videos.append(video_url)
-                                            print(f"[VIDEO] Method 2 - Found video: {video_url[:100]}")
-                    except Exception as e:
-                        print(f"[VIDEO] Method 2 error: {e}")
-            
-            # Method 3: Look for image/video data in imageBlock scripts  
-            for script in video_scripts:
-                if script.string and 'colorImages' in script.string:
-                    try:
-                        # Look for video URLs in the main image data object
-                        video_url_matches = re.findall(r'"(https://[^"]*\.mp4[^"]*)"', script.string or '')
-                        for video_url in video_url_matches:
-                            if video_url and video_url not in videos:
-                                videos.append(video_url)
-                                print(f"[VIDEO] Method 3 - Found video: {video_url[:100]}")
-                    except Exception as e:
-                        print(f"[VIDEO] Method 3 error: {e}")
-            
-            # Method 4: Look for videos in the imageBlock data
-            for script in video_scripts:
-                if script.string and 'imageBlock' in script.string:
-                    try:
-                        # Find video URLs with better pattern matching
-                        # Amazon videos often have patterns like: /videos/...mp4
-                        all_video_urls = re.findall(r'"(https?://[^"]*(?:videos?/)[^"]*\.mp4[^"]*)"', script.string or '')
-                        for video_url in all_video_urls:
-                            if video_url and video_url not in videos:
-                                videos.append(video_url)
-                                print(f"[VIDEO] Method 4 - Found video: {video_url[:100]}")
-                    except Exception as e:
-                        print(f"[VIDEO] Method 4 error: {e}")
-            
-            print(f"[VIDEO] Total videos found: {len(videos)}")
-            
-            product_data['images'] = images[:10]  # Limit to 10 images
-            product_data['videos'] = videos[:3]  # Limit to 3 videos
-            
-            # Features
-            features = []
-            feature_div = soup.find('div', {'id': 'feature-bullets'})
-            if feature_div:
-                feature_items = feature_div.find_all('span', {'class': 'a-list-item'})
-                for item in feature_items:
-                    text = item.text.strip()
-                    if text and len(text) > 10:
-                        features.append(text)
-            product_data['features'] = features
-            
-            # Description
-            desc_elem = soup.find('div', {'id': 'productDescription'})
-            if desc_elem:
-                product_data['description'] = desc_elem.text.strip()[:500]  # Limit length
-            
-            # Brand - extract from multiple possible locations
-            brand = None
-            brand_elem = soup.find('a', {'id': 'bylineInfo'})
-            if brand_elem:
-                brand_text = brand_elem.text.strip()
-                if 'Visit the' in brand_text:
-                    brand = brand_text.replace('Visit the', '').replace('Store', '').strip()
-                elif 'Brand:' in brand_text:
-                    brand = brand_text.replace('Brand:', '').strip()
-                else:
-                    brand = brand_text
-            product_data['brand'] = brand
-            
-            # Dimensions and weight
-            dimensions = {}
-            detail_bullets = soup.find('div', {'id': 'detailBullets_feature_div'})
-            if detail_bullets:
-                items = detail_bullets.find_all('li')
-                for item in items:
-                    text = item.text.strip()
-                    if 'Product Dimensions' in text or 'Package Dimensions' in text:
-                        dim_match = re.search(r':\s*(.+)', text)
-                        if dim_match:
-                            dimensions['size'] = dim_match.group(1).strip()
-                    elif 'Item Weight' in text:
-                        weight_match = re.search(r':\s*(.+)', text)
-                        if weight_match:
-                            dimensions['weight'] = weight_match.group(1).strip()
-            product_data['dimensions'] = dimensions
-            
-            # Color and size variants
-            color = None
-            size = None
-            variation_elem = soup.find('div', {'id': 'variation_color_name'})
-            if variation_elem:
-                selected_color = variation_elem.find('span', {'class': 'selection'})
-                if selected_color:
-                    color = selected_color.text.strip()
-            
-            variation_size = soup.find('div', {'id': 'variation_size_name'})
-            if variation_size:
-                selected_size = variation_size.find('span', {'class': 'selection'})
-                if selected_size:
-                    size = selected_size.text.strip()
-            
-            product_data['color'] = color
-            product_data['size'] = size
-            
-            # Stock quantity (if available)
-            stock_elem = soup.find('span', {'class': 'a-size-medium a-color-success'})
-            if stock_elem:
-                stock_text = stock_elem.text.strip()
-                stock_match = re.search(r'(\d+)\s*in stock', stock_text, re.IGNORECASE)
-                if stock_match:
-                    product_data['stock'] = int(stock_match.group(1))
-            
-            # Shipping info
-            shipping_elem = soup.find('div', {'id': 'deliveryBlockMessage'})
-            if not shipping_elem:
-                shipping_elem = soup.find('div', {'id': 'mir-layout-DELIVERY_BLOCK'})
-            if shipping_elem:
-                product_data['shipping'] = shipping_elem.text.strip()[:200]
-            
-            # Seller info
-            seller_elem = soup.find('a', {'id': 'sellerProfileTriggerId'})
-            if seller_elem:
-                product_data['seller'] = seller_elem.text.strip()
-            
-            # Sold by
-            soldby_elem = soup.find('div', {'id': 'merchant-info'})
-            if soldby_elem:
-                product_data['soldBy'] = soldby_elem.text.strip()
-            
-            # Category
-            breadcrumb = soup.find('div', {'id': 'wayfinding-breadcrumbs_feature_div'})
-            if breadcrumb:
-                categories = breadcrumb.find_all('a')
-                if categories:
-                    product_data['category'] = categories[-1].text.strip()
-            
-            # Best Sellers Rank
-            rank_table = soup.find('table', {'id': 'productDetails_detailBullets_sections1'})
-            if rank_table:
-                rows = rank_table.find_all('tr')
-                for row in rows:
-                    th = row.find('th')
-                    if th and 'Best Sellers Rank' in th.text:
-                        td = row.find('td')
-                        if td:
-                            product_data['bestSellerRank'] = td.text.strip()[:200]
+            content = await self._get_page_html(
+                context,
+                product_data['url'],
+                '#productTitle, ' + CAPTCHA_FORM_SELECTOR,
+                lease=lease
+            )
+            product_data.update(await get_parse_executor().run(parse_product_html, content))
             
             # Extract reviews if requested
             if extract_reviews:
-                reviews = await self._extract_reviews(page, asin)
+                reviews = await self._extract_reviews(context, asin, lease)
                 product_data['reviews'] = reviews
             
         except Exception as e:
             logger.error(f"Error extracting product {asin}: {e}")
             product_data['error'] = str(e)
-        finally:
-            await page.close()
+            # Blocks were already reported on the lease as throttling
+            if lease and not isinstance(e, BlockedPageError):
+                if isinstance(e, PlaywrightTimeoutError):
+                    lease.throttled()
+                else:
+                    lease.failed()
         
         return product_data
     
-    async def _extract_reviews(self, page: Page, asin: str) -> List[str]:
+    def _is_block_page(self, html: str) -> bool:
+        """Detect robot check / error pages."""
+        return any(marker in html for marker in BLOCK_PAGE_MARKERS) or "dogs of amazon" in html.lower()
+    
+    async def _get_page_html(
+        self,
+        context,
+        url: str,
+        ready_selector: str,
+        timeout: int = 30000,
+        lease: Optional[LimiterLease] = None
+    ) -> str:
+        """
+        Get a page's HTML over HTTP when possible, falling back to a browser page
+        when the request fails or Amazon serves a robot check.
+        Rate limits and robot checks are reported on the lease as throttling.
+        
+        Raises:
+            BlockedPageError: The browser was blocked as well
+        """
+        if self.http_fetcher and self._http_blocks < HTTP_BLOCK_LIMIT:
+            status, html = await self.http_fetcher.get(url)
+            if status == 200 and html and not self._is_block_page(html):
+                self._http_blocks = 0
+                return html
+            
+            if lease and (status in THROTTLE_STATUSES or (html and self._is_block_page(html))):
+                lease.throttled()
+            self._http_blocks += 1
+            logger.info(f"HTTP fetch blocked for {url} (status {status}), falling back to browser")
+            if self._http_blocks == HTTP_BLOCK_LIMIT:
+                logger.warning(f"⚠️ {HTTP_BLOCK_LIMIT} consecutive HTTP blocks, using the browser for the rest of this run")
+        
+        page = await context.new_page()
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            await self.engine.wait_for_selector_safe(page, ready_selector)
+            content = await page.content()
+            status = response.status if response else None
+            if status in THROTTLE_STATUSES or self._is_block_page(content):
+                if lease:
+                    lease.throttled()
+                raise BlockedPageError(f"Blocked by Amazon (status {status}) for {url}")
+            return content
+        finally:
+            await page.close()
+    
+    async def _extract_reviews(self, context, asin: str, lease: Optional[LimiterLease] = None) -> List[str]:
         """Extract review texts from product reviews page."""
         reviews = []
         
         try:
-            # Navigate to reviews page
+            # Fetch reviews page
             reviews_url = f"{self.base_url}/product-reviews/{asin}"
-            await page.goto(reviews_url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(2)
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            review_divs = soup.find_all('div', {'data-hook': 'review'})
-            for div in review_divs[:10]:  # Limit to 10 reviews
-                review_text = div.find('span', {'data-hook': 'review-body'})
-                if review_text:
-                    reviews.append(review_text.text.strip())
+            content = await self._get_page_html(
+                context,
+                reviews_url,
+                'div[data-hook="review"], #cm_cr-review_list',
+                timeout=20000,
+                lease=lease
+            )
+            reviews = await get_parse_executor().run(parse_reviews_html, content, 10)  # Limit to 10 reviews
         
         except Exception as e:
             logger.error(f"Error extracting reviews for {asin}: {e}")
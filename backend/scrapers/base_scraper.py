@@ -4,12 +4,20 @@ All scrapers must inherit from this class to ensure consistency.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Awaitable, Iterable
 from .scraper_engine import ScraperEngine
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# How many search terms/keywords a run works on at once unless its input overrides it
+DEFAULT_TERM_CONCURRENCY = int(os.getenv('SCRAPER_TERM_CONCURRENCY', '3'))
+
+# Marks the end of a fan-out or pipeline worker's output
+_WORKER_DONE = object()
+
 
 class BaseScraper(ABC):
     """
@@ -47,6 +55,163 @@ class BaseScraper(ABC):
         """
         pass
     
+    async def scrape_stream(
+        self,
+        config: Dict[str, Any],
+        progress_callback: Optional[Callable] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of scrape() that yields items as they are extracted.
+        
+        The job runner consumes this so results are persisted in batches while
+        the scraper is still running. Scrapers should override it; the default
+        falls back to scrape() and yields its complete result list.
+        
+        Args:
+            config: Dictionary with scraper-specific configuration
+            progress_callback: Optional async function to report progress
+            
+        Yields:
+            Dictionaries containing scraped data
+        """
+        for item in await self.scrape(config, progress_callback):
+            yield item
+    
+    async def _collect_stream(
+        self,
+        config: Dict[str, Any],
+        progress_callback: Optional[Callable] = None
+    ) -> List[Dict[str, Any]]:
+        """Collect scrape_stream() into a list for scrapers implementing scrape() on top of it."""
+        return [item async for item in self.scrape_stream(config, progress_callback)]
+    
+    async def _fan_out(
+        self,
+        inputs: Iterable[Any],
+        worker: Callable[[Any], AsyncIterator[Dict[str, Any]]],
+        concurrency: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run worker(input) for every input with at most `concurrency` running at once,
+        yielding items from all of them as they arrive.
+        
+        Workers are async generators. An exception in one worker cancels the rest and
+        is re-raised to the consumer; closing the consumer cancels all workers.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        # Bounded so workers pause while the consumer persists a backlog
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        
+        async def run(value):
+            try:
+                async with semaphore:
+                    async for item in worker(value):
+                        await queue.put((item, None))
+                await queue.put((_WORKER_DONE, None))
+            except Exception as e:
+                await queue.put((_WORKER_DONE, e))
+        
+        tasks = [asyncio.create_task(run(value)) for value in inputs]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item, error = await queue.get()
+                if item is _WORKER_DONE:
+                    remaining -= 1
+                    if error is not None:
+                        raise error
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _pipeline(
+        self,
+        produce: Callable[[Callable[[Any], Awaitable[None]]], Awaitable[None]],
+        extract: Callable[[Any], Awaitable[Any]],
+        workers: int
+    ) -> AsyncIterator[Any]:
+        """
+        Stream inputs through a pool of extraction workers.
+        
+        produce(emit) discovers inputs and awaits emit(value) for each one; `workers`
+        tasks pull from the queue and call extract(value) as soon as the first input
+        arrives, so one slow page never holds back the others. Non-None results are
+        yielded as they complete; extract() errors skip that input, produce() errors
+        are re-raised once in-flight extractions finish.
+        """
+        inputs: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=100)
+        workers = max(1, workers)
+        
+        async def run_producer():
+            try:
+                await produce(inputs.put)
+            finally:
+                for _ in range(workers):
+                    inputs.put_nowait(_WORKER_DONE)
+        
+        async def run_worker():
+            while True:
+                value = await inputs.get()
+                if value is _WORKER_DONE:
+                    break
+                try:
+                    result = await extract(value)
+                except Exception as e:
+                    logger.debug(f"Extraction failed for {value}: {e}")
+                    continue
+                if result is not None:
+                    await results.put(result)
+            await results.put(_WORKER_DONE)
+        
+        producer = asyncio.create_task(run_producer())
+        tasks = [asyncio.create_task(run_worker()) for _ in range(workers)]
+        remaining = workers
+        try:
+            while remaining:
+                result = await results.get()
+                if result is _WORKER_DONE:
+                    remaining -= 1
+                    continue
+                yield result
+            await producer
+        finally:
+            for task in [producer] + tasks:
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+    
+    async def _from_cache_or_scrape(
+        self,
+        kind: str,
+        key: Optional[str],
+        max_age_hours: float,
+        scrape: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        required_fields: Iterable[str] = (),
+        identity_fields: Iterable[str] = ()
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve an entity from the engine's entity cache if it was scraped within
+        max_age_hours, otherwise scrape() it and store the result.
+        
+        required_fields rejects cached entries missing data this run asks for (e.g. reviews).
+        Results that are None, carry an 'error', or have none of identity_fields
+        (e.g. a block page parsed into a blank product) are not cached.
+        """
+        cache = self.engine.entity_cache
+        if cache is not None:
+            cached = await cache.get(kind, key, max_age_hours, required_fields)
+            if cached is not None:
+                return cached
+        
+        result = await scrape()
+        if cache is not None and result is not None and 'error' not in result:
+            if not identity_fields or any(result.get(field) for field in identity_fields):
+                await cache.put(kind, key, result)
+        return result
+    
     @abstractmethod
     def get_input_schema(self) -> Dict[str, Any]:
         """
@@ -116,3 +281,4 @@ class BaseScraper(ABC):
                 await progress_callback(message)
             except Exception as e:
                 logger.error(f"Progress callback error: {e}")
+
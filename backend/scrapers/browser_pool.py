@@ -0,0 +1,264 @@
+"""
+Browser Pool - Process-wide pool of warm Chromium instances.
+ScraperEngine leases browser contexts from the pool instead of launching
+and tearing down a full browser for every run.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# Chromium launch arguments shared by pooled and standalone engines
+BROWSER_LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--window-size=1920,1080',
+    '--start-maximized',
+]
+
+
+class PooledBrowser:
+    """A single Chromium instance tracked by the pool."""
+
+    def __init__(self, browser: Browser, slot: int):
+        self.browser = browser
+        self.slot = slot
+        self.launched_at = time.monotonic()
+        self.contexts_created = 0
+        self.active_contexts = 0
+
+    @property
+    def age_minutes(self) -> float:
+        return (time.monotonic() - self.launched_at) / 60
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "slot": self.slot,
+            "connected": self.browser.is_connected(),
+            "age_minutes": round(self.age_minutes, 1),
+            "contexts_created": self.contexts_created,
+            "active_contexts": self.active_contexts
+        }
+
+
+class BrowserPool:
+    """
+    Pool of N long-lived Chromium browsers that hands out browser contexts.
+
+    Provides:
+    - Bounded context leasing (waits when every browser is at capacity)
+    - Health checks that replace disconnected browsers
+    - Recycling after K contexts or M minutes to bound memory leaks
+    - Lease wait time metrics
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_contexts_per_browser: Optional[int] = None,
+        recycle_after_contexts: Optional[int] = None,
+        recycle_after_minutes: Optional[float] = None,
+        health_check_interval: Optional[float] = None
+    ):
+        self.size = size or int(os.getenv('BROWSER_POOL_SIZE', '2'))
+        self.max_contexts_per_browser = max_contexts_per_browser or int(os.getenv('BROWSER_POOL_MAX_CONTEXTS', '8'))
+        self.recycle_after_contexts = recycle_after_contexts or int(os.getenv('BROWSER_RECYCLE_AFTER_CONTEXTS', '200'))
+        self.recycle_after_minutes = recycle_after_minutes or float(os.getenv('BROWSER_RECYCLE_AFTER_MINUTES', '30'))
+        self.health_check_interval = health_check_interval or float(os.getenv('BROWSER_HEALTH_CHECK_INTERVAL', '30'))
+
+        self.playwright = None
+        self.browsers: List[PooledBrowser] = []
+        self._retiring: List[PooledBrowser] = []
+        self._lease_semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._health_task: Optional[asyncio.Task] = None
+        self._started = False
+
+        # Lease metrics
+        self._lease_waits: deque = deque(maxlen=1000)
+        self.total_leases = 0
+        self.browsers_recycled = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.size * self.max_contexts_per_browser
+
+    async def start(self):
+        """Start Playwright and launch the warm browsers. Safe to call repeatedly."""
+        async with self._lock:
+            if self._started:
+                return
+
+            self.playwright = await async_playwright().start()
+            self._lease_semaphore = asyncio.Semaphore(self.capacity)
+            for slot in range(self.size):
+                self.browsers.append(await self._launch(slot))
+
+            self._health_task = asyncio.create_task(self._health_loop())
+            self._started = True
+            logger.info(
+                f"Browser pool started: {self.size} browsers x {self.max_contexts_per_browser} contexts "
+                f"(recycle after {self.recycle_after_contexts} contexts or {self.recycle_after_minutes} min)"
+            )
+
+    async def _launch(self, slot: int) -> PooledBrowser:
+        browser = await self.playwright.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        return PooledBrowser(browser, slot)
+
+    async def new_context(self, **context_options) -> BrowserContext:
+        """
+        Lease a new browser context from the least loaded browser.
+        The lease is released automatically when the context is closed.
+        """
+        if not self._started:
+            await self.start()
+
+        wait_start = time.monotonic()
+        await self._lease_semaphore.acquire()
+
+        try:
+            pooled = await self._pick_browser()
+            self._lease_waits.append(time.monotonic() - wait_start)
+            context = await pooled.browser.new_context(**context_options)
+        except Exception:
+            self._lease_semaphore.release()
+            raise
+
+        self.total_leases += 1
+        pooled.contexts_created += 1
+        pooled.active_contexts += 1
+
+        released = False
+
+        def on_close(_):
+            nonlocal released
+            if not released:
+                released = True
+                self._release(pooled)
+
+        context.on("close", on_close)
+        return context
+
+    async def _pick_browser(self) -> PooledBrowser:
+        """Return the least loaded healthy browser, replacing unhealthy or expired ones first."""
+        async with self._lock:
+            await self._recycle_unhealthy()
+            return min(self.browsers, key=lambda b: b.active_contexts)
+
+    def _should_recycle(self, pooled: PooledBrowser) -> bool:
+        return (
+            not pooled.browser.is_connected()
+            or pooled.contexts_created >= self.recycle_after_contexts
+            or pooled.age_minutes >= self.recycle_after_minutes
+        )
+
+    async def _recycle_unhealthy(self):
+        """Replace browsers that disconnected or reached their context/age budget. Caller holds the lock."""
+        for index, pooled in enumerate(self.browsers):
+            if not self._should_recycle(pooled):
+                continue
+
+            logger.info(f"Recycling pooled browser {pooled.slot}: {pooled.to_dict()}")
+            self.browsers_recycled += 1
+
+            if pooled.active_contexts > 0 and pooled.browser.is_connected():
+                # Let in-flight contexts finish; closed once the last one is released
+                self._retiring.append(pooled)
+            else:
+                await self._close_browser(pooled)
+
+            self.browsers[index] = await self._launch(pooled.slot)
+
+    def _release(self, pooled: PooledBrowser):
+        pooled.active_contexts -= 1
+        self._lease_semaphore.release()
+
+        if pooled in self._retiring and pooled.active_contexts <= 0:
+            self._retiring.remove(pooled)
+            asyncio.create_task(self._close_browser(pooled))
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        try:
+            if pooled.browser.is_connected():
+                await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser {pooled.slot}: {e}")
+
+    async def _health_loop(self):
+        """Periodically replace crashed or expired browsers even when no leases are requested."""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                async with self._lock:
+                    await self._recycle_unhealthy()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Browser pool health check failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilization and lease wait time metrics."""
+        waits_ms = sorted(w * 1000 for w in self._lease_waits)
+        active = sum(b.active_contexts for b in self.browsers + self._retiring)
+
+        return {
+            "started": self._started,
+            "size": self.size,
+            "capacity": self.capacity,
+            "active_contexts": active,
+            "total_leases": self.total_leases,
+            "browsers_recycled": self.browsers_recycled,
+            "lease_wait_ms": {
+                "avg": round(sum(waits_ms) / len(waits_ms), 2) if waits_ms else 0,
+                "p95": round(waits_ms[int((len(waits_ms) - 1) * 0.95)], 2) if waits_ms else 0,
+                "max": round(waits_ms[-1], 2) if waits_ms else 0,
+                "samples": len(waits_ms)
+            },
+            "browsers": [b.to_dict() for b in self.browsers],
+            "retiring": [b.to_dict() for b in self._retiring]
+        }
+
+    async def close(self):
+        """Close every browser and stop Playwright."""
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+
+        for pooled in self.browsers + self._retiring:
+            await self._close_browser(pooled)
+        self.browsers = []
+        self._retiring = []
+
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+        self._started = False
+        logger.info("Browser pool closed")
+
+
+# Global browser pool instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool instance."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
@@ -0,0 +1,200 @@
+"""
+Enrichment Fetcher - pooled HTTP fetches of business websites.
+One aiohttp session per run (keep-alive, DNS cache, per-host limits) and a
+process-wide TTL cache keyed by domain, so every branch of a chain that
+shares a website triggers a single fetch and a single parse. Pages on hosts
+shared by unrelated businesses (social profiles, site builders, link pages)
+are keyed by their full URL instead.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+# Hosts where each business only owns a path; their pages must not share a cache entry
+SHARED_HOSTS = (
+    'facebook.com', 'fb.com', 'instagram.com', 'twitter.com', 'x.com', 'linkedin.com',
+    'youtube.com', 'tiktok.com', 'linktr.ee', 'sites.google.com', 'business.site',
+    'wixsite.com', 'square.site', 'godaddysites.com', 'weebly.com', 'wordpress.com',
+    'blogspot.com', 'yelp.com', 'tripadvisor.com'
+)
+
+
+def is_shared_host(host: str) -> bool:
+    """Whether host is (a subdomain of) a host shared by unrelated businesses."""
+    return any(host == shared or host.endswith('.' + shared) for shared in SHARED_HOSTS)
+
+
+def domain_key(url: str) -> Optional[str]:
+    """
+    Normalize a URL to its cache key: the domain (lowercase, without www.), or
+    domain plus path for pages on shared hosts.
+    """
+    try:
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+    except ValueError:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    if is_shared_host(host):
+        path = parsed.path.rstrip('/')
+        return f"{host}{path}"
+    return host
+
+
+class DomainCache:
+    """
+    LRU cache of parsed website results with a TTL, keyed by domain_key().
+    Failed fetches are remembered only for a short failure TTL, so one transient
+    error doesn't suppress a domain's enrichment for the full TTL.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        failure_ttl_seconds: Optional[int] = None
+    ):
+        self.ttl_seconds = ttl_seconds or int(os.getenv('ENRICHMENT_CACHE_TTL_SECONDS', '3600'))
+        self.failure_ttl_seconds = (
+            failure_ttl_seconds if failure_ttl_seconds is not None
+            else int(os.getenv('ENRICHMENT_CACHE_FAILURE_TTL_SECONDS', '60'))
+        )
+        self.max_entries = max_entries or int(os.getenv('ENRICHMENT_CACHE_MAX_ENTRIES', '5000'))
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value); expired entries count as misses."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, key: str, value: Any, failed: bool = False):
+        """Store a result; failed ones expire after the failure TTL (0 disables caching them)."""
+        ttl = self.failure_ttl_seconds if failed else self.ttl_seconds
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class EnrichmentFetcher:
+    """Fetches and parses business websites for one run over a pooled session."""
+
+    def __init__(
+        self,
+        cache: Optional[DomainCache] = None,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.cache = cache or get_enrichment_cache()
+        self.limit = limit or int(os.getenv('ENRICHMENT_MAX_CONNECTIONS', '50'))
+        self.limit_per_host = limit_per_host or int(os.getenv('ENRICHMENT_MAX_PER_HOST', '2'))
+        self.timeout = timeout or float(os.getenv('ENRICHMENT_TIMEOUT_SECONDS', '10'))
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Fetches in progress, so concurrent places sharing a domain wait for one request
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=ENRICHMENT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def fetch(self, url: str, parse: Callable[[str], Awaitable[Any]]) -> Any:
+        """
+        Fetch a website once per domain (once per page on shared hosts) and return await parse(html).
+        Results are cached by domain_key for the cache TTL; failures (None) only
+        for the short failure TTL.
+        """
+        key = domain_key(url)
+        if key is None:
+            return None
+
+        found, value = self.cache.get(key)
+        if found:
+            return value
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        value = None
+        try:
+            html = await self._get(url)
+            if html is not None:
+                try:
+                    value = await parse(html)
+                except Exception as e:
+                    logger.debug(f"Enrichment parse error for {url}: {str(e)}")
+            self.cache.set(key, value, failed=value is None)
+        finally:
+            # Waiters get None if this fetch was cancelled; nothing is cached in that case
+            del self._in_flight[key]
+            future.set_result(value)
+        return value
+
+    async def _get(self, url: str) -> Optional[str]:
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status == 200:
+                    return await response.text(errors="replace")
+        except Exception as e:
+            logger.debug(f"Enrichment fetch error for {url}: {str(e)}")
+        return None
+
+    async def close(self):
+        """Close the pooled session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Process-wide cache shared by all runs
+enrichment_cache = DomainCache()
+
+def get_enrichment_cache() -> DomainCache:
+    """Get the process-wide enrichment cache."""
+    return enrichment_cache
@@ -0,0 +1,94 @@
+"""
+Google Maps page parsers - pure functions from HTML to plain data.
+Kept free of browser and engine state so they can run in the parse executor's
+worker processes; inputs are HTML strings and outputs are dicts.
+"""
+
+import re
+from typing import Dict, Any, Optional
+from ..html_parsing import parse_html
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Social media patterns
+SOCIAL_PATTERNS = {
+    'facebook': re.compile(r'(?:https?://)?(?:www\.)?(?:facebook|fb)\.com/[\w\-\.]+', re.I),
+    'instagram': re.compile(r'(?:https?://)?(?:www\.)?instagram\.com/[\w\-\.]+', re.I),
+    'twitter': re.compile(r'(?:https?://)?(?:www\.)?(?:twitter|x)\.com/[\w\-]+', re.I),
+    'linkedin': re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/(?:company|in)/[\w\-]+', re.I),
+    'youtube': re.compile(r'(?:https?://)?(?:www\.)?youtube\.com/(?:channel|c|user)/[\w\-]+', re.I),
+    'tiktok': re.compile(r'(?:https?://)?(?:www\.)?tiktok\.com/@[\w\-\.]+', re.I)
+}
+
+# Addresses that are never a business contact
+EXCLUDED_EMAIL_PATTERNS = [
+    'example.com',
+    'test.com',
+    'domain.com',
+    'email.com',
+    'noreply',
+    'no-reply',
+    'donotreply',
+    'privacy@',
+    'legal@'
+]
+
+
+def parse_website_html(html: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Extract email and social media links from website HTML in a single parse."""
+    return {
+        'email': extract_email_from_html(html, backend),
+        'socialMedia': find_social_links(html)
+    }
+
+
+def extract_email_from_html(html: str, backend: Optional[str] = None) -> Optional[str]:
+    """Extract email from business website HTML."""
+    doc = parse_html(html, backend)
+
+    # Look for email in common locations
+    # 1. mailto: links
+    mailto_links = [
+        href for href in (link.attr('href', '') for link in doc.css('a[href]'))
+        if href.lower().startswith('mailto:')
+    ]
+    if mailto_links:
+        email = re.sub(r'^mailto:', '', mailto_links[0], flags=re.I).split('?')[0]
+        if is_valid_email(email):
+            return email.lower()
+
+    # 2. Search in text content
+    text_content = doc.text()
+    emails = EMAIL_PATTERN.findall(text_content)
+
+    # Filter out common non-business emails
+    for email in emails:
+        if is_business_email(email):
+            return email.lower()
+
+    return None
+
+
+def is_valid_email(email: str) -> bool:
+    """Validate email format."""
+    return bool(EMAIL_PATTERN.match(email))
+
+
+def is_business_email(email: str) -> bool:
+    """Check if email looks like a business email."""
+    email_lower = email.lower()
+    return not any(pattern in email_lower for pattern in EXCLUDED_EMAIL_PATTERNS)
+
+
+def find_social_links(content: str) -> Dict[str, str]:
+    """Find the first link for each social platform in page content."""
+    social_links = {}
+    for platform, pattern in SOCIAL_PATTERNS.items():
+        matches = pattern.findall(content)
+        if matches:
+            # Clean and normalize URL
+            url = matches[0]
+            if not url.startswith('http'):
+                url = 'https://' + url
+            social_links[platform] = url
+    return social_links
@@ -1,15 +1,53 @@
-import asyncio
 import logging
 import re
-from typing import List, Dict, Any, Optional, Callable
-from ..base_scraper import BaseScraper
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Awaitable
+from ..base_scraper import BaseScraper, DEFAULT_TERM_CONCURRENCY
 from ..scraper_engine import ScraperEngine
+from ..enrichment_fetcher import EnrichmentFetcher
+from ..adaptive_concurrency import LimiterLease, THROTTLE_STATUSES
+from ..parse_executor import get_parse_executor
+from .google_maps_parsers import parse_website_html, find_social_links
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
-from bs4 import BeautifulSoup
-import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Starting concurrency for place pages; adapts per run from Google's responses
+INITIAL_DETAIL_CONCURRENCY = 5
+
+# Entity cache kind and how old a cached place may be unless the run sets max_age_hours
+CACHE_KIND = 'google_maps_place'
+DEFAULT_MAX_AGE_HOURS = 24
+
+# Reads every place detail field in one round trip; missing elements come back as null
+PLACE_DETAILS_SCRIPT = """
+() => {
+    const query = (selector) => document.querySelector(selector);
+    const text = (selector) => {
+        const el = query(selector);
+        return el ? el.textContent : null;
+    };
+    const attr = (selector, name) => {
+        const el = query(selector);
+        return el ? el.getAttribute(name) : null;
+    };
+    return {
+        title: text('h1.DUwDvf, h1'),
+        category: text('button[jsaction*="category"]'),
+        ratingLabel: attr('div.F7nice span[aria-label*="stars"]', 'aria-label'),
+        reviewsLabel: attr('div.F7nice span[aria-label*="reviews"]', 'aria-label'),
+        hasAddress: query('button[data-item-id="address"]') !== null,
+        address: text('button[data-item-id="address"]'),
+        phoneLabel: attr('button[data-item-id*="phone"]', 'aria-label'),
+        hasWebsite: query('a[data-item-id="authority"]') !== null,
+        website: attr('a[data-item-id="authority"]', 'href'),
+        hasHours: query('button[data-item-id="oh"]') !== null,
+        hoursLabel: attr('button[data-item-id="oh"]', 'aria-label'),
+        hasPrice: query('span[aria-label*="Price"]') !== null,
+        price: text('span[aria-label*="Price"]')
+    };
+}
+"""
+
 class GoogleMapsScraperV3(BaseScraper):
     """
     Enhanced Google Maps scraper with Apify-like performance:
@@ -22,18 +60,10 @@ class GoogleMapsScraperV3(BaseScraper):
     def __init__(self, scraper_engine: ScraperEngine):
         super().__init__(scraper_engine)
         self.base_url = "https://www.google.com/maps"
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
         self.phone_pattern = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
         
-        # Social media patterns
-        self.social_patterns = {
-            'facebook': re.compile(r'(?:https?://)?(?:www\.)?(?:facebook|fb)\.com/[\w\-\.]+', re.I),
-            'instagram': re.compile(r'(?:https?://)?(?:www\.)?instagram\.com/[\w\-\.]+', re.I),
-            'twitter': re.compile(r'(?:https?://)?(?:www\.)?(?:twitter|x)\.com/[\w\-]+', re.I),
-            'linkedin': re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/(?:company|in)/[\w\-]+', re.I),
-            'youtube': re.compile(r'(?:https?://)?(?:www\.)?youtube\.com/(?:channel|c|user)/[\w\-]+', re.I),
-            'tiktok': re.compile(r'(?:https?://)?(?:www\.)?tiktok\.com/@[\w\-\.]+', re.I)
-        }
+        # Website fetcher for email/social enrichment, pooled per run
+        self.enrichment: Optional[EnrichmentFetcher] = None
     
     @classmethod
     def get_name(cls) -> str:
@@ -61,7 +91,9 @@ class GoogleMapsScraperV3(BaseScraper):
             "location": {"type": "string", "description": "Location to search in"},
             "max_results": {"type": "integer", "default": 100},
             "extract_reviews": {"type": "boolean", "default": False},
-            "extract_images": {"type": "boolean", "default": False}
+            "extract_images": {"type": "boolean", "default": False},
+            "term_concurrency": {"type": "integer", "description": "Search terms processed at once", "default": DEFAULT_TERM_CONCURRENCY},
+            "max_age_hours": {"type": "number", "description": "Reuse places scraped within this many hours (0 always re-scrapes)", "default": DEFAULT_MAX_AGE_HOURS}
         }
     
     def get_output_schema(self) -> Dict[str, Any]:
@@ -74,97 +106,151 @@ class GoogleMapsScraperV3(BaseScraper):
             "rating": "number - Rating score",
             "reviewsCount": "number - Number of reviews",
             "category": "string - Business category",
-            "socialMedia": "object - Social media links"
+            "socialMedia": "object - Social media links",
+            "cachedAt": "string - When the place was scraped, if served from cache"
         }
     
     async def scrape(self, config: Dict[str, Any], progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
         """
         Main scraping method with enhanced performance.
         """
+        return await self._collect_stream(config, progress_callback)
+    
+    async def scrape_stream(self, config: Dict[str, Any], progress_callback: Optional[Callable] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield place details as soon as each place is extracted.
+        """
         search_terms = config.get('search_terms', [])
         location = config.get('location', '')
         max_results = int(config.get('max_results', 100))  # Convert to int
         extract_reviews = bool(config.get('extract_reviews', False))  # Convert to bool
         extract_images = bool(config.get('extract_images', False))  # Convert to bool
+        term_concurrency = int(config.get('term_concurrency', DEFAULT_TERM_CONCURRENCY))
+        max_age_hours = float(config.get('max_age_hours', DEFAULT_MAX_AGE_HOURS))
+        optional_sections = [
+            field for field, wanted in (('reviews', extract_reviews), ('images', extract_images)) if wanted
+        ]
         
-        all_results = []
-        context = await self.engine.create_context(use_proxy=True)
+        extracted_count = 0
+        # Places already claimed by a term, so a place found by several terms is extracted once
+        seen_places = set()
+        context = await self.engine.create_context(use_proxy=True, domain='google.com')
+        self.enrichment = EnrichmentFetcher()
+        # Shared by all terms, so the limit applies to the whole run
+        limiter = self.engine.concurrency.limiter('google.com', INITIAL_DETAIL_CONCURRENCY)
         
-        try:
-            for term in search_terms:
-                if progress_callback:
-                    await progress_callback(f"🔍 Searching: {term} in {location}")
-                
-                search_query = f"{term} {location}" if location else term
-                
+        async def scrape_term(term: str) -> AsyncIterator[Dict[str, Any]]:
+            if progress_callback:
+                await progress_callback(f"🔍 Searching: {term} in {location}")
+            
+            search_query = f"{term} {location}" if location else term
+            found_places = set()
+            duplicates = 0
+            
+            async def claim_place(place_url: str, emit: Callable[[str], Awaitable[None]]):
+                # Queue a place for extraction unless this or another term already has it
+                nonlocal duplicates
+                if place_url in found_places or len(found_places) >= max_results:
+                    return
+                found_places.add(place_url)
+                place_id = self._extract_place_id(place_url)
+                place_key = place_id or place_url
+                if place_key in seen_places:
+                    duplicates += 1
+                    return
+                seen_places.add(place_key)
+                self.engine.attempted_keys.add(f"placeId:{place_id}" if place_id else f"url:{place_url}")
+                await emit(place_url)
+            
+            async def discover_places(emit: Callable[[str], Awaitable[None]]):
                 # Retry logic for incomplete results
                 attempt = 0
                 max_attempts = 3
-                places = []
                 
-                while attempt < max_attempts and len(places) < max_results:
+                while attempt < max_attempts and len(found_places) < max_results:
                     if attempt > 0:
                         if progress_callback:
-                            await progress_callback(f"🔄 Retry {attempt}/{max_attempts-1} - Found {len(places)}/{max_results}")
-                    
-                    new_places = await self._search_places(context, search_query, max_results)
+                            await progress_callback(f"🔄 Retry {attempt}/{max_attempts-1} for '{term}' - Found {len(found_places)}/{max_results}")
                     
-                    # Merge and deduplicate
-                    for place_url in new_places:
-                        if place_url not in places:
-                            places.append(place_url)
+                    await self._search_places(
+                        context,
+                        search_query,
+                        max_results,
+                        on_place=lambda place_url: claim_place(place_url, emit)
+                    )
                     
-                    if len(places) >= max_results:
+                    if len(found_places) >= max_results:
                         break
                     
                     attempt += 1
                     if attempt < max_attempts:
-                        await asyncio.sleep(2)
+                        await self.engine.pace()
                 
                 if progress_callback:
-                    await progress_callback(f"✅ Found {len(places)} places for '{term}'")
-                
-                # Extract details in parallel batches
-                batch_size = 5  # Process 5 places at once
-                places_to_process = places[:max_results]
-                
-                for i in range(0, len(places_to_process), batch_size):
-                    batch = places_to_process[i:i+batch_size]
-                    
-                    if progress_callback:
-                        progress = min(i + batch_size, len(places_to_process))
-                        await progress_callback(f"📊 Extracting details: {progress}/{len(places_to_process)}")
-                    
-                    # Parallel extraction
-                    tasks = [
-                        self._extract_place_details(
-                            context,
-                            place_url,
-                            extract_reviews,
-                            extract_images
-                        )
-                        for place_url in batch
-                    ]
-                    
-                    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for result in batch_results:
-                        if isinstance(result, dict):
-                            all_results.append(result)
-                    
-                    # Small delay between batches
-                    await asyncio.sleep(0.5)
+                    await progress_callback(
+                        f"✅ Found {len(found_places)} places for '{term}'"
+                        + (f" ({duplicates} already found by other terms)" if duplicates else "")
+                    )
+            
+            async def scrape_place(place_url: str) -> Optional[Dict[str, Any]]:
+                async with limiter.slot() as lease:
+                    result = await self._extract_place_details(
+                        context,
+                        place_url,
+                        extract_reviews,
+                        extract_images,
+                        lease
+                    )
+                # Optional anti-bot pacing between pages
+                await self.engine.pace()
+                return result
+            
+            async def extract_place(place_url: str) -> Optional[Dict[str, Any]]:
+                # Cached places only count if they carry the optional sections this run wants
+                return await self._from_cache_or_scrape(
+                    CACHE_KIND,
+                    self._extract_place_id(place_url) or place_url,
+                    max_age_hours,
+                    lambda: scrape_place(place_url),
+                    required_fields=optional_sections,
+                    identity_fields=['title']
+                )
+            
+            # Details are extracted while the search is still scrolling
+            extracted = 0
+            # Enough workers for the highest limit; the limiter decides how many run
+            async for result in self._pipeline(discover_places, extract_place, limiter.max_limit):
+                extracted += 1
+                if progress_callback and extracted % INITIAL_DETAIL_CONCURRENCY == 0:
+                    await progress_callback(f"📊 Extracted details for '{term}': {extracted}/{len(found_places) - duplicates}")
+                yield result
+        
+        try:
+            # Terms run concurrently and share the run's browser context
+            async for result in self._fan_out(search_terms, scrape_term, term_concurrency):
+                extracted_count += 1
+                yield result
         
         finally:
+            await self.enrichment.close()
             await context.close()
         
         if progress_callback:
-            await progress_callback(f"🎉 Complete! Extracted {len(all_results)} places with verified contacts")
-        
-        return all_results
+            if self.engine.entity_cache is not None and self.engine.entity_cache.hits:
+                await progress_callback(f"♻️ {self.engine.entity_cache.hits} places served from cache (max age {max_age_hours:g}h)")
+            await progress_callback(f"🎉 Complete! Extracted {extracted_count} places with verified contacts")
     
-    async def _search_places(self, context, query: str, max_results: int) -> List[str]:
-        """Enhanced search with better scrolling and pagination."""
+    async def _search_places(
+        self,
+        context,
+        query: str,
+        max_results: int,
+        on_place: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> List[str]:
+        """
+        Enhanced search with better scrolling and pagination.
+        on_place is awaited with each new place URL as soon as it appears in the feed.
+        """
         page = await context.new_page()
         place_urls = set()  # Use set for automatic deduplication
         
@@ -172,8 +258,8 @@ class GoogleMapsScraperV3(BaseScraper):
             search_url = f"{self.base_url}/search/{query.replace(' ', '+')}"
             await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
             
-            # Wait for results
-            await asyncio.sleep(3)
+            # Wait for the results feed (or a direct place match) to render
+            await self.engine.wait_for_selector_safe(page, 'div[role="feed"], a[href*="/maps/place/"]', timeout=15000)
             
             # Enhanced scrolling with more attempts
             for scroll_attempt in range(20):  # Increased from 10 to 20
@@ -183,8 +269,10 @@ class GoogleMapsScraperV3(BaseScraper):
                 for link in links:
                     try:
                         href = await link.get_attribute('href')
-                        if href and '/maps/place/' in href:
+                        if href and '/maps/place/' in href and href not in place_urls:
                             place_urls.add(href)
+                            if on_place:
+                                await on_place(href)
                             
                             if len(place_urls) >= max_results:
                                 break
@@ -214,19 +302,11 @@ class GoogleMapsScraperV3(BaseScraper):
                         }
                     """)
                     
-                    # Wait for new content
-                    await asyncio.sleep(2)
-                    
-                    # Check if new content loaded
-                    new_height = await page.evaluate("""
-                        () => {
-                            const panel = document.querySelector('div[role="feed"]');
-                            return panel ? panel.scrollHeight : 0;
-                        }
-                    """)
+                    # Wait for the feed to grow with the next page of results
+                    grew = await self.engine.wait_for_scroll_growth(page, prev_height, selector='div[role="feed"]')
                     
                     # If no new content, we've reached the end
-                    if new_height == prev_height:
+                    if not grew:
                         logger.info(f"Reached end of results at {len(place_urls)} places")
                         break
                         
@@ -244,56 +324,65 @@ class GoogleMapsScraperV3(BaseScraper):
         
         return list(place_urls)
     
-    async def _extract_place_details(self, context, url: str, extract_reviews: bool = False, extract_images: bool = False) -> Optional[Dict[str, Any]]:
-        """Extract detailed information with email and verified phone."""
+    async def _extract_place_details(
+        self,
+        context,
+        url: str,
+        extract_reviews: bool = False,
+        extract_images: bool = False,
+        lease: Optional[LimiterLease] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract detailed information with email and verified phone.
+        Throttling (429/503, the "unusual traffic" page, timeouts) is reported on the lease.
+        """
         page = await context.new_page()
         
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(2)
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            if (response and response.status in THROTTLE_STATUSES) or '/sorry/' in page.url:
+                logger.warning(f"⚠️ Google is throttling place pages (status {response.status if response else None})")
+                if lease:
+                    lease.throttled()
+                return None
+            
+            # Wait for the place header, then for the details panel to finish rendering
+            await self.engine.wait_for_selector_safe(page, 'h1.DUwDvf, h1')
+            await self.engine.wait_for_dom_settle(page, 'div[role="main"]', quiet_ms=300, timeout=3000)
             
             place_data = {
                 'url': url,
                 'placeId': self._extract_place_id(url)
             }
             
-            # Extract title/name
-            title_selector = 'h1.DUwDvf, h1'
-            title_elem = await page.query_selector(title_selector)
-            if title_elem:
-                place_data['title'] = await title_elem.text_content()
+            # Extract all detail fields in a single evaluate call
+            fields = await page.evaluate(PLACE_DETAILS_SCRIPT)
             
-            # Extract category
-            category_selector = 'button[jsaction*="category"]'
-            category_elem = await page.query_selector(category_selector)
-            if category_elem:
-                place_data['category'] = await category_elem.text_content()
+            # Title/name
+            if fields['title'] is not None:
+                place_data['title'] = fields['title']
             
-            # Extract rating
-            rating_selector = 'div.F7nice span[aria-label*="stars"]'
-            rating_elem = await page.query_selector(rating_selector)
-            if rating_elem:
-                rating_text = await rating_elem.get_attribute('aria-label')
-                if rating_text:
-                    match = re.search(r'([0-9.]+)', rating_text)
-                    if match:
-                        place_data['rating'] = float(match.group(1))
+            # Category
+            if fields['category'] is not None:
+                place_data['category'] = fields['category']
             
-            # Extract reviews count
-            reviews_selector = 'div.F7nice span[aria-label*="reviews"]'
-            reviews_elem = await page.query_selector(reviews_selector)
-            if reviews_elem:
-                reviews_text = await reviews_elem.get_attribute('aria-label')
-                if reviews_text:
-                    match = re.search(r'([0-9,]+)', reviews_text)
-                    if match:
-                        place_data['reviewsCount'] = int(match.group(1).replace(',', ''))
+            # Rating
+            rating_text = fields['ratingLabel']
+            if rating_text:
+                match = re.search(r'([0-9.]+)', rating_text)
+                if match:
+                    place_data['rating'] = float(match.group(1))
             
-            # Extract address
-            address_selector = 'button[data-item-id="address"]'
-            address_elem = await page.query_selector(address_selector)
-            if address_elem:
-                address_text = await address_elem.text_content()
+            # Reviews count
+            reviews_text = fields['reviewsLabel']
+            if reviews_text:
+                match = re.search(r'([0-9,]+)', reviews_text)
+                if match:
+                    place_data['reviewsCount'] = int(match.group(1).replace(',', ''))
+            
+            # Address
+            if fields['hasAddress']:
+                address_text = fields['address']
                 place_data['address'] = address_text.strip() if address_text else None
                 
                 # Parse city, state, and country from address
@@ -334,46 +423,39 @@ class GoogleMapsScraperV3(BaseScraper):
                     if 'countryCode' not in place_data and place_data.get('state'):
                         place_data['countryCode'] = 'US'
             
-            # Extract phone with verification
-            phone_selector = 'button[data-item-id*="phone"]'
-            phone_elem = await page.query_selector(phone_selector)
-            if phone_elem:
-                phone_text = await phone_elem.get_attribute('aria-label')
-                if phone_text:
-                    phone = phone_text.replace('Phone: ', '').replace('Call phone number', '').strip()
-                    place_data['phone'] = phone
-                    place_data['phoneVerified'] = True  # Phone on Google Maps is verified
+            # Phone with verification
+            phone_text = fields['phoneLabel']
+            if phone_text:
+                phone = phone_text.replace('Phone: ', '').replace('Call phone number', '').strip()
+                place_data['phone'] = phone
+                place_data['phoneVerified'] = True  # Phone on Google Maps is verified
             
-            # Extract website and email
-            website_selector = 'a[data-item-id="authority"]'
-            website_elem = await page.query_selector(website_selector)
-            if website_elem:
-                website_url = await website_elem.get_attribute('href')
+            # Website and email
+            if fields['hasWebsite']:
+                website_url = fields['website']
                 place_data['website'] = website_url
                 
-                # Try to extract email and social media from website
+                # Try to extract email and social media from website (one cached fetch per domain)
                 if website_url:
-                    email = await self._extract_email_from_website(website_url)
+                    website_info = await self._enrich_from_website(website_url) or {}
+                    email = website_info.get('email')
                     if email:
                         place_data['email'] = email
                         place_data['emailVerified'] = True  # Email from business website
                     
                     # Extract social media links
-                    social_links = await self._extract_social_media(page, website_url)
+                    social_links = await self._extract_social_media(page, website_info.get('socialMedia', {}))
                     if social_links:
                         place_data['socialMedia'] = social_links
             
-            # Extract opening hours
-            hours_button = await page.query_selector('button[data-item-id="oh"]')
-            if hours_button:
-                hours_text = await hours_button.get_attribute('aria-label')
+            # Opening hours
+            if fields['hasHours']:
+                hours_text = fields['hoursLabel']
                 place_data['openingHours'] = hours_text if hours_text else None
             
-            # Extract price level
-            price_selector = 'span[aria-label*="Price"]'
-            price_elem = await page.query_selector(price_selector)
-            if price_elem:
-                price_text = await price_elem.text_content()
+            # Price level
+            if fields['hasPrice']:
+                price_text = fields['price']
                 place_data['priceLevel'] = price_text.strip() if price_text else None
             
             # Extract images if requested
@@ -395,68 +477,29 @@ class GoogleMapsScraperV3(BaseScraper):
         
         except Exception as e:
             logger.error(f"Error extracting place details from {url}: {str(e)}")
+            if lease:
+                if isinstance(e, PlaywrightTimeoutError):
+                    lease.throttled()
+                else:
+                    lease.failed()
             return None
         
         finally:
             await page.close()
     
-    async def _extract_email_from_website(self, website_url: str) -> Optional[str]:
-        """Extract email from business website."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(website_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Look for email in common locations
-                        # 1. mailto: links
-                        mailto_links = soup.find_all('a', href=re.compile(r'^mailto:', re.I))
-                        if mailto_links:
-                            email = mailto_links[0]['href'].replace('mailto:', '').split('?')[0]
-                            if self._is_valid_email(email):
-                                return email.lower()
-                        
-                        # 2. Search in text content
-                        text_content = soup.get_text()
-                        emails = self.email_pattern.findall(text_content)
-                        
-                        # Filter out common non-business emails
-                        for email in emails:
-                            if self._is_business_email(email):
-                                return email.lower()
-        
-        except Exception as e:
-            logger.debug(f"Email extraction error from {website_url}: {str(e)}")
-        
-        return None
-    
-    def _is_valid_email(self, email: str) -> bool:
-        """Validate email format."""
-        return bool(self.email_pattern.match(email))
+    async def _enrich_from_website(self, website_url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a business website (once per domain) and extract email and social links."""
+        if self.enrichment is None:
+            fetcher = EnrichmentFetcher()
+            try:
+                return await fetcher.fetch(website_url, self._parse_website)
+            finally:
+                await fetcher.close()
+        return await self.enrichment.fetch(website_url, self._parse_website)
     
-    def _is_business_email(self, email: str) -> bool:
-        """Check if email looks like a business email."""
-        email_lower = email.lower()
-        
-        # Exclude common non-business patterns
-        excluded_patterns = [
-            'example.com',
-            'test.com',
-            'domain.com',
-            'email.com',
-            'noreply',
-            'no-reply',
-            'donotreply',
-            'privacy@',
-            'legal@'
-        ]
-        
-        for pattern in excluded_patterns:
-            if pattern in email_lower:
-                return False
-        
-        return True
+    async def _parse_website(self, html: str) -> Dict[str, Any]:
+        """Extract email and social media links from website HTML in the parse executor."""
+        return await get_parse_executor().run(parse_website_html, html)
     
     async def _extract_images(self, page: Page) -> List[str]:
         """Extract image URLs from place page."""
@@ -465,7 +508,7 @@ class GoogleMapsScraperV3(BaseScraper):
             photos_button = await page.query_selector('button[aria-label*="Photo"]')
             if photos_button:
                 await photos_button.click()
-                await asyncio.sleep(2)
+                await self.engine.wait_for_selector_safe(page, 'img[src*="googleusercontent"]', timeout=5000)
                 
                 img_elements = await page.query_selector_all('img[src*="googleusercontent"]')
                 for img in img_elements[:10]:
@@ -486,18 +529,24 @@ class GoogleMapsScraperV3(BaseScraper):
             reviews_button = await page.query_selector('button[aria-label*="Reviews"]')
             if reviews_button:
                 await reviews_button.click()
-                await asyncio.sleep(2)
+                await self.engine.wait_for_selector_safe(page, 'div[data-review-id]', timeout=5000)
                 
                 for _ in range(3):
-                    await page.evaluate("""
-                        () => {
-                            const panel = document.querySelector('div[role="main"]');
-                            if (panel) {
-                                panel.scrollTop = panel.scrollHeight;
+                    # Scroll and wait for the review page requests it triggers to finish
+                    await self.engine.wait_for_network_quiet(
+                        page,
+                        ['listugcposts'],
+                        action=lambda: page.evaluate("""
+                            () => {
+                                const panel = document.querySelector('div[role="main"]');
+                                if (panel) {
+                                    panel.scrollTop = panel.scrollHeight;
+                                }
                             }
-                        }
-                    """)
-                    await asyncio.sleep(1)
+                        """),
+                        quiet_ms=300,
+                        timeout=3000
+                    )
                 
                 review_elements = await page.query_selector_all('div[data-review-id]')
                 for elem in review_elements[:max_reviews]:
@@ -533,41 +582,19 @@ class GoogleMapsScraperV3(BaseScraper):
         
         return reviews
     
-    async def _extract_social_media(self, page: Page, website_url: str) -> Dict[str, str]:
-        """Extract social media links from Google Maps page and business website."""
+    async def _extract_social_media(self, page: Page, website_social: Dict[str, str]) -> Dict[str, str]:
+        """Extract social media links from Google Maps page, filling gaps from the business website."""
         social_links = {}
         
         try:
             # 1. Check Google Maps page for social media links
             page_content = await page.content()
+            social_links = await get_parse_executor().run(find_social_links, page_content)
             
-            for platform, pattern in self.social_patterns.items():
-                matches = pattern.findall(page_content)
-                if matches:
-                    # Clean and normalize URL
-                    url = matches[0]
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    social_links[platform] = url
-            
-            # 2. If website exists, check there too
-            if website_url and len(social_links) < 3:  # Only if we don't have many links yet
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(website_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                            if response.status == 200:
-                                html = await response.text()
-                                
-                                for platform, pattern in self.social_patterns.items():
-                                    if platform not in social_links:  # Don't override existing
-                                        matches = pattern.findall(html)
-                                        if matches:
-                                            url = matches[0]
-                                            if not url.startswith('http'):
-                                                url = 'https://' + url
-                                            social_links[platform] = url
-                except Exception as e:
-                    logger.debug(f"Error extracting social media from website: {str(e)}")
+            # 2. Add website links if we don't have many yet (don't override existing)
+            if len(social_links) < 3:
+                for platform, url in website_social.items():
+                    social_links.setdefault(platform, url)
         
         except Exception as e:
             logger.debug(f"Error extracting social media: {str(e)}")
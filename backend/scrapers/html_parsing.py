@@ -0,0 +1,176 @@
+"""
+HTML Parsing - pluggable parser backends behind one small node interface.
+Scrapers query documents with CSS selectors through HtmlNode; the backend is
+selectolax (if installed), lxml with precompiled selectors, or BeautifulSoup's
+html.parser as the fallback. Set HTML_PARSER_BACKEND to force one.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+# Fast C-backed parsers; html.parser via BeautifulSoup is always available
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> List[str]:
+    """Backends usable in this environment, fastest first."""
+    available = {
+        "selectolax": HAS_SELECTOLAX,
+        "lxml": HAS_LXML,
+        "html.parser": True,
+    }
+    return [name for name in BACKENDS if available[name]]
+
+
+def _default_backend() -> str:
+    configured = os.getenv('HTML_PARSER_BACKEND', 'auto')
+    backends = available_backends()
+    if configured in backends:
+        return configured
+    if configured != 'auto':
+        logger.warning(f"HTML parser backend '{configured}' is not available, using {backends[0]}")
+    return backends[0]
+
+
+DEFAULT_BACKEND = _default_backend()
+
+
+@lru_cache(maxsize=512)
+def _compiled(selector: str):
+    """CSS selector compiled to XPath once per process (lxml backend)."""
+    return CSSSelector(selector)
+
+
+def precompile_selectors(selectors: Iterable[str]):
+    """Compile selectors up front so the first parse does not pay for it."""
+    if HAS_LXML:
+        for selector in selectors:
+            _compiled(selector)
+
+
+class HtmlNode(ABC):
+    """An element (or document) that can be queried with CSS selectors."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def css_first(self, selector: str) -> Optional["HtmlNode"]:
+        """First element matching the selector, or None."""
+        pass
+
+    @abstractmethod
+    def css(self, selector: str) -> List["HtmlNode"]:
+        """Every element matching the selector, in document order."""
+        pass
+
+    @abstractmethod
+    def text(self) -> str:
+        """All text under the node, like BeautifulSoup's .text."""
+        pass
+
+    @abstractmethod
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Attribute value, or default if the node doesn't have it."""
+        pass
+
+
+class _SelectolaxNode(HtmlNode):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css_first(self, selector):
+        found = self.node.css_first(selector)
+        return _SelectolaxNode(found) if found is not None else None
+
+    def css(self, selector):
+        return [_SelectolaxNode(found) for found in self.node.css(selector)]
+
+    def text(self):
+        return self.node.text(deep=True)
+
+    def attr(self, name, default=None):
+        value = self.node.attributes.get(name)
+        return value if value is not None else default
+
+
+class _LxmlNode(HtmlNode):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css_first(self, selector):
+        found = _compiled(selector)(self.node)
+        return _LxmlNode(found[0]) if found else None
+
+    def css(self, selector):
+        return [_LxmlNode(found) for found in _compiled(selector)(self.node)]
+
+    def text(self):
+        return self.node.text_content()
+
+    def attr(self, name, default=None):
+        return self.node.get(name, default)
+
+
+class _SoupNode(HtmlNode):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css_first(self, selector):
+        found = self.node.select_one(selector)
+        return _SoupNode(found) if found is not None else None
+
+    def css(self, selector):
+        return [_SoupNode(found) for found in self.node.select(selector)]
+
+    def text(self):
+        return self.node.get_text()
+
+    def attr(self, name, default=None):
+        value = self.node.get(name)
+        if value is None:
+            return default
+        # BeautifulSoup returns multi-valued attributes (class, rel) as lists
+        return " ".join(value) if isinstance(value, list) else value
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> HtmlNode:
+    """Parse a document with the configured (or given) backend."""
+    backend = backend or DEFAULT_BACKEND
+    if backend == "selectolax":
+        return _SelectolaxNode(LexborHTMLParser(html))
+    if backend == "lxml":
+        # lxml rejects empty documents
+        if not html.strip():
+            html = "<html></html>"
+        try:
+            return _LxmlNode(lxml.html.document_fromstring(html))
+        except ValueError:
+            # Strings with an <?xml ... encoding=...?> declaration must be passed as bytes
+            return _LxmlNode(lxml.html.document_fromstring(html.encode('utf-8')))
+    return _SoupNode(BeautifulSoup(html, 'html.parser'))
@@ -0,0 +1,115 @@
+"""
+HTTP Fetcher - pooled async HTTP client for pages that do not need a browser.
+Requests carry realistic browser headers and rotate through proxies from
+ProxyManager; scrapers fall back to Playwright when they detect a block page.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+from .adaptive_concurrency import BLOCK_STATUSES
+
+logger = logging.getLogger(__name__)
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+]
+
+
+class HttpFetcher:
+    """Fetches pages over a pooled aiohttp session with optional proxy rotation."""
+
+    def __init__(
+        self,
+        proxy_manager=None,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.proxy_manager = proxy_manager
+        self.proxy_strategy = os.getenv('HTTP_FETCH_PROXY_STRATEGY', 'round-robin')
+        self.limit = limit or int(os.getenv('HTTP_FETCH_MAX_CONNECTIONS', '50'))
+        self.limit_per_host = limit_per_host or int(os.getenv('HTTP_FETCH_MAX_PER_HOST', '8'))
+        self.timeout = timeout or float(os.getenv('HTTP_FETCH_TIMEOUT_SECONDS', '20'))
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def _headers(self) -> dict:
+        return {
+            "User-Agent": random.choice(USER_AGENTS),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+            "Sec-Fetch-User": "?1",
+        }
+
+    async def _get_proxy(self, domain: Optional[str]) -> Optional[Dict]:
+        """Pick a proxy for the next request; aiohttp only speaks HTTP(S) proxies."""
+        if not self.proxy_manager:
+            return None
+        proxy = await self.proxy_manager.get_rotating_proxy(self.proxy_strategy, domain=domain)
+        if not proxy or proxy.get('protocol', 'http') not in ('http', 'https'):
+            return None
+        return proxy
+
+    async def get(self, url: str, use_proxy: bool = True) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Fetch a page.
+
+        Returns:
+            (status, html); (None, None) if the request itself failed
+        """
+        domain = urlparse(url).hostname
+        proxy = await self._get_proxy(domain) if use_proxy else None
+        proxy_url = self.proxy_manager.format_proxy_url(proxy) if proxy else None
+        start = time.perf_counter()
+        try:
+            async with self._get_session().get(url, headers=self._headers(), proxy=proxy_url) as response:
+                if proxy:
+                    # Attribute the result to the proxy (a block cools it down for this domain)
+                    if response.status in BLOCK_STATUSES:
+                        outcome = "blocked"
+                    elif response.status >= 500:
+                        outcome = "failed"
+                    else:
+                        outcome = "success"
+                    self.proxy_manager.record_outcome(
+                        proxy['id'], outcome, latency=time.perf_counter() - start, domain=domain
+                    )
+                return response.status, await response.text(errors="replace")
+        except Exception as e:
+            logger.debug(f"HTTP fetch error for {url}: {str(e)}")
+            if proxy:
+                outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "failed"
+                self.proxy_manager.record_outcome(proxy['id'], outcome, domain=domain)
+            return None, None
+
+    async def close(self):
+        """Close the pooled session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,155 @@
+"""
+Parse Executor - runs CPU-heavy HTML parsing off the event loop.
+Scrapers submit raw HTML plus a module-level parse function and await a plain
+dict/list result, so a large page never blocks API requests or the CDP
+traffic of other runs sharing the loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Run fn in the worker process and report how long the parse itself took."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class ParseExecutor:
+    """
+    Process pool for HTML parsing.
+
+    Parse functions must be importable module-level callables taking and
+    returning picklable values (HTML strings in, dicts/lists of primitives out).
+    Set PARSE_EXECUTOR_WORKERS=0 to parse inline on the event loop instead.
+
+    Provides:
+    - Lazy pool start on first submit
+    - Pool replacement when a worker process dies
+    - Queue depth and parse/wait time metrics
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.getenv('PARSE_EXECUTOR_WORKERS', str(min(4, os.cpu_count() or 1))))
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.pending = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.pool_restarts = 0
+        self._parse_times: deque = deque(maxlen=1000)
+        self._wait_times: deque = deque(maxlen=1000)
+
+    @property
+    def inline(self) -> bool:
+        return self.max_workers <= 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Submitted parses waiting for a free worker."""
+        return max(0, self.pending - max(self.max_workers, 1))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that holds the event loop, Motor threads
+            # and Playwright pipes is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Parse executor started with {self.max_workers} worker processes")
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) in a worker process and return its result."""
+        self.pending += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        submitted = time.perf_counter()
+        try:
+            if self.inline:
+                result, parse_seconds = _timed_call(fn, args)
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    result, parse_seconds = await loop.run_in_executor(self._get_executor(), _timed_call, fn, args)
+                except BrokenProcessPool:
+                    self._reset()
+                    raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self._parse_times.append(parse_seconds)
+        self._wait_times.append(max(0.0, time.perf_counter() - submitted - parse_seconds))
+        return result
+
+    def _reset(self):
+        """Drop a pool whose worker died; the next submit starts a fresh one."""
+        logger.warning("Parse executor worker died, restarting pool")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.pool_restarts += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and parse time metrics."""
+        parse_ms = sorted(t * 1000 for t in self._parse_times)
+        wait_ms = sorted(t * 1000 for t in self._wait_times)
+
+        def summary(values):
+            return {
+                "avg": round(sum(values) / len(values), 2) if values else 0,
+                "p95": round(values[int((len(values) - 1) * 0.95)], 2) if values else 0,
+                "max": round(values[-1], 2) if values else 0,
+                "samples": len(values)
+            }
+
+        return {
+            "mode": "inline" if self.inline else "process",
+            "workers": self.max_workers,
+            "started": self._executor is not None,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pool_restarts": self.pool_restarts,
+            "parse_ms": summary(parse_ms),
+            "queue_wait_ms": summary(wait_ms)
+        }
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Parse executor shut down")
+
+
+# Global parse executor instance
+_parse_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Get the process-wide parse executor instance."""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ParseExecutor()
+    return _parse_executor
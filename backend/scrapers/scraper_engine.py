@@ -1,8 +1,12 @@
 import asyncio
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, Awaitable
 import logging
+import os
 import random
+from .browser_pool import BrowserPool, BROWSER_LAUNCH_ARGS
+from urllib.parse import urlparse
+from .adaptive_concurrency import ConcurrencyController, BLOCK_STATUSES
 
 # Try to import playwright_stealth, logging warning if not available
 try:
@@ -13,44 +17,100 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Resolves true once the observed subtree has had no mutations for quietMs, false at timeoutMs
+DOM_SETTLE_SCRIPT = """
+([selector, quietMs, timeoutMs]) => new Promise((resolve) => {
+    const root = (selector && document.querySelector(selector)) || document.documentElement;
+    let quietTimer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(finish, quietMs, true);
+    });
+    function finish(settled) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(settled);
+    }
+    observer.observe(root, {childList: true, subtree: true, characterData: true});
+    quietTimer = setTimeout(finish, quietMs, true);
+    deadline = setTimeout(finish, timeoutMs, false);
+})
+"""
+
+# Navigation URLs that mean the target blocked the proxy rather than the page failing
+BLOCK_URL_MARKERS = ('/sorry/', 'captcha')
+
+SCROLL_GROWTH_SCRIPT = """
+([selector, previous]) => {
+    const el = selector ? document.querySelector(selector) : document.scrollingElement;
+    return !!el && el.scrollHeight > previous;
+}
+"""
+
 class ScraperEngine:
     """Core scraping engine using Playwright with anti-detection."""
     
-    def __init__(self, proxy_manager=None):
+    def __init__(
+        self,
+        proxy_manager=None,
+        browser_pool: Optional[BrowserPool] = None,
+        pacing: Optional[Tuple[float, float]] = None,
+        entity_cache=None,
+        proxy_strategy: Optional[str] = None,
+        proxy_session: Optional[str] = None
+    ):
         self.proxy_manager = proxy_manager
+        # Rotation strategy for context proxies; proxy_session (the run id) is what 'sticky' binds to
+        self.proxy_strategy = proxy_strategy or os.getenv('PROXY_ROTATION_STRATEGY', 'weighted')
+        self.proxy_session = proxy_session
+        self.browser_pool = browser_pool
+        # Cross-run cache of scraped places/products (services.entity_cache.EntityCache); optional
+        self.entity_cache = entity_cache
+        # Anti-bot pacing (min, max seconds of random delay); disabled unless configured
+        self.pacing = pacing or (
+            float(os.getenv('SCRAPER_PACING_MIN_SECONDS', '0')),
+            float(os.getenv('SCRAPER_PACING_MAX_SECONDS', '0'))
+        )
+        # Per-domain adaptive page concurrency for this engine's run
+        self.concurrency = ConcurrencyController()
+        # Item keys ('asin:...', 'placeId:...' as in services.delta_tracker.item_key) the run set out
+        # to extract, so a delta run can tell a failed extraction from an item that is gone
+        self.attempted_keys: Set[str] = set()
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.contexts: List[BrowserContext] = []
         
     async def initialize(self):
         """Initialize the scraping engine with browser and proxy manager."""
+        if self.browser_pool:
+            # Contexts are leased from the shared pool; no per-engine browser
+            await self.browser_pool.start()
+            logger.info(f"Scraper engine attached to shared browser pool (Stealth: {HAS_STEALTH})")
+            return
+        
         self.playwright = await async_playwright().start()
         
         # Launch browser with anti-detection settings
         # Use new headless mode (headless="new") for better bypass
         self.browser = await self.playwright.chromium.launch(
             headless=True,  # Keep headless for Docker environment
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--window-size=1920,1080',
-                '--start-maximized',
-            ]
+            args=BROWSER_LAUNCH_ARGS
         )
         logger.info(f"Scraper engine initialized with enhanced anti-detection (Stealth: {HAS_STEALTH})")
     
-    async def create_context(self, use_proxy: bool = True, ultra_fast: bool = False) -> BrowserContext:
-        """Create a new browser context with optional proxy and resource blocking for ultra-fast mode."""
-        if not self.browser:
+    async def create_context(
+        self,
+        use_proxy: bool = True,
+        ultra_fast: bool = False,
+        domain: Optional[str] = None
+    ) -> BrowserContext:
+        """
+        Create a new browser context with optional proxy and resource blocking for ultra-fast mode.
+        Pass the target domain so proxies cooling down there after a block are skipped.
+        """
+        if not self.browser and not self.browser_pool:
             await self.initialize()
         
         context_options = {
@@ -62,7 +122,11 @@ class ScraperEngine:
         
         # Add proxy if available and requested
         if use_proxy and self.proxy_manager:
-            proxy_dict = await self.proxy_manager.get_rotating_proxy("best")
+            proxy_dict = await self.proxy_manager.get_rotating_proxy(
+                self.proxy_strategy,
+                session_id=self.proxy_session,
+                domain=domain
+            )
             if proxy_dict:
                 proxy_url = self.proxy_manager.format_proxy_url(proxy_dict)
                 
@@ -80,7 +144,10 @@ class ScraperEngine:
                 
                 logger.info(f"Using proxy: {parsed.hostname}:{parsed.port}")
         
-        context = await self.browser.new_context(**context_options)
+        if self.browser_pool:
+            context = await self.browser_pool.new_context(**context_options)
+        else:
+            context = await self.browser.new_context(**context_options)
         
         # Add resource blocking for ultra-fast mode (3-5x faster page loads)
         if ultra_fast:
@@ -120,8 +187,57 @@ class ScraperEngine:
         """)
         
         self.contexts.append(context)
+        if "proxy" in context_options:
+            # Every page navigation in the context reports its outcome against the proxy
+            proxy_id = proxy_dict['id']
+            context.on("response", lambda response: self._on_navigation_response(proxy_id, response))
+            context.on("requestfailed", lambda request: self._on_navigation_failed(proxy_id, request))
         return context
     
+    @staticmethod
+    def _is_page_navigation(request) -> bool:
+        """Top-level document navigation (not subresources or iframes)."""
+        try:
+            return request.is_navigation_request() and request.frame.parent_frame is None
+        except Exception:
+            return False
+    
+    def _on_navigation_response(self, proxy_id: str, response):
+        """Attribute a navigation's status and time to first byte to the proxy that served it."""
+        request = response.request
+        if not self._is_page_navigation(request) or 300 <= response.status < 400:
+            # Redirect hops are judged by where they end up
+            return
+        
+        url = response.url.lower()
+        if response.status in BLOCK_STATUSES or any(marker in url for marker in BLOCK_URL_MARKERS):
+            outcome = "blocked"
+        elif response.status >= 500:
+            outcome = "failed"
+        else:
+            outcome = "success"
+        
+        latency = None
+        try:
+            response_start = request.timing.get('responseStart', -1)
+            if response_start and response_start > 0:
+                latency = response_start / 1000
+        except Exception:
+            pass
+        
+        self.proxy_manager.record_outcome(proxy_id, outcome, latency=latency, domain=urlparse(response.url).hostname)
+    
+    def _on_navigation_failed(self, proxy_id: str, request):
+        """Attribute a navigation that never got a response to the proxy."""
+        if not self._is_page_navigation(request):
+            return
+        failure = request.failure or ""
+        if "ERR_ABORTED" in failure:
+            # Cancelled by us (page closed, navigation superseded), not the proxy's doing
+            return
+        outcome = "timeout" if "TIMED_OUT" in failure else "failed"
+        self.proxy_manager.record_outcome(proxy_id, outcome, domain=urlparse(request.url).hostname)
+    
     async def _handle_ultra_fast_route(self, route):
         """Handle route blocking for ultra-fast mode - blocks images, fonts, CSS, analytics."""
         request = route.request
@@ -186,8 +302,7 @@ class ScraperEngine:
             try:
                 response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
                 if response and response.status < 400:
-                    # Random delay to appear human-like
-                    await asyncio.sleep(random.uniform(1, 3))
+                    await self.pace()
                     return True
                 logger.warning(f"Navigation returned status {response.status if response else 'None'}")
             except Exception as e:
@@ -206,11 +321,101 @@ class ScraperEngine:
             logger.debug(f"Selector '{selector}' not found: {str(e)}")
             return False
     
+    async def pace(self):
+        """Random human-like delay, only when anti-bot pacing is configured."""
+        low, high = self.pacing
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, max(low, high)))
+    
+    async def wait_for_dom_settle(
+        self,
+        page: Page,
+        selector: Optional[str] = None,
+        quiet_ms: int = 500,
+        timeout: int = 5000
+    ) -> bool:
+        """Wait until the DOM (or the subtree under selector) stops changing for quiet_ms."""
+        try:
+            return await page.evaluate(DOM_SETTLE_SCRIPT, [selector, quiet_ms, timeout])
+        except Exception as e:
+            logger.debug(f"DOM settle wait failed: {str(e)}")
+            return False
+    
+    async def wait_for_network_quiet(
+        self,
+        page: Page,
+        url_patterns: Optional[List[str]] = None,
+        action: Optional[Callable[[], Awaitable[Any]]] = None,
+        quiet_ms: int = 500,
+        timeout: int = 10000
+    ) -> bool:
+        """
+        Wait until no requests matching url_patterns (all requests if None) have been
+        in flight for quiet_ms. If action is given, it runs after tracking starts so the
+        requests it triggers are not missed.
+        """
+        in_flight = set()
+        activity = asyncio.Event()
+        
+        def matches(request) -> bool:
+            return not url_patterns or any(pattern in request.url for pattern in url_patterns)
+        
+        def on_request(request):
+            if matches(request):
+                in_flight.add(request)
+                activity.set()
+        
+        def on_request_done(request):
+            if request in in_flight:
+                in_flight.discard(request)
+                activity.set()
+        
+        page.on("request", on_request)
+        page.on("requestfinished", on_request_done)
+        page.on("requestfailed", on_request_done)
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        try:
+            if action:
+                await action()
+            
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                
+                activity.clear()
+                wait = remaining if in_flight else min(quiet_ms / 1000, remaining)
+                try:
+                    await asyncio.wait_for(activity.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    return not in_flight
+        finally:
+            page.remove_listener("request", on_request)
+            page.remove_listener("requestfinished", on_request_done)
+            page.remove_listener("requestfailed", on_request_done)
+    
+    async def wait_for_scroll_growth(
+        self,
+        page: Page,
+        previous_height: int,
+        selector: Optional[str] = None,
+        timeout: int = 3000
+    ) -> bool:
+        """Wait until a scroll container (the document if no selector) grows past previous_height."""
+        try:
+            await page.wait_for_function(SCROLL_GROWTH_SCRIPT, arg=[selector, previous_height], timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
     async def scroll_page(self, page: Page, max_scrolls: int = 10):
         """Scroll page to load dynamic content."""
         for i in range(max_scrolls):
             await page.evaluate("window.scrollBy(0, window.innerHeight)")
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            await self.wait_for_dom_settle(page, quiet_ms=200, timeout=1500)
+            await self.pace()
     
     async def extract_text_safe(self, page: Page, selector: str) -> Optional[str]:
         """Safely extract text from a selector."""
@@ -244,9 +449,15 @@ class ScraperEngine:
         return random.choice(user_agents)
     
     async def cleanup(self):
-        """Clean up browser resources."""
+        """Clean up browser resources. Pooled browsers stay warm; only this engine's contexts are closed."""
         for context in self.contexts:
-            await context.close()
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context: {str(e)}")
+        self.contexts = []
+        if self.proxy_manager and self.proxy_session:
+            self.proxy_manager.release_session(self.proxy_session)
         
         if self.browser:
             await self.browser.close()
@@ -4,7 +4,7 @@ Similar to Apify's SEO Metadata Scraper
 """
 import json
 import logging
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator
 from urllib.parse import urljoin, urlparse
 from playwright.async_api import Page
 from scrapers.base_scraper import BaseScraper
@@ -105,6 +105,16 @@ class SEOMetadataScraper(BaseScraper):
         """
         Main scraping method
         """
+        return await self._collect_stream(config, progress_callback)
+    
+    async def scrape_stream(
+        self, 
+        config: Dict[str, Any], 
+        progress_callback: Optional[Callable] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the SEO metadata item (or an error item) for the target URL
+        """
         url = config.get('url')
         
         # Ensure URL has protocol
@@ -118,7 +128,7 @@ class SEOMetadataScraper(BaseScraper):
         if not url:
             raise ValueError("URL parameter is required")
         
-        results = []
+        result = None
         page = None
         
         try:
@@ -150,11 +160,8 @@ class SEOMetadataScraper(BaseScraper):
                     status_code = response.status if response else None
                     await self._log_progress(f"✅ Page loaded with load (status: {status_code})", progress_callback)
             
-            # Wait a bit more for dynamic content
-            try:
-                await page.wait_for_timeout(2000)  # Wait 2 seconds for any dynamic content
-            except Exception:
-                pass
+            # Let client-side rendering finish before reading the DOM
+            await self.engine.wait_for_dom_settle(page, quiet_ms=500, timeout=2000)
             
             # Extract all metadata
             await self._log_progress("📊 Extracting SEO metadata...", progress_callback)
@@ -175,23 +182,23 @@ class SEOMetadataScraper(BaseScraper):
                 await self._log_progress("🔗 Analyzing links...", progress_callback)
                 metadata['links'] = await self._extract_links(page, url)
             
-            results.append(metadata)
+            result = metadata
             
             await self._log_progress(f"✅ Successfully extracted SEO metadata from: {url}", progress_callback)
             
         except Exception as e:
             logger.error(f"❌ Error scraping {url}: {str(e)}")
             await self._log_progress(f"❌ Error: {str(e)}", progress_callback)
-            results.append({
+            result = {
                 'url': url,
                 'error': str(e),
                 'status': 'failed'
-            })
+            }
         finally:
             if page:
                 await page.close()
         
-        return results
+        yield result
     
     async def _extract_metadata(self, page: Page, url: str, status_code: Optional[int]) -> Dict[str, Any]:
         """Extract all SEO metadata from the page"""
@@ -326,6 +326,60 @@ Extracts: URL, status code, title, meta description, meta keywords, canonical UR
         logger.info("✅ Scheduler service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize scheduler: {str(e)}", exc_info=True)
+    
+    # Index run log segments for paging/tailing
+    try:
+        from services.run_log import ensure_run_log_indexes
+        await ensure_run_log_indexes(db)
+    except Exception as e:
+        logger.error(f"❌ Failed to create run log indexes: {str(e)}", exc_info=True)
+    
+    # Index the cross-run place/product cache (TTL drops entries past retention)
+    try:
+        from services.entity_cache import ensure_entity_cache_indexes
+        await ensure_entity_cache_indexes(db)
+    except Exception as e:
+        logger.error(f"❌ Failed to create entity cache indexes: {str(e)}", exc_info=True)
+    
+    # Index per-schedule item state for delta runs
+    try:
+        from services.delta_tracker import ensure_delta_indexes
+        await ensure_delta_indexes(db)
+    except Exception as e:
+        logger.error(f"❌ Failed to create delta state indexes: {str(e)}", exc_info=True)
+    
+    # Index proxies (staleness, import dedup)
+    try:
+        from services.proxy_manager import ensure_proxy_indexes
+        await ensure_proxy_indexes(db)
+    except Exception as e:
+        logger.error(
+            f"❌ Failed to create proxy indexes; proxy import dedup is NOT enforced "
+            f"(existing proxies with the same host/port/protocol?): {str(e)}",
+            exc_info=True
+        )
+    
+    # In distributed mode runs execute in worker.py processes, which own the
+    # browsers and proxy checks; the API process only enqueues
+    if os.getenv('RUN_EXECUTION_MODE', 'local') == 'distributed':
+        logger.info("ℹ️ Distributed execution: browser pool and proxy health checks run in workers")
+        return
+    
+    # Keep re-checking the stalest proxies in the background
+    try:
+        from services import get_proxy_manager
+        get_proxy_manager(db).health_checker.start()
+    except Exception as e:
+        logger.error(f"❌ Failed to start proxy health checks: {str(e)}", exc_info=True)
+    
+    # Warm up the shared browser pool
+    try:
+        logger.info("🔧 Starting browser pool...")
+        from scrapers import get_browser_pool
+        await get_browser_pool().start()
+        logger.info("✅ Browser pool started successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to start browser pool: {str(e)}", exc_info=True)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
@@ -339,6 +393,28 @@ async def shutdown_db_client():
     except Exception as e:
         logger.warning(f"Failed to stop scheduler: {str(e)}")
     
+    try:
+        # Close pooled browsers
+        from scrapers import get_browser_pool
+        await get_browser_pool().close()
+        logger.info("✅ Browser pool closed")
+    except Exception as e:
+        logger.warning(f"Failed to close browser pool: {str(e)}")
+    
+    try:
+        # Stop parse worker processes
+        from scrapers import get_parse_executor
+        get_parse_executor().shutdown()
+    except Exception as e:
+        logger.warning(f"Failed to stop parse executor: {str(e)}")
+    
+    try:
+        # Write buffered proxy usage counters
+        from services import get_proxy_manager
+        await get_proxy_manager(db).close()
+    except Exception as e:
+        logger.warning(f"Failed to flush proxy stats: {str(e)}")
+    
     # Close MongoDB client
     client.close()
     logger.info("✅ MongoDB connection closed")
\ No newline at end of file
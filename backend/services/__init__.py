@@ -1,6 +1,13 @@
 # Services package
 from .proxy_manager import ProxyManager, get_proxy_manager
 from .task_manager import TaskManager, get_task_manager
+from .dataset_writer import DatasetWriter
+from .run_log import RunLogSink
+from .entity_cache import EntityCache
+from .delta_tracker import DeltaTracker
+from .run_events import RunEventBus, get_run_event_bus
+from .run_queue import RunQueue
+from .run_worker import RunWorker
 from .chat_service import LeadChatService
 from .global_chat_service_v2 import EnhancedGlobalChatService
 
@@ -9,6 +16,14 @@ __all__ = [
     'get_proxy_manager',
     'TaskManager',
     'get_task_manager',
+    'DatasetWriter',
+    'RunLogSink',
+    'EntityCache',
+    'DeltaTracker',
+    'RunEventBus',
+    'get_run_event_bus',
+    'RunQueue',
+    'RunWorker',
     'LeadChatService',
     'EnhancedGlobalChatService'
 ]
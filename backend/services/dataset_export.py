@@ -0,0 +1,228 @@
+"""
+Streaming dataset export.
+Dataset items are read from an async Mongo cursor and encoded in chunks, so
+exports run in constant memory regardless of dataset size.
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import AsyncIterator, List, Dict, Any, Tuple
+
+# Columnar formats need pyarrow; JSON/CSV exports work without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# Flush encoded output to the client once this many bytes are buffered
+EXPORT_CHUNK_SIZE = 64 * 1024
+# Documents fetched per cursor round trip
+EXPORT_CURSOR_BATCH = 1000
+# Rows per Parquet row group / Arrow record batch
+COLUMNAR_BATCH_ROWS = 10000
+
+
+def iter_dataset_items(db, run_id: str):
+    """Async cursor over the data payload of every item in a run's dataset."""
+    return db.dataset_items.find(
+        {"run_id": run_id},
+        {"_id": 0, "data": 1}
+    ).batch_size(EXPORT_CURSOR_BATCH)
+
+
+async def get_dataset_fields(db, run_id: str) -> List[str]:
+    """
+    Get the column set for a run's dataset.
+    Uses the schema recorded at ingestion time, falling back to a server-side
+    aggregation for datasets written before fields were tracked.
+    """
+    dataset = await db.datasets.find_one({"run_id": run_id}, {"_id": 0, "fields": 1})
+    if dataset and dataset.get('fields'):
+        return sorted(dataset['fields'])
+
+    pipeline = [
+        {"$match": {"run_id": run_id}},
+        {"$project": {"kv": {"$objectToArray": "$data"}}},
+        {"$unwind": "$kv"},
+        {"$group": {"_id": "$kv.k"}}
+    ]
+    keys = await db.dataset_items.aggregate(pipeline).to_list(None)
+    return sorted(k['_id'] for k in keys)
+
+
+async def stream_json(cursor) -> AsyncIterator[bytes]:
+    """Encode items as a single JSON array."""
+    buffer = io.StringIO()
+    buffer.write("[")
+    first = True
+
+    async for item in cursor:
+        if not first:
+            buffer.write(",")
+        first = False
+        buffer.write("\n")
+        buffer.write(json.dumps(item['data'], indent=2, default=str))
+
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+
+    buffer.write("\n]" if not first else "]")
+    yield buffer.getvalue().encode()
+
+
+async def stream_ndjson(cursor) -> AsyncIterator[bytes]:
+    """Encode items as newline-delimited JSON, one item per line."""
+    buffer = io.StringIO()
+
+    async for item in cursor:
+        buffer.write(json.dumps(item['data'], default=str))
+        buffer.write("\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def stream_csv(cursor, fieldnames: List[str]) -> AsyncIterator[bytes]:
+    """Encode items as CSV with a header computed up front from the dataset schema."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+
+    async for item in cursor:
+        writer.writerow(item['data'])
+
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out what pyarrow wrote since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _schema_type_name(spec: Any) -> str:
+    """Read the type out of an output schema entry ({"type": ...} or "number - description")."""
+    if isinstance(spec, dict):
+        return spec.get('type', 'string')
+    return str(spec).split(' - ')[0].strip().lower()
+
+
+def _arrow_type(type_name: str):
+    if type_name == 'number':
+        return pa.float64()
+    if type_name == 'integer':
+        return pa.int64()
+    if type_name == 'boolean':
+        return pa.bool_()
+    # Strings, plus arrays/objects encoded as JSON text
+    return pa.string()
+
+
+def build_arrow_schema(output_schema: Dict[str, Any], fields: List[str]) -> Tuple[Any, Dict[str, str]]:
+    """
+    Build an Arrow schema from a scraper's get_output_schema().
+    Fields present in the data but missing from the output schema become string columns.
+    """
+    properties = output_schema.get('properties') if isinstance(output_schema.get('properties'), dict) else output_schema
+
+    column_types: Dict[str, str] = {}
+    for name, spec in properties.items():
+        column_types[name] = _schema_type_name(spec)
+    for name in fields:
+        column_types.setdefault(name, 'string')
+
+    schema = pa.schema([(name, _arrow_type(type_name)) for name, type_name in column_types.items()])
+    return schema, column_types
+
+
+def _coerce(value: Any, type_name: str) -> Any:
+    """Convert a stored value to the column type, using null when it does not fit."""
+    if value is None:
+        return None
+    try:
+        if type_name == 'number':
+            return float(str(value).replace(',', '')) if isinstance(value, str) else float(value)
+        if type_name == 'integer':
+            return int(float(str(value).replace(',', ''))) if isinstance(value, str) else int(value)
+        if type_name == 'boolean':
+            return value if isinstance(value, bool) else str(value).lower() in ('true', '1', 'yes')
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+async def stream_columnar(cursor, schema, column_types: Dict[str, str], format: str) -> AsyncIterator[bytes]:
+    """
+    Encode items as Parquet or Arrow IPC, writing one row group / record batch
+    per COLUMNAR_BATCH_ROWS items from the cursor.
+    """
+    sink = _ChunkSink()
+    if format == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    names = schema.names
+    columns: Dict[str, List[Any]] = {name: [] for name in names}
+    rows = 0
+
+    def write_batch():
+        table = pa.Table.from_pydict(columns, schema=schema)
+        writer.write_table(table)
+
+    try:
+        async for item in cursor:
+            data = item['data']
+            for name in names:
+                columns[name].append(_coerce(data.get(name), column_types[name]))
+            rows += 1
+
+            if rows >= COLUMNAR_BATCH_ROWS:
+                write_batch()
+                columns = {name: [] for name in names}
+                rows = 0
+                yield sink.drain()
+
+        if rows:
+            write_batch()
+    finally:
+        writer.close()
+
+    yield sink.drain()
@@ -0,0 +1,155 @@
+"""
+Dataset Writer for batched ingestion of scraped items.
+Items are added as scrapers yield them and written to dataset_items with
+unordered insert_many in the background.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Iterable, Callable
+from datetime import datetime, timezone
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetWriter:
+    """Buffers dataset items for a run and flushes them in batches."""
+
+    def __init__(
+        self,
+        db,
+        run_id: str,
+        batch_size: Optional[int] = None,
+        max_buffer: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        on_flush: Optional[Callable] = None,
+        on_items: Optional[Callable] = None,
+        owns_run: Optional[Callable[[], bool]] = None
+    ):
+        self.db = db
+        self.run_id = run_id
+        self.batch_size = batch_size or int(os.getenv('DATASET_WRITE_BATCH_SIZE', '200'))
+        self.max_buffer = max(max_buffer or int(os.getenv('DATASET_WRITE_MAX_BUFFER', '2000')), self.batch_size)
+        self.flush_interval = flush_interval or float(os.getenv('DATASET_WRITE_FLUSH_INTERVAL', '2'))
+        # Optional async callback receiving total_written after every batch
+        self.on_flush = on_flush
+        # Optional async callback receiving the documents persisted by each batch
+        self.on_items = on_items
+        # Optional check that this process still owns the run; once it returns False
+        # (the run's lease moved to another worker) batches are dropped, not written
+        self.owns_run = owns_run
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._last_flush = time.monotonic()
+
+        # Union of item keys in first-seen order, stored on the dataset for export headers
+        self.fields: Dict[str, None] = {}
+
+        self.total_added = 0
+        self.total_written = 0
+        self.total_failed = 0
+        self.total_dropped = 0
+
+    def _to_doc(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a dataset_items document (same shape as DatasetItem) without a model round trip."""
+        return {
+            "id": str(uuid.uuid4()),
+            "run_id": self.run_id,
+            "data": data,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    async def add(self, data: Dict[str, Any]):
+        """Add a single scraped item to the buffer."""
+        self._buffer.append(self._to_doc(data))
+        self.total_added += 1
+        for key in data:
+            if key not in self.fields:
+                self.fields[key] = None
+
+        if (len(self._buffer) >= self.batch_size or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            await self._schedule_flush()
+
+    async def add_many(self, items: Iterable[Dict[str, Any]]):
+        """Add several scraped items to the buffer."""
+        for data in items:
+            await self.add(data)
+
+    async def _schedule_flush(self):
+        """Hand the current buffer to a background insert, waiting only when the buffer is full."""
+        async with self._lock:
+            if self._flush_task and not self._flush_task.done():
+                # One insert in flight at a time; keep buffering until the bound is hit
+                if len(self._buffer) < self.max_buffer:
+                    return
+                await self._flush_task
+
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            self._flush_task = asyncio.create_task(self._write(batch))
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of documents, counting partial failures."""
+        if self.owns_run and not self.owns_run():
+            self.total_dropped += len(batch)
+            logger.warning(f"Run {self.run_id}: dropped {len(batch)} dataset items, the run moved to another worker")
+            return
+
+        written = []
+        try:
+            result = await self.db.dataset_items.insert_many(batch, ordered=False)
+            self.total_written += len(result.inserted_ids)
+            written = batch
+        except BulkWriteError as e:
+            inserted = e.details.get('nInserted', 0)
+            self.total_written += inserted
+            self.total_failed += len(batch) - inserted
+            failed = {error['index'] for error in e.details.get('writeErrors', [])}
+            written = [doc for index, doc in enumerate(batch) if index not in failed]
+            logger.error(f"Run {self.run_id}: {len(batch) - inserted} dataset items failed to insert")
+        except Exception as e:
+            self.total_failed += len(batch)
+            logger.error(f"Run {self.run_id}: failed to insert {len(batch)} dataset items: {str(e)}")
+
+        if self.on_items and written:
+            try:
+                await self.on_items(written)
+            except Exception as e:
+                logger.error(f"Run {self.run_id}: items callback error: {str(e)}")
+
+        if self.on_flush:
+            try:
+                await self.on_flush(self.total_written)
+            except Exception as e:
+                logger.error(f"Run {self.run_id}: flush callback error: {str(e)}")
+
+    async def flush(self):
+        """Wait for the in-flight insert and write whatever is left in the buffer."""
+        async with self._lock:
+            if self._flush_task:
+                await self._flush_task
+                self._flush_task = None
+
+            if self._buffer:
+                batch, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+                await self._write(batch)
+
+    def get_fields(self) -> List[str]:
+        """Return the dataset schema (every item key seen so far)."""
+        return list(self.fields)
+
+    async def close(self) -> int:
+        """Flush remaining items and return the number of items written."""
+        await self.flush()
+        return self.total_written
@@ -0,0 +1,216 @@
+"""
+Delta Tracker for incremental scheduled runs.
+Keeps a fingerprint of every item a schedule last produced in the delta_state
+collection, keyed by a stable item key (ASIN, placeId or URL), so a delta run
+only stores items that are new, changed or gone since the previous run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import datetime, timezone
+from pymongo import DeleteOne, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Item fields that identify the same entity across runs, in order of preference
+DELTA_KEY_FIELDS = ('asin', 'placeId', 'url')
+
+# Fields that vary between runs without the entity changing
+DELTA_IGNORED_FIELDS = {'url', 'searchKeyword', 'cachedAt'}
+
+
+async def ensure_delta_indexes(db):
+    """Create the per-schedule item key index."""
+    await db.delta_state.create_index([("schedule_id", 1), ("key", 1)], unique=True)
+
+
+async def clear_delta_state(db, schedule_id: str):
+    """Forget a schedule's previous items so its next delta run starts from scratch."""
+    await db.delta_state.delete_many({"schedule_id": schedule_id})
+
+
+def item_key(data: Dict[str, Any]) -> Optional[str]:
+    """Stable key for an item, or None if it has none of the key fields."""
+    for field in DELTA_KEY_FIELDS:
+        value = data.get(field)
+        if value:
+            return f"{field}:{value}"
+    return None
+
+
+def _comparable(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in data.items() if k not in DELTA_IGNORED_FIELDS}
+
+
+def has_content(data: Dict[str, Any]) -> bool:
+    """Whether an item has any non-empty field besides its key (a blank page parses into none)."""
+    return any(
+        value for field, value in _comparable(data).items()
+        if field not in DELTA_KEY_FIELDS
+    )
+
+
+def fingerprint(data: Dict[str, Any]) -> str:
+    """Hash of an item's comparable fields."""
+    canonical = json.dumps(_comparable(data), sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class DeltaTracker:
+    """
+    Classifies a schedule run's items against the schedule's previous items.
+
+    Provides:
+    - new / changed (with changed fields and previous values) / unchanged classification
+    - removed items for keys the run no longer produced (or attempted)
+    - Error items stored as-is, without touching their previous state
+    - Batched write-behind of the updated state
+    """
+
+    def __init__(self, db, schedule_id: str, run_id: str, batch_size: Optional[int] = None):
+        self.db = db
+        self.schedule_id = schedule_id
+        self.run_id = run_id
+        self.batch_size = batch_size or int(os.getenv('DELTA_STATE_BATCH_SIZE', '200'))
+
+        # key -> fingerprint from the previous run; only hashes are held in memory
+        self._previous: Dict[str, str] = {}
+        self._seen: set = set()
+        # Keys the run tried to extract but may not have produced (errors, throttling)
+        self._attempted: set = set()
+        self._pending: List[Any] = []
+
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0, "untracked": 0, "failed": 0}
+
+    async def load(self):
+        """Load the previous run's item fingerprints."""
+        cursor = self.db.delta_state.find(
+            {"schedule_id": self.schedule_id},
+            {"_id": 0, "key": 1, "hash": 1}
+        )
+        async for state in cursor:
+            self._previous[state['key']] = state['hash']
+        logger.info(f"Run {self.run_id}: delta against {len(self._previous)} previous items")
+
+    async def classify(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Compare an item with the previous run.
+
+        Returns:
+            The item annotated with changeType (and changedFields/previous for changes),
+            or None if it is unchanged and should not be stored; items with an
+            'error' are returned unchanged and neither diffed nor saved as state,
+            and items without content are dropped the same way
+        """
+        key = item_key(data)
+        if 'error' not in data and not has_content(data):
+            # An empty extraction would overwrite the previous snapshot with blanks
+            self.counts["failed"] += 1
+            if key is not None:
+                self._attempted.add(key)
+            return None
+
+        if 'error' in data:
+            # A failed extraction says nothing about whether the entity changed
+            self.counts["failed"] += 1
+            if key is not None:
+                self._attempted.add(key)
+            return data
+
+        if key is None:
+            # Nothing to diff against; always stored
+            self.counts["untracked"] += 1
+            return {**data, "changeType": "new"}
+
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+
+        current_hash = fingerprint(data)
+        previous_hash = self._previous.get(key)
+        if previous_hash == current_hash:
+            self.counts["unchanged"] += 1
+            return None
+
+        if previous_hash is None:
+            self.counts["new"] += 1
+            result = {**data, "changeType": "new"}
+        else:
+            self.counts["changed"] += 1
+            state = await self.db.delta_state.find_one(
+                {"schedule_id": self.schedule_id, "key": key},
+                {"_id": 0, "data": 1}
+            )
+            previous = _comparable(state['data']) if state else {}
+            current = _comparable(data)
+            changed_fields = sorted(
+                field for field in set(previous) | set(current)
+                if previous.get(field) != current.get(field)
+            )
+            result = {
+                **data,
+                "changeType": "changed",
+                "changedFields": changed_fields,
+                "previous": {field: previous.get(field) for field in changed_fields}
+            }
+
+        self._pending.append(UpdateOne(
+            {"schedule_id": self.schedule_id, "key": key},
+            {"$set": {
+                "hash": current_hash,
+                "data": data,
+                "run_id": self.run_id,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }},
+            upsert=True
+        ))
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        return result
+
+    def mark_attempted(self, keys: Iterable[str]):
+        """Item keys the run tried to extract; previous items under them are not reported removed."""
+        self._attempted.update(keys)
+
+    async def flush(self):
+        """Write pending state updates."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await self.db.delta_state.bulk_write(batch, ordered=False)
+        except Exception as e:
+            logger.error(f"Run {self.run_id}: failed to write delta state: {str(e)}")
+
+    async def finish(self) -> List[Dict[str, Any]]:
+        """
+        Flush state and return the previous items this run did not produce, as removed items.
+        Call only after a complete run; a partial run would report everything it missed as removed.
+        Keys passed to mark_attempted (or seen on error items) keep their previous state.
+        """
+        removed_keys = [
+            key for key in self._previous
+            if key not in self._seen and key not in self._attempted
+        ]
+        removed = []
+        for start in range(0, len(removed_keys), self.batch_size):
+            chunk = removed_keys[start:start + self.batch_size]
+            cursor = self.db.delta_state.find(
+                {"schedule_id": self.schedule_id, "key": {"$in": chunk}},
+                {"_id": 0, "key": 1, "data": 1}
+            )
+            async for state in cursor:
+                removed.append({**state['data'], "changeType": "removed"})
+                self._pending.append(DeleteOne({"schedule_id": self.schedule_id, "key": state['key']}))
+            await self.flush()
+
+        self.counts["removed"] = len(removed)
+        await self.flush()
+        return removed
+
+    def get_summary(self) -> Dict[str, int]:
+        """Get counts per change type."""
+        return dict(self.counts)
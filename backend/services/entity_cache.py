@@ -0,0 +1,96 @@
+"""
+Entity Cache for scraped places and products.
+Detail-page results are stored in the entity_cache collection keyed by kind
+(e.g. google_maps_place, amazon_product) and id (placeId, ASIN), so recurring
+runs can serve fresh-enough entities without loading the page again.
+"""
+
+import logging
+import os
+from typing import Dict, Any, Iterable, Optional
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_entity_cache_indexes(db):
+    """Create the lookup index and the TTL index that drops entries past retention."""
+    retention_hours = float(os.getenv('ENTITY_CACHE_RETENTION_HOURS', '168'))
+    await db.entity_cache.create_index([("kind", 1), ("key", 1)], unique=True)
+    await db.entity_cache.create_index("scraped_at", expireAfterSeconds=int(retention_hours * 3600))
+
+
+class EntityCache:
+    """
+    Read-through/write-through cache of scraped entities with a freshness limit per lookup.
+
+    A write-only cache (read=False) never serves entries but still stores what
+    the run scrapes, for runs that must see current data.
+    """
+
+    def __init__(self, db, read: bool = True):
+        self.db = db
+        self.read = read
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        kind: str,
+        key: str,
+        max_age_hours: float,
+        required_fields: Iterable[str] = ()
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get an entity scraped within the last max_age_hours.
+        Entries lacking any of required_fields (e.g. reviews a run asks for) count as misses.
+
+        Returns:
+            The cached data with a cachedAt timestamp added, or None if missing or stale
+        """
+        if not self.read or not key or max_age_hours <= 0:
+            return None
+
+        query = {
+            "kind": kind,
+            "key": key,
+            "scraped_at": {"$gte": datetime.now(timezone.utc) - timedelta(hours=max_age_hours)}
+        }
+        for field in required_fields:
+            query[f"data.{field}"] = {"$exists": True}
+        try:
+            entry = await self.db.entity_cache.find_one(
+                query,
+                {"_id": 0, "data": 1, "scraped_at": 1}
+            )
+        except Exception as e:
+            logger.warning(f"Entity cache read failed for {kind}/{key}: {str(e)}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        scraped_at = entry['scraped_at']
+        if scraped_at.tzinfo is None:
+            scraped_at = scraped_at.replace(tzinfo=timezone.utc)
+        return {**entry['data'], 'cachedAt': scraped_at.isoformat()}
+
+    async def put(self, kind: str, key: str, data: Dict[str, Any]):
+        """Store a freshly scraped entity."""
+        if not key:
+            return
+        try:
+            await self.db.entity_cache.update_one(
+                {"kind": kind, "key": key},
+                # A BSON date (not an ISO string) so the TTL index applies
+                {"$set": {"data": data, "scraped_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Entity cache write failed for {kind}/{key}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts for this cache instance."""
+        return {"hits": self.hits, "misses": self.misses}
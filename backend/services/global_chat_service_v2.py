@@ -575,7 +575,6 @@ Then FUNCTION_CALL: {"name": "view_run_details", "arguments": {"run_id": "<first
                 "results_count": 0,
                 "dataset_id": None,
                 "error_message": None,
-                "logs": [],
                 "cost": 0.0,
                 "created_at": datetime.now(timezone.utc).isoformat()
             }
@@ -899,7 +898,6 @@ Then FUNCTION_CALL: {"name": "view_run_details", "arguments": {"run_id": "<first
                 "results_count": 0,
                 "dataset_id": None,
                 "error_message": None,
-                "logs": [],
                 "cost": 0.0,
                 "created_at": datetime.now(timezone.utc).isoformat()
             }
@@ -0,0 +1,260 @@
+"""
+Proxy Health Checker - bounded, streaming proxy checks.
+Proxies are read with a cursor (stalest first), checked through one shared
+aiohttp connector with at most N checks in flight, and their results are
+written back in unordered bulk batches. A background loop keeps re-checking
+the stalest proxies so the pool's response times and active flags stay current.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone, timedelta
+import aiohttp
+from pymongo import UpdateOne
+from .proxy_pool import ProxyPool
+
+logger = logging.getLogger(__name__)
+
+
+def format_proxy_url(proxy: Dict[str, Any]) -> str:
+    """Format proxy dictionary into URL string."""
+    protocol = proxy.get('protocol', 'http')
+    username = proxy.get('username')
+    password = proxy.get('password')
+    if username and password:
+        return f"{protocol}://{username}:{password}@{proxy['host']}:{proxy['port']}"
+    return f"{protocol}://{proxy['host']}:{proxy['port']}"
+
+
+class ProxyHealthChecker:
+    """
+    Checks proxies against a configurable target URL.
+
+    PROXY_CHECK_URL points checks at any endpoint that answers 200 (e.g. a
+    local stand-in for httpbin.org/ip in tests).
+
+    Provides:
+    - A semaphore bound on concurrent checks over one shared session
+    - Cursor iteration over every proxy, stalest first
+    - Bulk-written results, with deactivation after repeated failures
+    - Background re-checks of proxies not checked within a max age
+    """
+
+    def __init__(
+        self,
+        db,
+        pool: Optional[ProxyPool] = None,
+        check_url: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.db = db
+        # In-memory pool kept in step with the results (optional)
+        self.pool = pool
+        self.check_url = check_url or os.getenv('PROXY_CHECK_URL', 'http://httpbin.org/ip')
+        self.concurrency = concurrency or int(os.getenv('PROXY_CHECK_CONCURRENCY', '50'))
+        self.timeout = timeout or float(os.getenv('PROXY_CHECK_TIMEOUT_SECONDS', '10'))
+        self.batch_size = batch_size or int(os.getenv('PROXY_CHECK_BATCH_SIZE', '100'))
+        self.max_failures = int(os.getenv('PROXY_MAX_FAILURES', '5'))
+
+        self.recheck_interval = float(os.getenv('PROXY_RECHECK_INTERVAL_SECONDS', '60'))
+        self.recheck_max_age = float(os.getenv('PROXY_RECHECK_MAX_AGE_SECONDS', '900'))
+        self.recheck_batch = int(os.getenv('PROXY_RECHECK_BATCH', '100'))
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._background: Optional[asyncio.Task] = None
+        # One sweep at a time; a manual check waits for a background one to finish
+        self._sweep_lock = asyncio.Lock()
+
+        self.checked = 0
+        self.healthy = 0
+        self.deactivated = 0
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def _probe(self, proxy: Dict[str, Any]) -> Optional[float]:
+        """Response time through the proxy, or None if it failed."""
+        start = time.perf_counter()
+        try:
+            async with self._get_session().get(self.check_url, proxy=format_proxy_url(proxy)) as response:
+                await response.read()
+                if response.status == 200:
+                    return time.perf_counter() - start
+                logger.debug(f"Proxy {proxy['host']}:{proxy['port']} check returned {response.status}")
+        except Exception as e:
+            logger.debug(f"Proxy {proxy['host']}:{proxy['port']} check failed: {str(e)}")
+        return None
+
+    def _result(self, proxy: Dict[str, Any], response_time: Optional[float]) -> UpdateOne:
+        """Build the stats update for one check and apply it to the pool."""
+        now = datetime.now(timezone.utc).isoformat()
+        if response_time is not None:
+            self.healthy += 1
+            if self.pool is not None:
+                if self.pool.get(proxy['id']) is None:
+                    # Back from inactive
+                    self.pool.add({**proxy, "is_active": True, "response_time": response_time})
+                self.pool.apply(proxy['id'], True, response_time)
+            return UpdateOne(
+                {"id": proxy['id']},
+                {
+                    "$set": {"is_active": True, "response_time": response_time, "last_check": now},
+                    "$inc": {"success_count": 1}
+                }
+            )
+
+        update: Dict[str, Any] = {"last_check": now}
+        if proxy.get('failure_count', 0) + 1 >= self.max_failures and proxy.get('is_active', True):
+            update["is_active"] = False
+            self.deactivated += 1
+            logger.info(f"Deactivated proxy {proxy['id']}")
+        if self.pool is not None:
+            if update.get("is_active") is False:
+                self.pool.remove(proxy['id'])
+            else:
+                self.pool.apply(proxy['id'], False)
+        return UpdateOne({"id": proxy['id']}, {"$set": update, "$inc": {"failure_count": 1}})
+
+    async def _write(self, operations: List[UpdateOne]):
+        try:
+            await self.db.proxies.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to write {len(operations)} proxy check results: {str(e)}")
+
+    async def check_one(self, proxy: Dict[str, Any]) -> bool:
+        """Check a single proxy and store the result."""
+        response_time = await self._probe(proxy)
+        self.checked += 1
+        await self._write([self._result(proxy, response_time)])
+        return response_time is not None
+
+    async def check_all(self, query: Optional[Dict[str, Any]] = None, limit: int = 0) -> Dict[str, int]:
+        """
+        Check every proxy matching query (all proxies by default), stalest first,
+        each at most once per sweep.
+
+        Returns:
+            Counts of checked, healthy and deactivated proxies
+        """
+        async with self._sweep_lock:
+            checked = 0
+            healthy_before, deactivated_before = self.healthy, self.deactivated
+            semaphore = asyncio.Semaphore(self.concurrency)
+            pending: List[UpdateOne] = []
+            tasks = set()
+
+            async def check(proxy: Dict[str, Any]):
+                nonlocal checked
+                try:
+                    response_time = await self._probe(proxy)
+                    checked += 1
+                    pending.append(self._result(proxy, response_time))
+                finally:
+                    semaphore.release()
+
+            # The sweep moves last_check forward as it goes; only proxies last checked before
+            # it started qualify, so the cursor never meets a proxy this sweep already checked
+            sweep_start = datetime.now(timezone.utc).isoformat()
+            not_yet_checked = {"$or": [{"last_check": None}, {"last_check": {"$lt": sweep_start}}]}
+            cursor = self.db.proxies.find(
+                {"$and": [query, not_yet_checked]} if query else not_yet_checked,
+                {"_id": 0}
+            ).sort("last_check", 1)
+            if limit:
+                cursor = cursor.limit(limit)
+            try:
+                async for proxy in cursor:
+                    # Reading ahead of the checks is bounded by the semaphore
+                    await semaphore.acquire()
+                    task = asyncio.create_task(check(proxy))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    if len(pending) >= self.batch_size:
+                        batch = list(pending)
+                        pending.clear()
+                        await self._write(batch)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if pending:
+                    await self._write(list(pending))
+
+            self.checked += checked
+            healthy = self.healthy - healthy_before
+            deactivated = self.deactivated - deactivated_before
+            self.last_sweep = {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "checked": checked,
+                "healthy": healthy,
+                "deactivated": deactivated
+            }
+            return {"checked": checked, "healthy": healthy, "deactivated": deactivated}
+
+    async def recheck_stale(self) -> Dict[str, int]:
+        """Check the stalest proxies not checked within the max age."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.recheck_max_age)).isoformat()
+        return await self.check_all(
+            {"$or": [{"last_check": None}, {"last_check": {"$lt": cutoff}}]},
+            limit=self.recheck_batch
+        )
+
+    async def _run_background(self):
+        while True:
+            try:
+                result = await self.recheck_stale()
+                if result["checked"]:
+                    logger.info(
+                        f"Proxy re-check: {result['healthy']}/{result['checked']} healthy, "
+                        f"{result['deactivated']} deactivated"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Proxy re-check failed: {str(e)}")
+            await asyncio.sleep(self.recheck_interval)
+
+    def start(self):
+        """Start background re-checking (PROXY_BACKGROUND_CHECKS=false disables it)."""
+        if os.getenv('PROXY_BACKGROUND_CHECKS', 'true').lower() != 'true':
+            return
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._run_background())
+            logger.info(f"Proxy background re-checks every {self.recheck_interval:.0f}s against {self.check_url}")
+
+    async def stop(self):
+        """Stop background re-checking and close the shared session."""
+        if self._background and not self._background.done():
+            self._background.cancel()
+            try:
+                await self._background
+            except asyncio.CancelledError:
+                pass
+        self._background = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get check counts and the last sweep's result."""
+        return {
+            "check_url": self.check_url,
+            "concurrency": self.concurrency,
+            "background": self._background is not None and not self._background.done(),
+            "checked": self.checked,
+            "healthy": self.healthy,
+            "deactivated": self.deactivated,
+            "last_sweep": self.last_sweep
+        }
@@ -0,0 +1,146 @@
+"""
+Proxy Import - bulk loading of proxy lists.
+Lines of host:port[:user:pass] (optionally prefixed with protocol://) are
+parsed and deduplicated in memory, then upserted in unordered bulk batches;
+the unique (host, port, protocol) index makes existing proxies no-ops.
+"""
+
+import logging
+import os
+from typing import AsyncIterable, AsyncIterator, Dict, Any, Iterable, List, Optional, Set, Tuple, Union
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models import Proxy
+
+logger = logging.getLogger(__name__)
+
+PROXY_PROTOCOLS = ('http', 'https', 'socks4', 'socks5')
+
+# Mongo duplicate key error code (a concurrent import inserted the same proxy)
+DUPLICATE_KEY_ERROR = 11000
+
+
+def parse_proxy_line(line: str, default_protocol: str = "http") -> Optional[Dict[str, Any]]:
+    """
+    Parse one proxy line.
+
+    Returns:
+        host/port/protocol (and username/password if given), or None if the line is invalid
+    """
+    protocol = default_protocol
+    if '://' in line:
+        protocol, line = line.split('://', 1)
+        protocol = protocol.lower()
+    if protocol not in PROXY_PROTOCOLS:
+        return None
+
+    parts = line.split(':')
+    if len(parts) not in (2, 4):
+        return None
+    host = parts[0].strip().lower()
+    if not host or any(char.isspace() or char in '/@' for char in host):
+        return None
+    try:
+        port = int(parts[1])
+    except ValueError:
+        return None
+    if not 0 < port < 65536:
+        return None
+
+    proxy = {"host": host, "port": port, "protocol": protocol}
+    if len(parts) == 4:
+        if not parts[2] or not parts[3]:
+            return None
+        proxy["username"] = parts[2]
+        proxy["password"] = parts[3]
+    return proxy
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into stripped lines without holding it all in memory."""
+    remainder = b""
+    async for chunk in chunks:
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").strip()
+    if remainder:
+        yield remainder.decode("utf-8", errors="replace").strip()
+
+
+async def _as_async(lines: Iterable[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+async def import_proxies(
+    db,
+    lines: Union[AsyncIterable[str], Iterable[str]],
+    default_protocol: str = "http",
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Upsert proxies from lines; blank lines and # comments are skipped.
+
+    Returns:
+        Counts of accepted (newly added), duplicate (repeated in the input or
+        already stored), invalid and failed (write error) lines
+    """
+    batch_size = batch_size or int(os.getenv('PROXY_IMPORT_BATCH_SIZE', '1000'))
+    if not hasattr(lines, '__aiter__'):
+        lines = _as_async(lines)
+
+    counts = {"accepted": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+    seen: Set[Tuple[str, int, str]] = set()
+    batch: List[UpdateOne] = []
+
+    async for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parsed = parse_proxy_line(line, default_protocol)
+        if parsed is None:
+            counts["invalid"] += 1
+            continue
+
+        key = (parsed["host"], parsed["port"], parsed["protocol"])
+        if key in seen:
+            counts["duplicate"] += 1
+            continue
+        seen.add(key)
+
+        doc = Proxy(**parsed).model_dump()
+        doc['created_at'] = doc['created_at'].isoformat()
+        batch.append(UpdateOne(
+            {"host": parsed["host"], "port": parsed["port"], "protocol": parsed["protocol"]},
+            {"$setOnInsert": doc},
+            upsert=True
+        ))
+        if len(batch) >= batch_size:
+            await _write_batch(db, batch, counts)
+            batch = []
+
+    if batch:
+        await _write_batch(db, batch, counts)
+
+    logger.info(
+        f"Proxy import: {counts['accepted']} added, {counts['duplicate']} duplicates, {counts['invalid']} invalid"
+    )
+    return counts
+
+
+async def _write_batch(db, batch: List[UpdateOne], counts: Dict[str, int]):
+    try:
+        result = await db.proxies.bulk_write(batch, ordered=False)
+        counts["accepted"] += result.upserted_count
+        counts["duplicate"] += len(batch) - result.upserted_count
+    except BulkWriteError as e:
+        details = e.details
+        counts["accepted"] += details.get('nUpserted', 0)
+        errors = details.get('writeErrors', [])
+        duplicates = sum(1 for error in errors if error.get('code') == DUPLICATE_KEY_ERROR)
+        counts["duplicate"] += len(batch) - details.get('nUpserted', 0) - (len(errors) - duplicates)
+        if len(errors) > duplicates:
+            counts["failed"] += len(errors) - duplicates
+            logger.error(f"Proxy import: {len(errors) - duplicates} proxies failed to write")
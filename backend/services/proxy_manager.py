@@ -1,163 +1,184 @@
 import asyncio
 import aiohttp
-import random
-from typing import List, Optional, Dict
+import os
+from typing import Any, List, Optional, Dict
 from datetime import datetime, timezone, timedelta
 import logging
-from models import Proxy
+from .proxy_pool import ProxyPool
+from .proxy_rotation import ProxyRotator
+from .proxy_health import ProxyHealthChecker, format_proxy_url
+from .proxy_import import import_proxies
 
 logger = logging.getLogger(__name__)
 
+
+async def ensure_proxy_indexes(db):
+    """
+    Create the index health checks use to find the stalest proxies, then the
+    import dedup index; the latter fails if stored proxies already repeat a
+    (host, port, protocol).
+    """
+    await db.proxies.create_index("last_check")
+    await db.proxies.create_index([("host", 1), ("port", 1), ("protocol", 1)], unique=True)
+
+
 class ProxyManager:
     """Powerful proxy rotation system with health checking and auto-rotation."""
     
     def __init__(self, db):
         self.db = db
-        self.proxy_cache: List[Dict] = []
+        # Active proxies indexed by score; reloaded from the database every cache_ttl
+        # seconds to pick up proxies changed by other processes
+        self.pool = ProxyPool(db)
+        self.rotator = ProxyRotator(self.pool)
         self.cache_ttl = 300  # 5 minutes
         self.last_cache_update = None
-        self.check_url = "http://httpbin.org/ip"
-        self.timeout = 10
-        
+        self._refresh_lock = asyncio.Lock()
+        self.health_checker = ProxyHealthChecker(db, self.pool)
+        
+        # Outcome feedback from scraping: proxies with this many bad outcomes in a row
+        # leave rotation for quarantine_seconds
+        self.quarantine_after = int(os.getenv('PROXY_QUARANTINE_AFTER_FAILURES', '5'))
+        self.quarantine_seconds = float(os.getenv('PROXY_QUARANTINE_SECONDS', '600'))
+        self._consecutive_failures: Dict[str, int] = {}
+        self.outcomes: Dict[str, int] = {"success": 0, "blocked": 0, "timeout": 0, "failed": 0}
+        self.quarantines = 0
+    
+    def _pool_is_fresh(self) -> bool:
+        return bool(
+            self.last_cache_update and
+            (datetime.now(timezone.utc) - self.last_cache_update).total_seconds() < self.cache_ttl
+        )
+    
+    async def _ensure_pool(self) -> ProxyPool:
+        """Load the pool if it is empty or past its TTL."""
+        if self._pool_is_fresh():
+            return self.pool
+        
+        async with self._refresh_lock:
+            if self._pool_is_fresh():
+                return self.pool
+            
+            # Write pending counters first so the reload sees them
+            await self.pool.flush()
+            proxies = []
+            async for proxy in self.db.proxies.find({"is_active": True}, {"_id": 0}):
+                # Convert datetime strings back to datetime objects if needed
+                for field in ('created_at', 'last_used', 'last_check'):
+                    if isinstance(proxy.get(field), str):
+                        proxy[field] = datetime.fromisoformat(proxy[field])
+                proxies.append(proxy)
+            
+            self.pool.load(proxies)
+            self.last_cache_update = datetime.now(timezone.utc)
+        return self.pool
+    
+    def invalidate(self):
+        """Reload the pool from the database on next use."""
+        self.last_cache_update = None
+    
     async def get_active_proxies(self) -> List[Dict]:
-        """Get list of active proxies from database."""
-        # Check if cache is still valid
-        if (self.proxy_cache and self.last_cache_update and 
-            (datetime.now(timezone.utc) - self.last_cache_update).seconds < self.cache_ttl):
-            return self.proxy_cache
-        
-        # Refresh cache from database
-        proxies = await self.db.proxies.find({"is_active": True}, {"_id": 0}).to_list(1000)
-        
-        # Convert datetime strings back to datetime objects if needed
-        for proxy in proxies:
-            if isinstance(proxy.get('created_at'), str):
-                proxy['created_at'] = datetime.fromisoformat(proxy['created_at'])
-            if isinstance(proxy.get('last_used'), str):
-                proxy['last_used'] = datetime.fromisoformat(proxy['last_used'])
-            if isinstance(proxy.get('last_check'), str):
-                proxy['last_check'] = datetime.fromisoformat(proxy['last_check'])
-        
-        self.proxy_cache = proxies
-        self.last_cache_update = datetime.now(timezone.utc)
-        return proxies
+        """Get list of active proxies."""
+        pool = await self._ensure_pool()
+        return pool.all()
     
     async def get_best_proxy(self) -> Optional[Dict]:
         """Get the best performing proxy based on success rate and response time."""
-        proxies = await self.get_active_proxies()
-        
-        if not proxies:
+        pool = await self._ensure_pool()
+        proxy = pool.best()
+        if proxy is None:
             logger.warning("No active proxies available")
-            return None
-        
-        # Score proxies based on success rate and response time
-        scored_proxies = []
-        for proxy in proxies:
-            total_requests = proxy['success_count'] + proxy['failure_count']
-            success_rate = proxy['success_count'] / total_requests if total_requests > 0 else 0.5
-            response_time = proxy.get('response_time', 5.0) or 5.0
-            
-            # Score: higher success rate and lower response time is better
-            score = (success_rate * 100) - (response_time * 2)
-            scored_proxies.append((score, proxy))
-        
-        # Sort by score and get top proxy
-        scored_proxies.sort(reverse=True, key=lambda x: x[0])
-        return scored_proxies[0][1] if scored_proxies else proxies[0]
+        return proxy
     
     async def get_random_proxy(self) -> Optional[Dict]:
         """Get a random active proxy for load distribution."""
-        proxies = await self.get_active_proxies()
-        return random.choice(proxies) if proxies else None
+        pool = await self._ensure_pool()
+        return pool.random()
     
-    async def get_rotating_proxy(self, strategy: str = "best") -> Optional[Dict]:
+    async def get_rotating_proxy(
+        self,
+        strategy: str = "best",
+        session_id: Optional[str] = None,
+        domain: Optional[str] = None
+    ) -> Optional[Dict]:
         """Get a proxy based on rotation strategy.
         
         Args:
-            strategy: 'best' (best performing), 'random' (random selection), 'round-robin'
+            strategy: 'best' (best performing), 'random' (random selection), 'round-robin',
+                'weighted' (random, weighted by score), 'sticky' (same proxy per session_id)
+            session_id: Session (e.g. run) that 'sticky' binds a proxy to
+            domain: Target domain; proxies cooling down or used too recently there are skipped
         """
-        if strategy == "random":
-            return await self.get_random_proxy()
-        else:
-            return await self.get_best_proxy()
+        pool = await self._ensure_pool()
+        proxy = self.rotator.select(strategy, session_id=session_id, domain=domain)
+        if proxy is None and not len(pool):
+            logger.warning("No active proxies available")
+        return proxy
+    
+    def cool_down(self, proxy_id: str, domain: str, seconds: Optional[float] = None):
+        """Stop using a proxy for a domain that blocked it, for a while."""
+        self.rotator.cool_down(proxy_id, domain, seconds)
+    
+    def release_session(self, session_id: str):
+        """Forget the sticky proxy of a finished session."""
+        self.rotator.release_session(session_id)
     
     def format_proxy_url(self, proxy: Dict) -> str:
         """Format proxy dictionary into URL string for Playwright."""
-        protocol = proxy.get('protocol', 'http')
-        host = proxy['host']
-        port = proxy['port']
-        username = proxy.get('username')
-        password = proxy.get('password')
-        
-        if username and password:
-            return f"{protocol}://{username}:{password}@{host}:{port}"
-        return f"{protocol}://{host}:{port}"
+        return format_proxy_url(proxy)
     
     async def check_proxy_health(self, proxy: Dict) -> bool:
         """Check if a proxy is working and measure response time."""
-        proxy_url = self.format_proxy_url(proxy)
-        
-        try:
-            start_time = datetime.now()
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.check_url,
-                    proxy=proxy_url,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status == 200:
-                        response_time = (datetime.now() - start_time).total_seconds()
-                        
-                        # Update proxy stats in database
-                        await self.db.proxies.update_one(
-                            {"id": proxy['id']},
-                            {
-                                "$set": {
-                                    "is_active": True,
-                                    "response_time": response_time,
-                                    "last_check": datetime.now(timezone.utc).isoformat()
-                                },
-                                "$inc": {"success_count": 1}
-                            }
-                        )
-                        logger.info(f"Proxy {proxy['host']}:{proxy['port']} is healthy (response: {response_time:.2f}s)")
-                        return True
-        except Exception as e:
-            logger.warning(f"Proxy {proxy['host']}:{proxy['port']} check failed: {str(e)}")
-            
-            # Update failure count
-            await self.db.proxies.update_one(
-                {"id": proxy['id']},
-                {
-                    "$set": {
-                        "last_check": datetime.now(timezone.utc).isoformat()
-                    },
-                    "$inc": {"failure_count": 1}
-                }
-            )
-            
-            # Deactivate proxy if too many failures
-            failure_count = proxy['failure_count'] + 1
-            if failure_count >= 5:
-                await self.deactivate_proxy(proxy['id'])
-            
-            return False
+        return await self.health_checker.check_one(proxy)
     
     async def mark_proxy_used(self, proxy_id: str, success: bool = True):
-        """Mark proxy as used and update statistics."""
-        update_data = {
-            "$set": {"last_used": datetime.now(timezone.utc).isoformat()}
-        }
-        
-        if success:
-            update_data["$inc"] = {"success_count": 1}
+        """Mark proxy as used and update statistics (rescored now, persisted on the pool's next flush)."""
+        self.pool.record(proxy_id, success)
+    
+    def record_outcome(
+        self,
+        proxy_id: str,
+        outcome: str,
+        latency: Optional[float] = None,
+        domain: Optional[str] = None
+    ):
+        """
+        Feed the outcome of one request made through a proxy into its score.
+
+        Args:
+            outcome: 'success', 'blocked' (rate limited/captcha/block page), 'timeout' or 'failed'
+            latency: Seconds to first byte, for successful requests
+            domain: Target domain; a block there cools the proxy down for that domain
+        """
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if outcome == "success":
+            self.pool.record(proxy_id, True, latency=latency)
+            self._consecutive_failures.pop(proxy_id, None)
+            return
+        
+        # Counted under the outcome, not failure_count; quarantine below handles repeats
+        self.pool.record(proxy_id, False, outcome=outcome)
+        if outcome == "blocked" and domain:
+            self.rotator.cool_down(proxy_id, domain)
+        
+        failures = self._consecutive_failures.get(proxy_id, 0) + 1
+        if failures >= self.quarantine_after:
+            self._consecutive_failures.pop(proxy_id, None)
+            self.rotator.quarantine(proxy_id, self.quarantine_seconds)
+            self.quarantines += 1
+            logger.warning(
+                f"Quarantined proxy {proxy_id} for {self.quarantine_seconds:.0f}s after {failures} failed requests"
+            )
         else:
-            update_data["$inc"] = {"failure_count": 1}
-        
-        await self.db.proxies.update_one({"id": proxy_id}, update_data)
-        
-        # Clear cache to force refresh
-        self.proxy_cache = []
+            self._consecutive_failures[proxy_id] = failures
+    
+    def get_outcome_stats(self) -> Dict[str, Any]:
+        """Get request outcome counts reported by scrapers."""
+        return {
+            "outcomes": dict(self.outcomes),
+            "quarantines": self.quarantines,
+            "failing": len(self._consecutive_failures)
+        }
     
     async def deactivate_proxy(self, proxy_id: str):
         """Deactivate a proxy that's not working."""
@@ -166,9 +187,7 @@ class ProxyManager:
             {"$set": {"is_active": False}}
         )
         logger.info(f"Deactivated proxy {proxy_id}")
-        
-        # Clear cache
-        self.proxy_cache = []
+        self.pool.remove(proxy_id)
     
     async def add_free_proxies(self):
         """Fetch and add free proxies from public sources."""
@@ -186,48 +205,27 @@ class ProxyManager:
                             text = await response.text()
                             proxy_lines = text.strip().split('\n')
                             
-                            for line in proxy_lines[:20]:  # Limit to 20 proxies per source
-                                if ':' in line:
-                                    try:
-                                        host, port = line.strip().split(':')
-                                        
-                                        # Check if proxy already exists
-                                        existing = await self.db.proxies.find_one({"host": host, "port": int(port)})
-                                        if not existing:
-                                            proxy = Proxy(
-                                                host=host,
-                                                port=int(port),
-                                                protocol="http"
-                                            )
-                                            doc = proxy.model_dump()
-                                            doc['created_at'] = doc['created_at'].isoformat()
-                                            await self.db.proxies.insert_one(doc)
-                                            added_count += 1
-                                    except Exception as e:
-                                        logger.debug(f"Failed to parse proxy line {line}: {e}")
-                                        continue
+                            # Limit to 20 proxies per source
+                            result = await import_proxies(self.db, proxy_lines[:20], default_protocol="http")
+                            added_count += result["accepted"]
             except Exception as e:
                 logger.error(f"Failed to fetch proxies from {api_url}: {e}")
         
         logger.info(f"Added {added_count} new free proxies")
-        self.proxy_cache = []  # Clear cache
+        if added_count:
+            self.invalidate()
         return added_count
     
-    async def health_check_all(self):
-        """Run health check on all proxies."""
-        proxies = await self.db.proxies.find({}, {"_id": 0}).to_list(1000)
-        
-        # Convert datetime strings
-        for proxy in proxies:
-            if isinstance(proxy.get('created_at'), str):
-                proxy['created_at'] = datetime.fromisoformat(proxy['created_at'])
-        
-        tasks = [self.check_proxy_health(proxy) for proxy in proxies]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        healthy = sum(1 for r in results if r is True)
-        logger.info(f"Health check complete: {healthy}/{len(proxies)} proxies healthy")
-        return healthy
+    async def health_check_all(self) -> Dict[str, int]:
+        """Run health check on all proxies (bounded concurrency, results bulk-written)."""
+        result = await self.health_checker.check_all()
+        logger.info(f"Health check complete: {result['healthy']}/{result['checked']} proxies healthy")
+        return result
+    
+    async def close(self):
+        """Stop background health checks and write pending proxy stats."""
+        await self.health_checker.stop()
+        await self.pool.close()
 
 # Global proxy manager instance
 proxy_manager = None
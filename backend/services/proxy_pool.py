@@ -0,0 +1,259 @@
+"""
+Proxy Pool - in-memory index of active proxies ordered by score.
+Selection reads the top of a heap instead of rescoring every proxy, usage
+outcomes update one proxy's score incrementally, and the success/failure
+counters are written back to Mongo in batches instead of once per use.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import random
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest latency sample in a proxy's moving-average response time
+LATENCY_SMOOTHING = 0.2
+
+# Scraping outcomes and the proxy fields they are counted in. They stay out of
+# failure_count, which the health checker deactivates proxies on: a block or a
+# slow target says more about the site than about whether the proxy works.
+OUTCOME_COUNTERS = {"blocked": "blocked_count", "timeout": "timeout_count", "failed": "error_count"}
+
+
+def proxy_score(proxy: Dict[str, Any]) -> float:
+    """Higher success rate (over checks and scraping requests) and lower response time is better."""
+    total_requests = proxy.get('success_count', 0) + proxy.get('failure_count', 0) + sum(
+        proxy.get(field, 0) for field in OUTCOME_COUNTERS.values()
+    )
+    success_rate = proxy.get('success_count', 0) / total_requests if total_requests > 0 else 0.5
+    response_time = proxy.get('response_time', 5.0) or 5.0
+    return (success_rate * 100) - (response_time * 2)
+
+
+class ProxyPool:
+    """
+    Active proxies keyed by id, with a max-heap on score for selection.
+
+    Heap entries are (-score, version, proxy_id); a score change pushes a new
+    entry and bumps the proxy's version, so stale entries are skipped (and
+    periodically compacted) instead of being searched for and removed.
+
+    Provides:
+    - O(log n) best-proxy selection and score updates
+    - O(1) random selection
+    - Write-behind of usage counters, flushed every N seconds with bulk_write
+    """
+
+    def __init__(self, db, flush_interval: Optional[float] = None):
+        self.db = db
+        self.flush_interval = flush_interval or float(os.getenv('PROXY_STATS_FLUSH_SECONDS', '5'))
+
+        self._proxies: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        # Ids in a list plus positions, for O(1) random choice and removal
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+        # proxy_id -> {"success": n, "failure": n, "last_used": iso, <outcome>: n}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.flushed_updates = 0
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def load(self, proxies: List[Dict[str, Any]]):
+        """Replace the pool contents, applying any counters not yet flushed."""
+        self._proxies = {}
+        self._versions = {}
+        self._ids = []
+        self._positions = {}
+        for proxy in proxies:
+            pending = self._pending.get(proxy['id'])
+            if pending:
+                proxy['success_count'] = proxy.get('success_count', 0) + pending['success']
+                proxy['failure_count'] = proxy.get('failure_count', 0) + pending['failure']
+                for outcome, field in OUTCOME_COUNTERS.items():
+                    proxy[field] = proxy.get(field, 0) + pending.get(outcome, 0)
+            self._insert(proxy)
+        self._rebuild_heap()
+
+    def _insert(self, proxy: Dict[str, Any]):
+        proxy_id = proxy['id']
+        self._proxies[proxy_id] = proxy
+        self._versions[proxy_id] = 0
+        self._positions[proxy_id] = len(self._ids)
+        self._ids.append(proxy_id)
+
+    def _rebuild_heap(self):
+        self._heap = [
+            (-proxy_score(proxy), self._versions[proxy_id], proxy_id)
+            for proxy_id, proxy in self._proxies.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _rescore(self, proxy_id: str):
+        self._versions[proxy_id] += 1
+        heapq.heappush(self._heap, (-proxy_score(self._proxies[proxy_id]), self._versions[proxy_id], proxy_id))
+        # Stale entries are dropped lazily; compact when they dominate
+        if len(self._heap) > 2 * len(self._proxies) + 64:
+            self._rebuild_heap()
+
+    def add(self, proxy: Dict[str, Any]):
+        """Add or replace an active proxy."""
+        if proxy['id'] in self._proxies:
+            self._proxies[proxy['id']] = proxy
+            self._rescore(proxy['id'])
+        else:
+            self._insert(proxy)
+            heapq.heappush(self._heap, (-proxy_score(proxy), 0, proxy['id']))
+
+    def remove(self, proxy_id: str):
+        """Drop a proxy (deleted or deactivated); its heap entries go stale."""
+        if proxy_id not in self._proxies:
+            return
+        del self._proxies[proxy_id]
+        del self._versions[proxy_id]
+        position = self._positions.pop(proxy_id)
+        last_id = self._ids.pop()
+        if last_id != proxy_id:
+            self._ids[position] = last_id
+            self._positions[last_id] = position
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """Highest scoring proxy."""
+        while self._heap:
+            _, version, proxy_id = self._heap[0]
+            if self._versions.get(proxy_id) == version:
+                return self._proxies[proxy_id]
+            heapq.heappop(self._heap)
+        return None
+
+    def random(self) -> Optional[Dict[str, Any]]:
+        """Uniformly random proxy."""
+        if not self._ids:
+            return None
+        return self._proxies[random.choice(self._ids)]
+
+    def get(self, proxy_id: str) -> Optional[Dict[str, Any]]:
+        return self._proxies.get(proxy_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._proxies.values())
+
+    def nth(self, index: int) -> Dict[str, Any]:
+        """Proxy at a position in insertion order (positions shift when proxies are removed)."""
+        return self._proxies[self._ids[index]]
+
+    def apply(
+        self,
+        proxy_id: str,
+        success: bool,
+        response_time: Optional[float] = None,
+        outcome: Optional[str] = None
+    ):
+        """Update a proxy's in-memory counters and score (already persisted elsewhere)."""
+        proxy = self._proxies.get(proxy_id)
+        if proxy is None:
+            return
+        counter = 'success_count' if success else OUTCOME_COUNTERS.get(outcome, 'failure_count')
+        proxy[counter] = proxy.get(counter, 0) + 1
+        if response_time is not None:
+            proxy['response_time'] = response_time
+        self._rescore(proxy_id)
+
+    def record(
+        self,
+        proxy_id: str,
+        success: bool,
+        latency: Optional[float] = None,
+        outcome: Optional[str] = None
+    ):
+        """
+        Record one use of a proxy; the counters reach Mongo on the next flush.
+
+        Args:
+            latency: Seconds to first byte, folded into the proxy's moving-average response time
+            outcome: 'blocked', 'timeout' or 'failed' to count a failure under that
+                cause instead of failure_count
+        """
+        now = datetime.now(timezone.utc)
+        proxy = self._proxies.get(proxy_id)
+        response_time = None
+        if proxy is not None and latency is not None:
+            previous = proxy.get('response_time')
+            response_time = latency if previous is None else (
+                previous * (1 - LATENCY_SMOOTHING) + latency * LATENCY_SMOOTHING
+            )
+        self.apply(proxy_id, success, response_time, outcome)
+        if proxy is not None:
+            proxy['last_used'] = now
+
+        pending = self._pending.setdefault(proxy_id, {"success": 0, "failure": 0, "last_used": None})
+        if success:
+            pending["success"] += 1
+        elif outcome in OUTCOME_COUNTERS:
+            pending[outcome] = pending.get(outcome, 0) + 1
+        else:
+            pending["failure"] += 1
+        pending["last_used"] = now.isoformat()
+        if response_time is not None:
+            pending["response_time"] = response_time
+
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await asyncio.shield(self.flush())
+
+    async def flush(self):
+        """Write pending counters in one unordered bulk write."""
+        async with self._lock:
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, {}
+            operations = []
+            for proxy_id, counts in batch.items():
+                update_set = {"last_used": counts["last_used"]}
+                if "response_time" in counts:
+                    update_set["response_time"] = counts["response_time"]
+                increments = {"success_count": counts["success"], "failure_count": counts["failure"]}
+                for outcome, field in OUTCOME_COUNTERS.items():
+                    if counts.get(outcome):
+                        increments[field] = counts[outcome]
+                operations.append(UpdateOne({"id": proxy_id}, {"$set": update_set, "$inc": increments}))
+            try:
+                await self.db.proxies.bulk_write(operations, ordered=False)
+                self.flushes += 1
+                self.flushed_updates += len(operations)
+            except Exception as e:
+                logger.error(f"Failed to write stats for {len(operations)} proxies: {str(e)}")
+
+    async def close(self):
+        """Flush remaining counters and stop the flush timer."""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size, heap size and write-behind metrics."""
+        best = self.best()
+        return {
+            "proxies": len(self._proxies),
+            "heap_entries": len(self._heap),
+            "best_score": round(proxy_score(best), 2) if best else None,
+            "pending_updates": len(self._pending),
+            "flushes": self.flushes,
+            "flushed_updates": self.flushed_updates
+        }
@@ -0,0 +1,299 @@
+"""
+Proxy Rotation - strategies for picking the next proxy from the ProxyPool.
+Strategies are registered by name ('best', 'random', 'round-robin', 'weighted',
+'sticky'); on top of any strategy, per-domain cooldowns keep a proxy away from
+a site that just blocked it and a minimum interval spaces out its requests there.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import random
+import time
+from typing import Callable, Dict, Any, Optional, Tuple, Type
+from .proxy_pool import ProxyPool, proxy_score
+
+logger = logging.getLogger(__name__)
+
+Availability = Callable[[Dict[str, Any]], bool]
+
+
+def normalize_domain(domain: Optional[str]) -> Optional[str]:
+    """'www.Amazon.com' and 'amazon.com' share one cooldown/rate state."""
+    if not domain:
+        return None
+    domain = domain.lower()
+    return domain[4:] if domain.startswith('www.') else domain
+
+
+class RotationStrategy(ABC):
+    """Picks one proxy from the pool among those `available` accepts."""
+
+    name = ""
+
+    @abstractmethod
+    def select(self, pool: ProxyPool, available: Availability) -> Optional[Dict[str, Any]]:
+        """The chosen proxy, or None if no proxy is available."""
+        pass
+
+
+class BestStrategy(RotationStrategy):
+    """Highest score; concentrates load on the top proxy."""
+
+    name = "best"
+
+    def select(self, pool: ProxyPool, available: Availability) -> Optional[Dict[str, Any]]:
+        best = pool.best()
+        if best is None or available(best):
+            return best
+        candidates = [proxy for proxy in pool.all() if available(proxy)]
+        return max(candidates, key=proxy_score) if candidates else None
+
+
+class RandomStrategy(RotationStrategy):
+    """Uniformly random."""
+
+    name = "random"
+
+    def select(self, pool: ProxyPool, available: Availability) -> Optional[Dict[str, Any]]:
+        # A few O(1) draws before paying for a filtered scan
+        for _ in range(3):
+            proxy = pool.random()
+            if proxy is None or available(proxy):
+                return proxy
+        candidates = [proxy for proxy in pool.all() if available(proxy)]
+        return random.choice(candidates) if candidates else None
+
+
+class RoundRobinStrategy(RotationStrategy):
+    """Each proxy in turn."""
+
+    name = "round-robin"
+
+    def __init__(self):
+        self._cursor = 0
+
+    def select(self, pool: ProxyPool, available: Availability) -> Optional[Dict[str, Any]]:
+        size = len(pool)
+        for _ in range(size):
+            proxy = pool.nth(self._cursor % size)
+            self._cursor = (self._cursor + 1) % size
+            if available(proxy):
+                return proxy
+        return None
+
+
+class WeightedStrategy(RotationStrategy):
+    """Random, weighted by score; good proxies get more traffic without taking all of it."""
+
+    name = "weighted"
+
+    def select(self, pool: ProxyPool, available: Availability) -> Optional[Dict[str, Any]]:
+        candidates = [proxy for proxy in pool.all() if available(proxy)]
+        if not candidates:
+            return None
+        # Scores can be negative (slow proxies); every proxy keeps a small share
+        weights = [max(proxy_score(proxy), 1.0) for proxy in candidates]
+        return random.choices(candidates, weights=weights, k=1)[0]
+
+
+ROTATION_STRATEGIES: Dict[str, Type[RotationStrategy]] = {}
+
+
+def register_strategy(strategy_class: Type[RotationStrategy]):
+    """Make a strategy selectable by its name."""
+    ROTATION_STRATEGIES[strategy_class.name] = strategy_class
+    return strategy_class
+
+
+for _strategy in (BestStrategy, RandomStrategy, RoundRobinStrategy, WeightedStrategy):
+    register_strategy(_strategy)
+
+
+class ProxyRotator:
+    """
+    Selects proxies with a named strategy, honoring per-domain state.
+
+    'sticky' keeps returning the proxy bound to a session (e.g. a run) while it
+    stays usable, picking a new one with the fallback strategy otherwise.
+
+    Provides:
+    - Cooldown of a proxy for one domain after it was blocked there
+    - Quarantine of a proxy for every domain after repeated bad outcomes
+    - A minimum interval between requests through one proxy to one domain
+    - Sticky session bindings that expire after a TTL
+    """
+
+    def __init__(
+        self,
+        pool: ProxyPool,
+        cooldown_seconds: Optional[float] = None,
+        min_interval_seconds: Optional[float] = None,
+        sticky_ttl_seconds: Optional[float] = None,
+        sticky_fallback: Optional[str] = None
+    ):
+        self.pool = pool
+        self.cooldown_seconds = cooldown_seconds or float(os.getenv('PROXY_DOMAIN_COOLDOWN_SECONDS', '300'))
+        self.min_interval_seconds = (
+            min_interval_seconds if min_interval_seconds is not None
+            else float(os.getenv('PROXY_DOMAIN_MIN_INTERVAL_SECONDS', '1'))
+        )
+        self.sticky_ttl_seconds = sticky_ttl_seconds or float(os.getenv('PROXY_STICKY_TTL_SECONDS', '1800'))
+        self.sticky_fallback = sticky_fallback or os.getenv('PROXY_STICKY_FALLBACK_STRATEGY', 'weighted')
+
+        self._strategies: Dict[str, RotationStrategy] = {}
+        # (domain, proxy_id) -> monotonic time
+        self._cooldowns: Dict[Tuple[str, str], float] = {}
+        self._last_use: Dict[Tuple[str, str], float] = {}
+        # proxy_id -> monotonic time; applies to every domain
+        self._quarantined: Dict[str, float] = {}
+        # session_id -> (proxy_id, last selected)
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+
+        self.selections: Dict[str, int] = {}
+        self.cooldowns_started = 0
+        self.rate_limited_fallbacks = 0
+
+    def _strategy(self, name: str) -> RotationStrategy:
+        if name not in self._strategies:
+            strategy_class = ROTATION_STRATEGIES.get(name)
+            if strategy_class is None:
+                logger.warning(f"Unknown proxy rotation strategy '{name}', using 'best'")
+                strategy_class = BestStrategy
+            self._strategies[name] = strategy_class()
+        return self._strategies[name]
+
+    def _cooling(self, domain: Optional[str], proxy_id: str, now: float) -> bool:
+        if self._quarantined:
+            until = self._quarantined.get(proxy_id)
+            if until is not None:
+                if until > now:
+                    return True
+                del self._quarantined[proxy_id]
+        if domain is None:
+            return False
+        until = self._cooldowns.get((domain, proxy_id))
+        if until is None:
+            return False
+        if until <= now:
+            del self._cooldowns[(domain, proxy_id)]
+            return False
+        return True
+
+    def _too_soon(self, domain: Optional[str], proxy_id: str, now: float) -> bool:
+        if domain is None or self.min_interval_seconds <= 0:
+            return False
+        last = self._last_use.get((domain, proxy_id))
+        return last is not None and now - last < self.min_interval_seconds
+
+    def select(
+        self,
+        strategy: str = "best",
+        session_id: Optional[str] = None,
+        domain: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Pick a proxy, optionally for a session and a target domain."""
+        domain = normalize_domain(domain)
+        now = time.monotonic()
+
+        if strategy == "sticky":
+            bound = self._sessions.get(session_id) if session_id else None
+            if bound:
+                proxy = self.pool.get(bound[0])
+                if proxy is not None and not self._cooling(domain, bound[0], now):
+                    return self._selected(proxy, "sticky", session_id, domain, now)
+            base = self._strategy(self.sticky_fallback)
+        else:
+            base = self._strategy(strategy)
+
+        proxy = base.select(
+            self.pool,
+            lambda p: not self._cooling(domain, p['id'], now) and not self._too_soon(domain, p['id'], now)
+        )
+        if proxy is None and domain is not None:
+            # Spacing is a soft limit; going over it beats going without a proxy
+            proxy = base.select(self.pool, lambda p: not self._cooling(domain, p['id'], now))
+            if proxy is not None:
+                self.rate_limited_fallbacks += 1
+        if proxy is None and domain is not None and len(self.pool):
+            # Everything is cooling down for this domain; use whichever is released first
+            cooling = [p for p in self.pool.all() if (domain, p['id']) in self._cooldowns]
+            if cooling:
+                proxy = min(cooling, key=lambda p: self._cooldowns[(domain, p['id'])])
+                logger.warning(f"All proxies are cooling down for {domain}")
+        if proxy is None:
+            return None
+        return self._selected(proxy, strategy, session_id, domain, now)
+
+    def _selected(
+        self,
+        proxy: Dict[str, Any],
+        strategy: str,
+        session_id: Optional[str],
+        domain: Optional[str],
+        now: float
+    ) -> Dict[str, Any]:
+        self.selections[strategy] = self.selections.get(strategy, 0) + 1
+        if domain is not None:
+            self._last_use[(domain, proxy['id'])] = now
+            if len(self._last_use) > 10000:
+                self._prune(now)
+        if strategy == "sticky" and session_id:
+            if session_id not in self._sessions:
+                self._prune_sessions(now)
+            self._sessions[session_id] = (proxy['id'], now)
+        return proxy
+
+    def _prune_sessions(self, now: float):
+        expired = [
+            session_id for session_id, (_, last) in self._sessions.items()
+            if now - last > self.sticky_ttl_seconds
+        ]
+        for session_id in expired:
+            del self._sessions[session_id]
+
+    def _prune(self, now: float):
+        for key in [key for key, until in self._cooldowns.items() if until <= now]:
+            del self._cooldowns[key]
+        for proxy_id in [proxy_id for proxy_id, until in self._quarantined.items() if until <= now]:
+            del self._quarantined[proxy_id]
+        # Interval tracking only matters within the interval
+        for key in [key for key, last in self._last_use.items() if now - last > self.min_interval_seconds]:
+            del self._last_use[key]
+
+    def cool_down(self, proxy_id: str, domain: str, seconds: Optional[float] = None):
+        """Keep a proxy away from a domain that blocked it."""
+        domain = normalize_domain(domain)
+        if not domain:
+            return
+        self._cooldowns[(domain, proxy_id)] = time.monotonic() + (seconds or self.cooldown_seconds)
+        self.cooldowns_started += 1
+        # A sticky session bound to this proxy moves on at its next selection
+        logger.info(f"Proxy {proxy_id} cooling down for {domain} ({seconds or self.cooldown_seconds:.0f}s)")
+
+    def quarantine(self, proxy_id: str, seconds: float):
+        """Keep a proxy out of rotation for every domain."""
+        self._quarantined[proxy_id] = time.monotonic() + seconds
+
+    def is_quarantined(self, proxy_id: str) -> bool:
+        return self._cooling(None, proxy_id, time.monotonic())
+
+    def release_session(self, session_id: str):
+        """Forget a finished session's proxy binding."""
+        self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get selections per strategy, active cooldowns per domain and session count."""
+        self._prune(time.monotonic())
+        cooling: Dict[str, int] = {}
+        for domain, _ in self._cooldowns:
+            cooling[domain] = cooling.get(domain, 0) + 1
+        return {
+            "strategies": sorted(list(ROTATION_STRATEGIES) + ["sticky"]),
+            "selections": dict(self.selections),
+            "cooling_down": {domain.replace('.', '_'): count for domain, count in cooling.items()},
+            "cooldowns_started": self.cooldowns_started,
+            "quarantined": len(self._quarantined),
+            "rate_limited_fallbacks": self.rate_limited_fallbacks,
+            "sticky_sessions": len(self._sessions)
+        }
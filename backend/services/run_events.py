@@ -0,0 +1,78 @@
+"""
+Run Event Bus for live run streaming.
+In-process pub/sub that fans out status transitions, progress messages and
+newly persisted dataset items from running jobs to connected subscribers.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Any, Set, Optional
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class RunEventBus:
+    """Fans out run events to per-subscriber bounded queues."""
+
+    def __init__(self, max_queue_size: Optional[int] = None):
+        self.max_queue_size = max_queue_size or int(os.getenv('RUN_EVENT_QUEUE_SIZE', '1000'))
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, run_id: str) -> asyncio.Queue:
+        """Register a subscriber for a run's events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue):
+        """Remove a subscriber."""
+        subscribers = self._subscribers.get(run_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[run_id]
+
+    def has_subscribers(self, run_id: str) -> bool:
+        """Check if anyone is listening, so publishers can skip building payloads."""
+        return run_id in self._subscribers
+
+    def publish(self, run_id: str, event: str, data: Any):
+        """
+        Deliver an event to every subscriber of a run without blocking the publisher.
+        A subscriber that falls behind loses its oldest events rather than stalling the run.
+        """
+        subscribers = self._subscribers.get(run_id)
+        if not subscribers:
+            return
+
+        message = {
+            "event": event,
+            "data": data,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        for queue in subscribers:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                logger.debug(f"Run {run_id}: slow event subscriber, dropped oldest event")
+            queue.put_nowait(message)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber counts."""
+        return {
+            "runs_with_subscribers": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values())
+        }
+
+
+# Global event bus instance
+run_event_bus = RunEventBus()
+
+def get_run_event_bus() -> RunEventBus:
+    """Get the global run event bus instance."""
+    return run_event_bus
@@ -0,0 +1,148 @@
+"""
+Run Log Sink for buffered run progress logs.
+Progress messages are coalesced and written to the run_logs collection in
+segments (one document per flush), keeping the runs collection small.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_run_log_indexes(db):
+    """Create the index used to page through a run's log segments."""
+    await db.run_logs.create_index([("run_id", 1), ("seq_start", 1)])
+
+
+async def get_run_logs(db, run_id: str, after: int = -1, limit: int = 200) -> List[Dict[str, Any]]:
+    """
+    Read log lines for a run in order.
+
+    Args:
+        after: Return lines with a sequence number greater than this (-1 for the beginning)
+        limit: Maximum number of lines to return
+    """
+    lines: List[Dict[str, Any]] = []
+    cursor = db.run_logs.find(
+        {"run_id": run_id, "seq_end": {"$gt": after}},
+        {"_id": 0, "lines": 1}
+    ).sort("seq_start", 1)
+
+    async for segment in cursor:
+        for line in segment['lines']:
+            if line['seq'] > after:
+                lines.append(line)
+                if len(lines) >= limit:
+                    return lines
+    return lines
+
+
+async def get_run_log_tail(db, run_id: str, tail: int) -> List[Dict[str, Any]]:
+    """Read the last `tail` log lines for a run."""
+    lines: List[Dict[str, Any]] = []
+    cursor = db.run_logs.find({"run_id": run_id}, {"_id": 0, "lines": 1}).sort("seq_start", -1)
+
+    async for segment in cursor:
+        lines[:0] = segment['lines']
+        if len(lines) >= tail:
+            break
+    return lines[-tail:] if tail > 0 else []
+
+
+class RunLogSink:
+    """Buffers progress messages for a run and flushes them every N ms or M lines."""
+
+    def __init__(
+        self,
+        db,
+        run_id: str,
+        flush_interval_ms: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        max_run_lines: Optional[int] = None
+    ):
+        self.db = db
+        self.run_id = run_id
+        self.flush_interval = (flush_interval_ms or int(os.getenv('RUN_LOG_FLUSH_INTERVAL_MS', '1000'))) / 1000
+        self.max_lines = max_lines or int(os.getenv('RUN_LOG_FLUSH_LINES', '50'))
+        # Lines kept per run; anything past this is counted and dropped
+        self.max_run_lines = max_run_lines or int(os.getenv('RUN_LOG_MAX_LINES', '10000'))
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._next_seq: Optional[int] = None
+
+        self.total_lines = 0
+        self.dropped_lines = 0
+
+    async def add(self, message: str):
+        """Buffer a log line, flushing when the line threshold is reached."""
+        if self.total_lines >= self.max_run_lines:
+            self.dropped_lines += 1
+            return
+
+        self._buffer.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "message": message
+        })
+        self.total_lines += 1
+
+        if len(self._buffer) >= self.max_lines:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        # Shielded so close() cannot cancel a segment that is already being written
+        await asyncio.shield(self.flush())
+
+    async def _load_next_seq(self) -> int:
+        """Continue numbering after any lines already stored (e.g. a re-claimed run)."""
+        last = await self.db.run_logs.find_one(
+            {"run_id": self.run_id},
+            {"_id": 0, "seq_end": 1},
+            sort=[("seq_end", -1)]
+        )
+        return last['seq_end'] + 1 if last else 0
+
+    async def flush(self):
+        """Write buffered lines as one segment."""
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, []
+            try:
+                if self._next_seq is None:
+                    self._next_seq = await self._load_next_seq()
+
+                for offset, line in enumerate(batch):
+                    line['seq'] = self._next_seq + offset
+
+                await self.db.run_logs.insert_one({
+                    "run_id": self.run_id,
+                    "seq_start": batch[0]['seq'],
+                    "seq_end": batch[-1]['seq'],
+                    "lines": batch,
+                    "created_at": datetime.now(timezone.utc)
+                })
+                self._next_seq += len(batch)
+            except Exception as e:
+                logger.error(f"Run {self.run_id}: failed to write {len(batch)} log lines: {str(e)}")
+
+    async def close(self):
+        """Flush remaining lines and stop the flush timer."""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+
+        if self.dropped_lines:
+            self._buffer.append({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "message": f"{self.dropped_lines} log lines dropped (limit of {self.max_run_lines} lines per run)"
+            })
+        await self.flush()
@@ -0,0 +1,155 @@
+"""
+Run Queue for distributed run execution.
+The API process enqueues runs into the run_queue collection; scraper workers
+claim them with atomic find_one_and_update leases that they keep alive with
+heartbeats. Runs whose lease expires (worker died) are re-claimed by another
+worker.
+"""
+
+import logging
+import os
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone, timedelta
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+
+class RunQueue:
+    """Mongo-backed queue of runs waiting for a scraper worker."""
+
+    def __init__(self, db, lease_seconds: Optional[int] = None, max_attempts: Optional[int] = None):
+        self.db = db
+        self.collection = db.run_queue
+        self.lease_seconds = lease_seconds or int(os.getenv('RUN_LEASE_SECONDS', '60'))
+        self.max_attempts = max_attempts or int(os.getenv('RUN_MAX_ATTEMPTS', '3'))
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        """Create the indexes used for claiming and lookups."""
+        if self._indexes_ready:
+            return
+        await self.collection.create_index("run_id", unique=True)
+        await self.collection.create_index([("status", 1), ("priority", 1), ("created_at", 1)])
+        await self.collection.create_index("lease_expires_at")
+        self._indexes_ready = True
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+
+    async def enqueue(
+        self,
+        run_id: str,
+        actor_id: str,
+        user_id: str,
+        input_data: Dict[str, Any],
+        priority: int
+    ):
+        """Add a run to the queue for any worker to pick up."""
+        await self.ensure_indexes()
+        await self.collection.insert_one({
+            "run_id": run_id,
+            "actor_id": actor_id,
+            "user_id": user_id,
+            "input_data": input_data,
+            "priority": priority,
+            "status": "pending",  # pending, leased
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "attempts": 0,
+            "cancel_requested": False,
+            "created_at": datetime.now(timezone.utc)
+        })
+        logger.info(f"Enqueued run {run_id} for distributed execution (priority {priority})")
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically lease the next pending run, or a run whose lease has expired.
+
+        Returns:
+            The queue entry (with incremented attempts) or None if nothing is claimable
+        """
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {
+                "cancel_requested": False,
+                "$or": [
+                    {"status": "pending"},
+                    {"status": "leased", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "leased",
+                    "lease_owner": worker_id,
+                    "lease_expires_at": self._lease_deadline(),
+                    "claimed_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("priority", 1), ("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, run_id: str, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Extend a lease held by this worker.
+
+        Returns:
+            The entry (including cancel_requested) or None if the lease was lost
+        """
+        return await self.collection.find_one_and_update(
+            {"run_id": run_id, "lease_owner": worker_id, "status": "leased"},
+            {"$set": {"lease_expires_at": self._lease_deadline()}},
+            projection={"_id": 0, "run_id": 1, "cancel_requested": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def complete(self, run_id: str, worker_id: str):
+        """Remove a finished (or cancelled) run from the queue."""
+        await self.collection.delete_one({"run_id": run_id, "lease_owner": worker_id})
+
+    async def release(self, run_id: str, worker_id: str):
+        """Hand a run back to the queue (graceful worker shutdown) without counting the attempt."""
+        await self.collection.update_one(
+            {"run_id": run_id, "lease_owner": worker_id},
+            {
+                "$set": {"status": "pending", "lease_owner": None, "lease_expires_at": None, "released": True},
+                "$inc": {"attempts": -1}
+            }
+        )
+
+    async def request_cancel(self, run_id: str) -> bool:
+        """
+        Cancel a run on whichever node holds it.
+        Unleased (or abandoned) entries are removed directly; live leases are flagged
+        and the owning worker cancels the run on its next heartbeat.
+
+        Returns:
+            True if the run was in the queue
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.collection.delete_one({
+            "run_id": run_id,
+            "$or": [
+                {"status": "pending"},
+                {"lease_expires_at": {"$lt": now}}
+            ]
+        })
+        if result.deleted_count:
+            return True
+
+        result = await self.collection.update_one(
+            {"run_id": run_id, "status": "leased"},
+            {"$set": {"cancel_requested": True}}
+        )
+        return result.matched_count > 0
+
+    async def purge_abandoned(self) -> int:
+        """Delete cancelled entries whose owning worker died before acknowledging."""
+        result = await self.collection.delete_many({
+            "cancel_requested": True,
+            "lease_expires_at": {"$lt": datetime.now(timezone.utc)}
+        })
+        return result.deleted_count
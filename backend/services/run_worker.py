@@ -0,0 +1,161 @@
+"""
+Run Worker for distributed run execution.
+Claims runs from the RunQueue, executes them with a bounded local pool, and
+keeps their leases alive. Cancellation requested from any node is picked up
+on the next heartbeat.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Dict, Any, Optional, Callable
+from datetime import datetime, timezone
+from .run_queue import RunQueue
+
+logger = logging.getLogger(__name__)
+
+
+class RunWorker:
+    """Executes queued runs on this node."""
+
+    def __init__(
+        self,
+        db,
+        run_queue: RunQueue,
+        execute_job: Callable,
+        max_concurrent: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        self.db = db
+        self.run_queue = run_queue
+        self.execute_job = execute_job
+        self.max_concurrent = max_concurrent or int(os.getenv('MAX_CONCURRENT_RUNS', '4'))
+        self.poll_interval = poll_interval or float(os.getenv('WORKER_POLL_INTERVAL', '2'))
+        self.heartbeat_interval = heartbeat_interval or float(
+            os.getenv('WORKER_HEARTBEAT_INTERVAL', str(max(run_queue.lease_seconds / 3, 1)))
+        )
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # run_id -> why we cancelled it ("abort" or "lease_lost")
+        self._cancel_reasons: Dict[str, str] = {}
+        self._slot_freed = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop claiming new runs and shut down."""
+        self._stopping.set()
+        self._slot_freed.set()
+
+    async def run(self):
+        """Claim and execute runs until stop() is called."""
+        await self.run_queue.ensure_indexes()
+        logger.info(f"🛠️ Worker {self.worker_id} started (max {self.max_concurrent} concurrent runs)")
+
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while not self._stopping.is_set():
+                while len(self.tasks) < self.max_concurrent and not self._stopping.is_set():
+                    entry = await self.run_queue.claim(self.worker_id)
+                    if entry is None:
+                        break
+                    await self._start(entry)
+
+                self._slot_freed.clear()
+                try:
+                    await asyncio.wait_for(self._slot_freed.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            heartbeat_task.cancel()
+            await self._shutdown()
+
+    async def _start(self, entry: Dict[str, Any]):
+        run_id = entry['run_id']
+
+        if entry['attempts'] > self.run_queue.max_attempts:
+            logger.error(f"Run {run_id} exceeded {self.run_queue.max_attempts} attempts, marking failed")
+            await self.db.runs.update_one(
+                {"id": run_id},
+                {"$set": {
+                    "status": "failed",
+                    "finished_at": datetime.now(timezone.utc).isoformat(),
+                    "error_message": "Run was interrupted too many times"
+                }}
+            )
+            await self.run_queue.complete(run_id, self.worker_id)
+            return
+
+        task = asyncio.create_task(self._execute(entry))
+        self.tasks[run_id] = task
+        task.add_done_callback(lambda t, run_id=run_id: self._task_done(run_id))
+        logger.info(f"Worker {self.worker_id} claimed run {run_id} (attempt {entry['attempts']})")
+
+    async def _execute(self, entry: Dict[str, Any]):
+        run_id = entry['run_id']
+
+        if entry['attempts'] > 1 or entry.get('released'):
+            # A previous worker started this run; start the dataset over
+            await self.db.dataset_items.delete_many({"run_id": run_id})
+            logger.info(f"Resuming run {run_id}, cleared partial dataset items")
+
+        interrupted = False
+        try:
+            # A worker that lost the lease must not write into the new owner's dataset
+            await self.execute_job(
+                run_id,
+                entry['actor_id'],
+                entry['user_id'],
+                entry['input_data'],
+                owns_run=lambda: self._cancel_reasons.get(run_id) != "lease_lost"
+            )
+        except asyncio.CancelledError:
+            interrupted = True
+            raise
+        finally:
+            reason = self._cancel_reasons.pop(run_id, None)
+            if reason == "lease_lost":
+                pass  # Another worker owns the run now
+            elif interrupted and reason is None:
+                # Worker shutdown: let another worker pick the run up right away
+                await self.run_queue.release(run_id, self.worker_id)
+            else:
+                await self.run_queue.complete(run_id, self.worker_id)
+
+    def _task_done(self, run_id: str):
+        self.tasks.pop(run_id, None)
+        self._slot_freed.set()
+
+    async def _heartbeat_loop(self):
+        """Extend leases for running runs and apply cross-node cancellation."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                for run_id, task in list(self.tasks.items()):
+                    entry = await self.run_queue.heartbeat(run_id, self.worker_id)
+                    if entry is None:
+                        logger.warning(f"Lost lease on run {run_id}, cancelling local execution")
+                        self._cancel_reasons[run_id] = "lease_lost"
+                        task.cancel()
+                    elif entry.get('cancel_requested'):
+                        logger.info(f"Cancellation requested for run {run_id}")
+                        self._cancel_reasons[run_id] = "abort"
+                        task.cancel()
+
+                await self.run_queue.purge_abandoned()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker heartbeat failed: {str(e)}")
+
+    async def _shutdown(self):
+        """Cancel in-flight runs and hand them back to the queue for other workers."""
+        if self.tasks:
+            logger.info(f"Worker {self.worker_id} releasing {len(self.tasks)} in-flight runs")
+        for task in list(self.tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        logger.info(f"Worker {self.worker_id} stopped")
@@ -161,6 +161,8 @@ class SchedulerService:
             # Import Run model here to avoid circular imports
             from models import Run
             
+            schedule = await self.db.schedules.find_one({"id": schedule_id}, {"_id": 0, "delta_mode": 1})
+            
             # Create run
             run = Run(
                 user_id=user_id,
@@ -169,7 +171,9 @@ class SchedulerService:
                 actor_icon=actor.get('icon'),
                 input_data=input_data,
                 status="queued",
-                origin="Scheduler"
+                origin="Scheduler",
+                schedule_id=schedule_id,
+                delta_mode=bool(schedule and schedule.get('delta_mode'))
             )
             
             # Save run to database
@@ -179,25 +183,22 @@ class SchedulerService:
             
             logger.info(f"✅ Created scheduled run {run.id} for schedule {schedule_id}")
             
-            # Import task manager and execute function
-            from services.task_manager import task_manager
-            from routes.routes import execute_scraping_job
+            # Import dispatcher (local task manager or distributed queue)
+            from routes.routes import dispatch_run
             
-            # Start the scraping task
-            await task_manager.start_task(
+            # Queue the scraping task behind interactive runs
+            await dispatch_run(
                 run.id,
-                execute_scraping_job(
-                    run.id,
-                    actor_id,
-                    user_id,
-                    input_data
-                )
+                actor_id,
+                user_id,
+                input_data,
+                origin=run.origin
             )
             
             # Update schedule with last run info
             await self._update_schedule_status(schedule_id, "success", run.id)
             
-            logger.info(f"✅ Scheduled run {run.id} started successfully")
+            logger.info(f"✅ Scheduled run {run.id} queued successfully")
             
         except Exception as e:
             logger.error(f"❌ Failed to execute scheduled run for {schedule_id}: {str(e)}")
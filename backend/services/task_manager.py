@@ -1,107 +1,298 @@
 """
 Task Manager for handling parallel scraping jobs.
-Allows multiple scraping runs to execute concurrently.
+Runs are queued and executed by a bounded worker pool, with interactive runs
+ahead of scheduled ones and fair sharing of worker slots between users.
 """
 
 import asyncio
 import logging
-from typing import Dict, Set
+import os
+from collections import OrderedDict, deque
+from typing import Dict, Set, List, Optional, Deque
 from datetime import datetime, timezone
+from pymongo import UpdateOne
 
 logger = logging.getLogger(__name__)
 
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SCHEDULED = 10
+
+
+def priority_for_origin(origin: str) -> int:
+    """Map a run origin to its queue priority. Scheduler-origin runs yield to everything else."""
+    return PRIORITY_SCHEDULED if origin == "Scheduler" else PRIORITY_INTERACTIVE
+
+
+class QueuedTask:
+    """A run waiting for a worker slot."""
+
+    def __init__(self, run_id: str, coroutine, user_id: Optional[str], priority: int):
+        self.run_id = run_id
+        self.coroutine = coroutine
+        self.user_id = user_id or "anonymous"
+        self.priority = priority
+        self.queued_at = datetime.now(timezone.utc)
+
+
 class TaskManager:
     """Manages concurrent scraping tasks."""
-    
-    def __init__(self):
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        self.db = None
+        # Set in distributed mode so cancellation reaches runs held by other nodes
+        self.run_queue = None
+        self.max_concurrent = max_concurrent or int(os.getenv('MAX_CONCURRENT_RUNS', '4'))
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.task_locks: Set[str] = set()
-    
+
+        # priority -> user_id -> FIFO of that user's queued runs
+        self._queues: Dict[int, "OrderedDict[str, Deque[QueuedTask]]"] = {}
+        self._running_per_user: Dict[str, int] = {}
+        self._task_users: Dict[str, str] = {}
+
+        # Last queue positions written to the runs collection
+        self._published_positions: Dict[str, int] = {}
+        self._positions_dirty = False
+        self._publish_task: Optional[asyncio.Task] = None
+
+    def attach_db(self, db):
+        """Attach the database used to report queue positions on run records."""
+        self.db = db
+
+    def attach_run_queue(self, run_queue):
+        """Attach the distributed run queue used when runs execute on worker nodes."""
+        self.run_queue = run_queue
+
     def is_running(self, run_id: str) -> bool:
         """Check if a task is currently running."""
         return run_id in self.running_tasks and not self.running_tasks[run_id].done()
-    
+
+    def is_queued(self, run_id: str) -> bool:
+        """Check if a task is waiting for a worker slot."""
+        return run_id in self.task_locks and run_id not in self.running_tasks
+
     def get_running_count(self) -> int:
         """Get count of currently running tasks."""
         # Clean up completed tasks
         self._cleanup_completed()
         return len(self.running_tasks)
-    
+
+    def get_queued_count(self) -> int:
+        """Get count of tasks waiting for a worker slot."""
+        return sum(len(q) for users in self._queues.values() for q in users.values())
+
     def _cleanup_completed(self):
         """Remove completed tasks from tracking."""
         completed = [run_id for run_id, task in self.running_tasks.items() if task.done()]
         for run_id in completed:
             del self.running_tasks[run_id]
             self.task_locks.discard(run_id)
-    
-    async def start_task(self, run_id: str, coroutine):
+
+    async def start_task(
+        self,
+        run_id: str,
+        coroutine,
+        user_id: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ):
         """
-        Start a new task in the background.
-        
+        Queue a new task for background execution.
+
         Args:
             run_id: Unique identifier for the run
             coroutine: Async function to execute
+            user_id: Owner of the run, used for fair sharing of worker slots
+            priority: Queue priority (PRIORITY_INTERACTIVE or PRIORITY_SCHEDULED)
         """
         if run_id in self.task_locks:
             logger.warning(f"Task {run_id} is already running")
+            coroutine.close()
             return
-        
-        # Mark as running
+
+        # Mark as queued/running
         self.task_locks.add(run_id)
-        
-        # Create and start task
-        task = asyncio.create_task(coroutine)
-        self.running_tasks[run_id] = task
-        
-        logger.info(f"Started task {run_id}. Total running: {self.get_running_count()}")
-        
-        # Add callback to cleanup when done
-        task.add_done_callback(lambda t: self._task_completed(run_id, t))
-    
+
+        entry = QueuedTask(run_id, coroutine, user_id, priority)
+        users = self._queues.setdefault(priority, OrderedDict())
+        users.setdefault(entry.user_id, deque()).append(entry)
+
+        logger.info(f"Queued task {run_id} (priority {priority}, user {entry.user_id}). Queued: {self.get_queued_count()}")
+
+        self._dispatch()
+        self._schedule_position_update()
+
+    def _next_entry(self) -> Optional[QueuedTask]:
+        """Pop the next task: highest priority first, then the user with the fewest running tasks."""
+        for priority in sorted(self._queues):
+            users = self._queues[priority]
+            if not users:
+                continue
+
+            # min() keeps OrderedDict order on ties, which rotates users round-robin
+            user_id = min(users, key=lambda u: self._running_per_user.get(u, 0))
+            entry = users[user_id].popleft()
+            if users[user_id]:
+                users.move_to_end(user_id)
+            else:
+                del users[user_id]
+            return entry
+        return None
+
+    def _dispatch(self):
+        """Start queued tasks while worker slots are free."""
+        self._cleanup_completed()
+        while len(self.running_tasks) < self.max_concurrent:
+            entry = self._next_entry()
+            if entry is None:
+                break
+
+            task = asyncio.create_task(entry.coroutine)
+            self.running_tasks[entry.run_id] = task
+            self._task_users[entry.run_id] = entry.user_id
+            self._running_per_user[entry.user_id] = self._running_per_user.get(entry.user_id, 0) + 1
+
+            logger.info(f"Started task {entry.run_id}. Total running: {len(self.running_tasks)}/{self.max_concurrent}")
+
+            # Add callback to cleanup when done
+            task.add_done_callback(lambda t, run_id=entry.run_id: self._task_completed(run_id, t))
+
     def _task_completed(self, run_id: str, task: asyncio.Task):
         """Callback when a task completes."""
         self.task_locks.discard(run_id)
-        
-        if task.exception():
+
+        user_id = self._task_users.pop(run_id, None)
+        if user_id is not None:
+            self._running_per_user[user_id] -= 1
+            if self._running_per_user[user_id] <= 0:
+                del self._running_per_user[user_id]
+
+        if task.cancelled():
+            logger.info(f"Task {run_id} cancelled")
+        elif task.exception():
             logger.error(f"Task {run_id} failed with exception: {task.exception()}")
         else:
             logger.info(f"Task {run_id} completed successfully")
-        
+
         # Clean up
         if run_id in self.running_tasks:
             del self.running_tasks[run_id]
-    
+
+        # Hand the freed slot to the next queued run
+        self._dispatch()
+        self._schedule_position_update()
+
+    def _remove_queued(self, run_id: str) -> bool:
+        """Remove a run from the queue without starting it."""
+        for users in self._queues.values():
+            for user_id, queue in list(users.items()):
+                for entry in queue:
+                    if entry.run_id == run_id:
+                        queue.remove(entry)
+                        if not queue:
+                            del users[user_id]
+                        entry.coroutine.close()
+                        self.task_locks.discard(run_id)
+                        return True
+        return False
+
     async def cancel_task(self, run_id: str) -> bool:
         """
-        Cancel a running task.
-        
+        Cancel a queued or running task, on this node or (in distributed mode) on a worker node.
+
         Args:
             run_id: Task identifier
-            
+
         Returns:
             True if task was cancelled, False if not found or already completed
         """
+        if self._remove_queued(run_id):
+            logger.info(f"Task {run_id} removed from queue")
+            self._schedule_position_update()
+            return True
+
         if run_id not in self.running_tasks:
+            if self.run_queue is not None:
+                return await self.run_queue.request_cancel(run_id)
             return False
-        
+
         task = self.running_tasks[run_id]
         if task.done():
             return False
-        
+
         task.cancel()
         try:
             await task
         except asyncio.CancelledError:
             logger.info(f"Task {run_id} cancelled")
-        
+
         return True
-    
+
+    def get_queue_order(self) -> List[str]:
+        """Return queued run IDs in the order they would be dispatched."""
+        queues = {
+            priority: OrderedDict((u, deque(q)) for u, q in users.items())
+            for priority, users in self._queues.items()
+        }
+        running = dict(self._running_per_user)
+        order = []
+
+        for priority in sorted(queues):
+            users = queues[priority]
+            while users:
+                user_id = min(users, key=lambda u: running.get(u, 0))
+                entry = users[user_id].popleft()
+                order.append(entry.run_id)
+                running[user_id] = running.get(user_id, 0) + 1
+                if users[user_id]:
+                    users.move_to_end(user_id)
+                else:
+                    del users[user_id]
+
+        return order
+
+    def _schedule_position_update(self):
+        """Coalesce queue position writes into a single background update."""
+        if self.db is None:
+            return
+        self._positions_dirty = True
+        if self._publish_task is None or self._publish_task.done():
+            self._publish_task = asyncio.create_task(self._publish_queue_positions())
+
+    async def _publish_queue_positions(self):
+        """Write 1-based queue positions onto queued run records, clearing them once dispatched."""
+        while self._positions_dirty:
+            self._positions_dirty = False
+            positions = {run_id: index + 1 for index, run_id in enumerate(self.get_queue_order())}
+
+            operations = [
+                UpdateOne({"id": run_id, "status": "queued"}, {"$set": {"queue_position": position}})
+                for run_id, position in positions.items()
+                if self._published_positions.get(run_id) != position
+            ]
+            operations.extend(
+                UpdateOne({"id": run_id}, {"$set": {"queue_position": None}})
+                for run_id in self._published_positions
+                if run_id not in positions
+            )
+
+            if operations:
+                try:
+                    await self.db.runs.bulk_write(operations, ordered=False)
+                except Exception as e:
+                    logger.error(f"Failed to update queue positions: {str(e)}")
+
+            self._published_positions = positions
+
     def get_status(self) -> Dict:
         """Get current status of task manager."""
         self._cleanup_completed()
         return {
             "running_tasks": len(self.running_tasks),
-            "task_ids": list(self.running_tasks.keys())
+            "max_concurrent": self.max_concurrent,
+            "queued_tasks": self.get_queued_count(),
+            "task_ids": list(self.running_tasks.keys()),
+            "queued_task_ids": self.get_queue_order()
         }
 
 # Global task manager instance
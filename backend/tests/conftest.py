@@ -0,0 +1,233 @@
+"""
+Shared fixtures for the backend unit tests.
+FakeDB is a small in-memory stand-in for the Motor database, covering the
+queries and writes the services under test issue; run from the backend
+directory with: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_MISSING = object()
+
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and any(key.startswith('$') for key in condition):
+        for operator, operand in condition.items():
+            present = value is not _MISSING
+            if operator == '$exists':
+                if present != bool(operand):
+                    return False
+            elif operator == '$in':
+                if not present or value not in operand:
+                    return False
+            elif operator in ('$gt', '$gte', '$lt', '$lte'):
+                if not present or value is None:
+                    return False
+                if operator == '$gt' and not value > operand:
+                    return False
+                if operator == '$gte' and not value >= operand:
+                    return False
+                if operator == '$lt' and not value < operand:
+                    return False
+                if operator == '$lte' and not value <= operand:
+                    return False
+            else:
+                raise NotImplementedError(operator)
+        return True
+    if condition is None:
+        return value is _MISSING or value is None
+    return value is not _MISSING and value == condition
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == '$or':
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif not _matches_condition(_get(doc, key), condition):
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    doc = {k: v for k, v in doc.items() if k != '_id'}
+    if not projection:
+        return dict(doc)
+    included = [k for k, v in projection.items() if v and k != '_id']
+    if included:
+        return {k: doc[k] for k in included if k in doc}
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+
+def _sort_key(field: str):
+    def key(doc):
+        value = doc.get(field)
+        # None sorts first, as in Mongo
+        return (value is not None, value if value is not None else 0)
+    return key
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]], projection: Optional[Dict[str, Any]]):
+        self._docs = docs
+        self._projection = projection
+        self._limit = 0
+
+    def sort(self, field, direction: int = 1):
+        if isinstance(field, list):
+            field, direction = field[0]
+        self._docs = sorted(self._docs, key=_sort_key(field), reverse=direction < 0)
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        docs = self._docs[:self._limit] if self._limit else self._docs
+        for doc in docs:
+            yield _project(doc, self._projection)
+
+
+class FakeResult:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs: List[Dict[str, Any]] = []
+        # Field tuples that must be unique, as with a unique index
+        self.unique: List[tuple] = []
+        self.bulk_writes = 0
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None):
+        return FakeCursor([doc for doc in self.docs if matches(doc, query or {})], projection)
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        cursor = self.find(query, projection)
+        if sort:
+            cursor.sort(sort)
+        async for doc in cursor:
+            return doc
+        return None
+
+    async def count_documents(self, query):
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    def _violates_unique(self, doc: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None) -> bool:
+        for fields in self.unique:
+            key = tuple(doc.get(field) for field in fields)
+            if any(
+                other is not ignore and tuple(other.get(field) for field in fields) == key
+                for other in self.docs
+            ):
+                return True
+        return False
+
+    async def insert_one(self, doc: Dict[str, Any]):
+        self.docs.append(dict(doc))
+        return FakeResult(inserted_id=len(self.docs))
+
+    async def insert_many(self, docs: List[Dict[str, Any]], ordered: bool = True):
+        for doc in docs:
+            self.docs.append(dict(doc))
+        return FakeResult(inserted_ids=list(range(len(docs))))
+
+    def _apply_update(self, doc: Dict[str, Any], update: Dict[str, Any], inserting: bool):
+        for field, value in update.get('$set', {}).items():
+            doc[field] = value
+        if inserting:
+            for field, value in update.get('$setOnInsert', {}).items():
+                doc[field] = value
+        for field, value in update.get('$inc', {}).items():
+            doc[field] = doc.get(field, 0) + value
+
+    def _update(self, query, update, upsert: bool) -> Dict[str, int]:
+        for doc in self.docs:
+            if matches(doc, query):
+                self._apply_update(doc, update, inserting=False)
+                return {"matched": 1, "upserted": 0}
+        if not upsert:
+            return {"matched": 0, "upserted": 0}
+        doc = {k: v for k, v in query.items() if not k.startswith('$') and not isinstance(v, dict)}
+        self._apply_update(doc, update, inserting=True)
+        if self._violates_unique(doc):
+            raise KeyError("duplicate key")
+        self.docs.append(doc)
+        return {"matched": 0, "upserted": 1}
+
+    async def update_one(self, query, update, upsert: bool = False):
+        result = self._update(query, update, upsert)
+        return FakeResult(matched_count=result["matched"], upserted_count=result["upserted"])
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+        return FakeResult(deleted_count=before - len(self.docs))
+
+    async def bulk_write(self, operations, ordered: bool = True):
+        self.bulk_writes += 1
+        upserted = 0
+        errors = []
+        for index, op in enumerate(operations):
+            if isinstance(op, UpdateOne):
+                try:
+                    upserted += self._update(op._filter, op._doc, op._upsert)["upserted"]
+                except KeyError:
+                    errors.append({"index": index, "code": 11000})
+            elif isinstance(op, DeleteOne):
+                for doc in self.docs:
+                    if matches(doc, op._filter):
+                        self.docs.remove(doc)
+                        break
+            elif isinstance(op, InsertOne):
+                self.docs.append(dict(op._doc))
+            else:
+                raise NotImplementedError(type(op))
+        if errors:
+            raise BulkWriteError({"nUpserted": upserted, "writeErrors": errors})
+        return FakeResult(upserted_count=upserted)
+
+
+class FakeDB:
+    """Collections are created on first access, like Motor's."""
+
+    def __init__(self):
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self._collections:
+            self._collections[name] = FakeCollection()
+        return self._collections[name]
+
+
+@pytest.fixture
+def db():
+    return FakeDB()
@@ -0,0 +1,107 @@
+"""Tests for the AIMD per-domain concurrency limiter."""
+
+import asyncio
+
+from scrapers.adaptive_concurrency import AdaptiveLimiter, ConcurrencyController
+
+
+def _limiter(initial=4, **options):
+    options.setdefault("min_limit", 1)
+    options.setdefault("max_limit", 8)
+    options.setdefault("window", 4)
+    options.setdefault("latency_target", 60)
+    options.setdefault("min_success_rate", 0.75)
+    return AdaptiveLimiter("example.com", initial, **options)
+
+
+async def _complete(limiter, outcomes):
+    """Run one page per outcome, all concurrently, so the limit is saturated."""
+    async def page(outcome):
+        async with limiter.slot() as lease:
+            await asyncio.sleep(0)
+            if outcome == "throttled":
+                lease.throttled()
+            elif outcome == "failed":
+                lease.failed()
+
+    await asyncio.gather(*(page(outcome) for outcome in outcomes))
+
+
+def test_a_healthy_saturated_window_adds_one_slot():
+    limiter = _limiter()
+    asyncio.run(_complete(limiter, ["ok"] * 4))
+    assert limiter.limit == 5
+    assert limiter.history[-1]['reason'].startswith("healthy")
+
+
+def test_the_limit_does_not_grow_when_it_was_never_reached():
+    limiter = _limiter()
+
+    async def run():
+        for _ in range(8):
+            await _complete(limiter, ["ok"])
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+
+
+def test_too_many_failures_keep_the_limit():
+    limiter = _limiter()
+    asyncio.run(_complete(limiter, ["ok", "ok", "failed", "failed"]))
+    assert limiter.limit == 4
+    assert limiter.failed == 2
+
+
+def test_throttling_halves_the_limit_once_per_congestion_event():
+    limiter = _limiter(initial=8)
+    # Every in-flight page sees the same throttling; only the first cut counts
+    asyncio.run(_complete(limiter, ["throttled"] * 4))
+    assert limiter.limit == 4
+    assert limiter.throttled == 4
+
+    asyncio.run(_complete(limiter, ["throttled"]))
+    assert limiter.limit == 2
+
+
+def test_the_limit_stays_within_bounds():
+    limiter = _limiter(initial=2, max_limit=3, min_limit=2)
+
+    async def run():
+        for _ in range(5):
+            await _complete(limiter, ["ok"] * limiter.limit * 4)
+        high = limiter.limit
+        await _complete(limiter, ["throttled"])
+        return high
+
+    assert asyncio.run(run()) == 3
+    assert limiter.limit == 2
+
+
+def test_no_more_than_limit_pages_run_at_once():
+    limiter = _limiter(initial=2, max_limit=2)
+    peak = 0
+
+    async def page():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(page() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_controller_keeps_one_limiter_per_domain_and_reports_changes():
+    changes = []
+    controller = ConcurrencyController(on_change=lambda limiter: changes.append(limiter.limit))
+    first = controller.limiter("example.com", 4)
+    assert controller.limiter("example.com", 10) is first
+
+    first.window = 1
+    asyncio.run(_complete(first, ["throttled"]))
+    assert changes == [2]
+    assert set(controller.get_stats()) == {"example_com"}
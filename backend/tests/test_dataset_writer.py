@@ -0,0 +1,53 @@
+"""Tests for batched dataset item ingestion."""
+
+import asyncio
+
+from services.dataset_writer import DatasetWriter
+
+
+def test_items_are_written_in_batches(db):
+    flushed = []
+
+    async def on_flush(total_written):
+        flushed.append(total_written)
+
+    async def run():
+        writer = DatasetWriter(db, "run-1", batch_size=10, flush_interval=60, on_flush=on_flush)
+        for i in range(25):
+            await writer.add({"n": i})
+        return await writer.close()
+
+    assert asyncio.run(run()) == 25
+    assert [doc['data']['n'] for doc in db.dataset_items.docs] == list(range(25))
+    assert all(doc['run_id'] == "run-1" for doc in db.dataset_items.docs)
+    # Batches written while an insert is in flight are coalesced; the last report is the total
+    assert len(flushed) >= 2
+    assert flushed == sorted(flushed) and flushed[-1] == 25
+
+
+def test_fields_are_the_union_in_first_seen_order(db):
+    async def run():
+        writer = DatasetWriter(db, "run-1")
+        await writer.add_many([{"b": 1, "a": 2}, {"a": 3, "c": 4}])
+        await writer.close()
+        return writer.get_fields()
+
+    assert asyncio.run(run()) == ["b", "a", "c"]
+
+
+def test_nothing_is_written_once_the_run_moved_to_another_worker(db):
+    owned = [True]
+
+    async def run():
+        writer = DatasetWriter(db, "run-1", batch_size=100, owns_run=lambda: owned[0])
+        await writer.add({"n": 1})
+        await writer.flush()
+        owned[0] = False
+        await writer.add({"n": 2})
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    assert [doc['data']['n'] for doc in db.dataset_items.docs] == [1]
+    assert writer.total_written == 1
+    assert writer.total_dropped == 1
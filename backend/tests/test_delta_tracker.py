@@ -0,0 +1,120 @@
+"""Tests for delta runs: classification against the previous run and removals."""
+
+import asyncio
+
+from services.delta_tracker import DeltaTracker, fingerprint, has_content, item_key
+
+
+async def _run(db, items, attempted=(), run_id="run"):
+    tracker = DeltaTracker(db, "schedule-1", run_id)
+    await tracker.load()
+    results = [await tracker.classify(item) for item in items]
+    tracker.mark_attempted(attempted)
+    removed = await tracker.finish()
+    return tracker, results, removed
+
+
+def test_item_key_prefers_asin_then_place_id_then_url():
+    assert item_key({"asin": "B0TEST0001", "url": "https://a"}) == "asin:B0TEST0001"
+    assert item_key({"placeId": "0x1:0x2", "url": "https://a"}) == "placeId:0x1:0x2"
+    assert item_key({"url": "https://a"}) == "url:https://a"
+    assert item_key({"title": "no key"}) is None
+
+
+def test_fingerprint_ignores_fields_that_vary_between_runs():
+    item = {"asin": "B0TEST0001", "price": 10.0}
+    assert fingerprint(item) == fingerprint({**item, "searchKeyword": "other", "cachedAt": "x"})
+    assert fingerprint(item) != fingerprint({**item, "price": 11.0})
+
+
+def test_first_run_reports_everything_as_new(db):
+    tracker, results, removed = asyncio.run(_run(db, [
+        {"asin": "A", "price": 1.0},
+        {"asin": "B", "price": 2.0},
+    ]))
+    assert [r['changeType'] for r in results] == ["new", "new"]
+    assert removed == []
+    assert tracker.counts["new"] == 2
+    assert len(db.delta_state.docs) == 2
+
+
+def test_second_run_reports_changes_and_removals_only(db):
+    async def run():
+        await _run(db, [
+            {"asin": "A", "price": 1.0},
+            {"asin": "B", "price": 2.0},
+            {"asin": "C", "price": 3.0},
+        ], run_id="run-1")
+        return await _run(db, [
+            {"asin": "A", "price": 1.0},
+            {"asin": "B", "price": 2.5},
+            {"asin": "D", "price": 4.0},
+        ], run_id="run-2")
+
+    tracker, results, removed = asyncio.run(run())
+    unchanged, changed, new = results
+    assert unchanged is None
+    assert changed['changeType'] == "changed"
+    assert changed['changedFields'] == ["price"]
+    assert changed['previous'] == {"price": 2.0}
+    assert new['changeType'] == "new"
+    assert [(item['asin'], item['changeType']) for item in removed] == [("C", "removed")]
+    assert {doc['key'] for doc in db.delta_state.docs} == {"asin:A", "asin:B", "asin:D"}
+    assert tracker.get_summary() == {
+        "new": 1, "changed": 1, "unchanged": 1, "removed": 1, "untracked": 0, "failed": 0
+    }
+
+
+def test_repeated_keys_in_one_run_are_stored_once(db):
+    _, results, _ = asyncio.run(_run(db, [{"asin": "A", "price": 1.0}, {"asin": "A", "price": 1.0}]))
+    assert results[0]['changeType'] == "new"
+    assert results[1] is None
+
+
+def test_items_without_a_key_are_always_stored(db):
+    tracker, results, _ = asyncio.run(_run(db, [{"title": "no key"}]))
+    assert results[0]['changeType'] == "new"
+    assert tracker.counts["untracked"] == 1
+    assert db.delta_state.docs == []
+
+
+def test_error_items_keep_the_previous_state(db):
+    async def run():
+        await _run(db, [{"asin": "A", "price": 1.0}], run_id="run-1")
+        second = await _run(db, [{"asin": "A", "error": "timeout"}], run_id="run-2")
+        third = await _run(db, [{"asin": "A", "price": 1.0}], run_id="run-3")
+        return second, third
+
+    (tracker, results, removed), (_, third_results, _) = asyncio.run(run())
+    # Stored as-is, neither diffed nor reported as removed
+    assert results == [{"asin": "A", "error": "timeout"}]
+    assert removed == []
+    assert tracker.counts["failed"] == 1
+    # The snapshot survived, so the next good run sees no change
+    assert third_results == [None]
+
+
+def test_blank_items_are_dropped_without_overwriting_the_snapshot(db):
+    blank = {"asin": "A", "url": "https://a", "prime": False, "images": [], "brand": None}
+    assert not has_content(blank)
+
+    async def run():
+        await _run(db, [{"asin": "A", "price": 1.0}], run_id="run-1")
+        return await _run(db, [blank], run_id="run-2")
+
+    tracker, results, removed = asyncio.run(run())
+    assert results == [None]
+    assert removed == []
+    assert tracker.counts["failed"] == 1
+    assert db.delta_state.docs[0]['data'] == {"asin": "A", "price": 1.0}
+
+
+def test_attempted_keys_are_not_reported_as_removed(db):
+    async def run():
+        await _run(db, [{"asin": "A", "price": 1.0}, {"asin": "B", "price": 2.0}], run_id="run-1")
+        # B was claimed but its page was throttled and produced nothing
+        return await _run(db, [{"asin": "A", "price": 1.0}], attempted=["asin:A", "asin:B"], run_id="run-2")
+
+    _, _, removed = asyncio.run(run())
+    assert removed == []
+    assert {doc['key'] for doc in db.delta_state.docs} == {"asin:A", "asin:B"}
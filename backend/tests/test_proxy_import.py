@@ -0,0 +1,78 @@
+"""Tests for parsing proxy lists and importing them without duplicates."""
+
+import asyncio
+
+import pytest
+
+from services.proxy_import import iter_lines, import_proxies, parse_proxy_line
+
+
+def test_parse_host_port_and_credentials():
+    assert parse_proxy_line("1.2.3.4:8080") == {"host": "1.2.3.4", "port": 8080, "protocol": "http"}
+    assert parse_proxy_line("Proxy.Example.COM:3128:user:p@ss", "socks5") == {
+        "host": "proxy.example.com", "port": 3128, "protocol": "socks5",
+        "username": "user", "password": "p@ss",
+    }
+
+
+def test_protocol_prefix_overrides_the_default():
+    assert parse_proxy_line("SOCKS4://1.2.3.4:1080", "http")["protocol"] == "socks4"
+
+
+@pytest.mark.parametrize("line", [
+    "1.2.3.4",
+    "1.2.3.4:notaport",
+    "1.2.3.4:0",
+    "1.2.3.4:65536",
+    "1.2.3.4:80:user",
+    "1.2.3.4:80:user:",
+    ":80",
+    "user@host:80",
+    "ftp://1.2.3.4:21",
+])
+def test_invalid_lines_are_rejected(line):
+    assert parse_proxy_line(line) is None
+
+
+def test_duplicates_in_the_input_are_counted_once(db):
+    lines = [
+        "# exported list",
+        "",
+        "1.2.3.4:8080",
+        "1.2.3.4:8080",
+        "http://1.2.3.4:8080",
+        "socks5://1.2.3.4:8080",
+        "5.6.7.8:3128:user:pass",
+        "garbage",
+    ]
+    counts = asyncio.run(import_proxies(db, lines, batch_size=2))
+    assert counts == {"accepted": 3, "duplicate": 2, "invalid": 1, "failed": 0}
+    assert {(p['host'], p['port'], p['protocol']) for p in db.proxies.docs} == {
+        ("1.2.3.4", 8080, "http"), ("1.2.3.4", 8080, "socks5"), ("5.6.7.8", 3128, "http"),
+    }
+    assert all(p['is_active'] for p in db.proxies.docs)
+
+
+def test_stored_proxies_are_left_untouched_on_reimport(db):
+    db.proxies.unique = [("host", "port", "protocol")]
+
+    async def run():
+        await import_proxies(db, ["1.2.3.4:8080"])
+        db.proxies.docs[0]['success_count'] = 7
+        return await import_proxies(db, ["1.2.3.4:8080", "9.9.9.9:80"])
+
+    counts = asyncio.run(run())
+    assert counts == {"accepted": 1, "duplicate": 1, "invalid": 0, "failed": 0}
+    assert len(db.proxies.docs) == 2
+    assert db.proxies.docs[0]['success_count'] == 7
+
+
+def test_byte_streams_are_split_across_chunk_boundaries():
+    async def chunks():
+        for chunk in (b"1.2.3.4:80\r\n5.6.", b"7.8:81\n", b"9.9.9.9:82"):
+            yield chunk
+
+    async def run():
+        return [line async for line in iter_lines(chunks())]
+
+    assert asyncio.run(run()) == ["1.2.3.4:80", "5.6.7.8:81", "9.9.9.9:82"]
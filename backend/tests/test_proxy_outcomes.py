@@ -0,0 +1,56 @@
+"""Tests for scraping outcomes fed back into proxy scoring, cooldowns and quarantine."""
+
+import asyncio
+
+from services.proxy_manager import ProxyManager
+
+
+def _manager(db, quarantine_after=3):
+    manager = ProxyManager(db)
+    manager.quarantine_after = quarantine_after
+    manager.pool.load([
+        {"id": "p0", "success_count": 9, "failure_count": 1, "response_time": 1.0},
+        {"id": "p1", "success_count": 5, "failure_count": 5, "response_time": 1.0},
+    ])
+    return manager
+
+
+def _record(manager, outcomes, **kwargs):
+    async def run():
+        for outcome in outcomes:
+            manager.record_outcome("p0", outcome, **kwargs)
+        manager.pool._timer.cancel()
+
+    asyncio.run(run())
+
+
+def test_blocks_cool_the_proxy_down_for_that_domain(db):
+    manager = _manager(db)
+    _record(manager, ["blocked"], domain="www.amazon.com")
+    assert manager.rotator.select("best", domain="amazon.com")['id'] == "p1"
+    assert manager.rotator.select("best", domain="google.com")['id'] == "p0"
+
+
+def test_outcomes_are_kept_out_of_failure_count(db):
+    manager = _manager(db, quarantine_after=10)
+    _record(manager, ["blocked", "timeout", "failed"])
+    proxy = manager.pool.get("p0")
+    assert proxy['failure_count'] == 1
+    assert (proxy['blocked_count'], proxy['timeout_count'], proxy['error_count']) == (1, 1, 1)
+    assert manager.outcomes == {"success": 0, "blocked": 1, "timeout": 1, "failed": 1}
+
+
+def test_repeated_bad_outcomes_quarantine_the_proxy(db):
+    manager = _manager(db)
+    _record(manager, ["timeout", "failed"])
+    assert not manager.rotator.is_quarantined("p0")
+    _record(manager, ["timeout"])
+    assert manager.rotator.is_quarantined("p0")
+    assert manager.quarantines == 1
+
+
+def test_a_success_resets_the_failure_streak(db):
+    manager = _manager(db)
+    _record(manager, ["timeout", "timeout", "success", "timeout", "timeout"])
+    assert not manager.rotator.is_quarantined("p0")
+    assert manager.pool.get("p0")['success_count'] == 10
@@ -0,0 +1,105 @@
+"""Tests for the scored in-memory proxy pool and its write-behind counters."""
+
+import asyncio
+
+from services.proxy_pool import ProxyPool, proxy_score
+
+
+def _proxy(proxy_id, success=0, failure=0, response_time=1.0):
+    return {
+        "id": proxy_id,
+        "success_count": success,
+        "failure_count": failure,
+        "response_time": response_time,
+    }
+
+
+def test_score_favours_success_rate_and_speed():
+    assert proxy_score(_proxy("a", success=9, failure=1)) > proxy_score(_proxy("b", success=1, failure=9))
+    assert proxy_score(_proxy("a", response_time=0.5)) > proxy_score(_proxy("b", response_time=5.0))
+    # Scraping outcomes count against the success rate without being failures
+    blocked = {**_proxy("c", success=5), "blocked_count": 5}
+    assert proxy_score(blocked) == proxy_score(_proxy("d", success=5, failure=5))
+
+
+def test_best_follows_score_changes(db):
+    pool = ProxyPool(db)
+    pool.load([_proxy("a", success=9, failure=1), _proxy("b", success=5, failure=5), _proxy("c", success=1, failure=9)])
+    assert pool.best()['id'] == "a"
+
+    for _ in range(20):
+        pool.apply("a", False)
+    assert pool.best()['id'] == "b"
+
+    pool.remove("b")
+    assert pool.best()['id'] == "a"
+    pool.remove("a")
+    assert pool.best()['id'] == "c"
+    assert len(pool) == 1
+    pool.add(_proxy("a", success=9, failure=1))
+    assert len(pool) == 2
+
+
+def test_stale_heap_entries_are_compacted(db):
+    pool = ProxyPool(db)
+    pool.load([_proxy(str(i)) for i in range(10)])
+    for _ in range(500):
+        pool.apply("0", True)
+    assert len(pool._heap) <= 2 * len(pool) + 64
+    assert pool.best()['id'] == "0"
+
+
+def test_random_and_nth_survive_removals(db):
+    pool = ProxyPool(db)
+    pool.load([_proxy(str(i)) for i in range(5)])
+    pool.remove("1")
+    pool.remove("4")
+    assert sorted(pool.nth(i)['id'] for i in range(len(pool))) == ["0", "2", "3"]
+    assert all(pool.random()['id'] in {"0", "2", "3"} for _ in range(50))
+    pool.add(_proxy("9"))
+    assert pool.get("9") is not None and len(pool) == 4
+
+
+def test_counters_are_flushed_in_one_bulk_write(db):
+    db.proxies.docs = [_proxy("a"), _proxy("b")]
+
+    async def run():
+        pool = ProxyPool(db, flush_interval=60)
+        pool.load([_proxy("a"), _proxy("b")])
+        pool.record("a", True, latency=2.0)
+        pool.record("a", True)
+        pool.record("b", False)
+        pool.record("b", False, outcome="blocked")
+        pool.record("b", False, outcome="timeout")
+        # Nothing is written until the flush
+        assert db.proxies.bulk_writes == 0
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(run())
+    a, b = db.proxies.docs
+    assert db.proxies.bulk_writes == 1
+    assert a['success_count'] == 2
+    # Moving average of the previous response time and the new latency
+    assert a['response_time'] == 1.0 * 0.8 + 2.0 * 0.2
+    # Only the plain failure reaches failure_count, which deactivation is based on
+    assert b['failure_count'] == 1
+    assert b['blocked_count'] == 1 and b['timeout_count'] == 1
+    assert pool.get("b")['blocked_count'] == 1
+
+
+def test_reload_keeps_counters_not_yet_flushed(db):
+    async def run():
+        pool = ProxyPool(db, flush_interval=60)
+        pool.load([_proxy("a")])
+        pool.record("a", True)
+        pool.record("a", False, outcome="failed")
+        # A reload from the database (which hasn't seen the flush) keeps them
+        pool.load([_proxy("a")])
+        proxy = dict(pool.get("a"))
+        pool._timer.cancel()
+        return proxy
+
+    proxy = asyncio.run(run())
+    assert proxy['success_count'] == 1
+    assert proxy['error_count'] == 1
@@ -0,0 +1,103 @@
+"""Tests for proxy rotation: strategies, domain cooldowns, quarantine and sticky sessions."""
+
+from services.proxy_pool import ProxyPool
+from services.proxy_rotation import ProxyRotator, normalize_domain
+
+
+def _rotator(db, count=3, **options):
+    pool = ProxyPool(db)
+    pool.load([
+        {"id": f"p{i}", "success_count": 10 - i, "failure_count": i, "response_time": 1.0}
+        for i in range(count)
+    ])
+    options.setdefault("min_interval_seconds", 0)
+    return ProxyRotator(pool, **options)
+
+
+def test_domains_are_normalized():
+    assert normalize_domain("www.Amazon.com") == "amazon.com"
+    assert normalize_domain("maps.google.com") == "maps.google.com"
+    assert normalize_domain("") is None
+
+
+def test_best_and_round_robin(db):
+    rotator = _rotator(db)
+    assert rotator.select("best")['id'] == "p0"
+    assert [rotator.select("round-robin")['id'] for _ in range(4)] == ["p0", "p1", "p2", "p0"]
+    assert rotator.selections == {"best": 1, "round-robin": 4}
+
+
+def test_unknown_strategy_falls_back_to_best(db):
+    assert _rotator(db).select("no-such-strategy")['id'] == "p0"
+
+
+def test_cooldown_keeps_a_proxy_away_from_one_domain_only(db):
+    rotator = _rotator(db)
+    rotator.cool_down("p0", "www.amazon.com")
+    assert rotator.select("best", domain="amazon.com")['id'] == "p1"
+    assert rotator.select("best", domain="google.com")['id'] == "p0"
+    assert rotator.get_stats()['cooling_down'] == {"amazon_com": 1}
+
+
+def test_when_every_proxy_is_cooling_the_first_released_is_used(db):
+    rotator = _rotator(db)
+    rotator.cool_down("p0", "amazon.com", 300)
+    rotator.cool_down("p1", "amazon.com", 60)
+    rotator.cool_down("p2", "amazon.com", 600)
+    assert rotator.select("best", domain="amazon.com")['id'] == "p1"
+
+
+def test_expired_cooldowns_are_released(db):
+    rotator = _rotator(db)
+    rotator.cool_down("p0", "amazon.com", 1e-9)
+    assert rotator.select("best", domain="amazon.com")['id'] == "p0"
+
+
+def test_quarantine_applies_to_every_domain(db):
+    rotator = _rotator(db)
+    rotator.quarantine("p0", 60)
+    assert rotator.is_quarantined("p0")
+    assert rotator.select("best")['id'] == "p1"
+    assert rotator.select("best", domain="google.com")['id'] == "p1"
+    assert rotator.get_stats()['quarantined'] == 1
+
+    rotator.quarantine("p1", -1)
+    assert not rotator.is_quarantined("p1")
+
+
+def test_min_interval_spreads_requests_but_never_blocks(db):
+    rotator = _rotator(db, count=2, min_interval_seconds=60)
+    picks = [rotator.select("best", domain="amazon.com")['id'] for _ in range(3)]
+    assert picks[:2] == ["p0", "p1"]
+    # Both proxies were used within the interval; one is reused rather than none
+    assert picks[2] is not None
+    assert rotator.rate_limited_fallbacks == 1
+
+
+def test_sticky_sessions_keep_their_proxy(db):
+    rotator = _rotator(db, sticky_fallback="round-robin")
+    first = rotator.select("sticky", session_id="run-1")['id']
+    other = rotator.select("sticky", session_id="run-2")['id']
+    assert first != other
+    assert [rotator.select("sticky", session_id="run-1")['id'] for _ in range(3)] == [first] * 3
+    assert rotator.get_stats()['sticky_sessions'] == 2
+
+    rotator.release_session("run-1")
+    assert rotator.get_stats()['sticky_sessions'] == 1
+
+
+def test_sticky_session_moves_on_when_its_proxy_is_blocked(db):
+    rotator = _rotator(db, sticky_fallback="best")
+    assert rotator.select("sticky", session_id="run-1", domain="amazon.com")['id'] == "p0"
+    rotator.cool_down("p0", "amazon.com")
+    assert rotator.select("sticky", session_id="run-1", domain="amazon.com")['id'] == "p1"
+    # The session is now bound to the new proxy, even once p0 is usable again
+    rotator._cooldowns.clear()
+    assert rotator.select("sticky", session_id="run-1", domain="amazon.com")['id'] == "p1"
+
+
+def test_sticky_session_moves_on_when_its_proxy_is_removed(db):
+    rotator = _rotator(db, sticky_fallback="best")
+    assert rotator.select("sticky", session_id="run-1")['id'] == "p0"
+    rotator.pool.remove("p0")
+    assert rotator.select("sticky", session_id="run-1")['id'] == "p1"
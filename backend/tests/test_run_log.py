@@ -0,0 +1,70 @@
+"""Tests for buffered run logs and paging through them."""
+
+import asyncio
+
+from services.run_log import RunLogSink, get_run_log_tail, get_run_logs
+
+
+async def _write_lines(db, count, max_lines=10, run_id="run-1"):
+    sink = RunLogSink(db, run_id, flush_interval_ms=60000, max_lines=max_lines)
+    for i in range(count):
+        await sink.add(f"line {i}")
+    await sink.close()
+    return sink
+
+
+def test_lines_are_stored_in_segments_with_sequence_numbers(db):
+    asyncio.run(_write_lines(db, 25))
+
+    segments = db.run_logs.docs
+    assert [(s['seq_start'], s['seq_end']) for s in segments] == [(0, 9), (10, 19), (20, 24)]
+    assert [line['seq'] for s in segments for line in s['lines']] == list(range(25))
+
+
+def test_pages_continue_after_the_last_sequence_number(db):
+    async def run():
+        await _write_lines(db, 25)
+        first = await get_run_logs(db, "run-1", limit=12)
+        second = await get_run_logs(db, "run-1", after=first[-1]['seq'], limit=12)
+        last = await get_run_logs(db, "run-1", after=second[-1]['seq'], limit=12)
+        done = await get_run_logs(db, "run-1", after=last[-1]['seq'])
+        return first, second, last, done
+
+    first, second, last, done = asyncio.run(run())
+    assert [line['message'] for line in first] == [f"line {i}" for i in range(12)]
+    assert [line['seq'] for line in second] == list(range(12, 24))
+    assert [line['seq'] for line in last] == [24]
+    assert done == []
+
+
+def test_tail_returns_the_last_lines_across_segments(db):
+    async def run():
+        await _write_lines(db, 25)
+        return await get_run_log_tail(db, "run-1", 13), await get_run_log_tail(db, "run-1", 0)
+
+    tail, empty = asyncio.run(run())
+    assert [line['seq'] for line in tail] == list(range(12, 25))
+    assert empty == []
+
+
+def test_a_new_sink_continues_numbering_for_a_reclaimed_run(db):
+    async def run():
+        await _write_lines(db, 5)
+        await _write_lines(db, 3)
+        return await get_run_logs(db, "run-1")
+
+    assert [line['seq'] for line in asyncio.run(run())] == list(range(8))
+
+
+def test_lines_past_the_run_limit_are_dropped_and_counted(db):
+    async def run():
+        sink = RunLogSink(db, "run-1", flush_interval_ms=60000, max_lines=100, max_run_lines=3)
+        for i in range(5):
+            await sink.add(f"line {i}")
+        await sink.close()
+        return sink, await get_run_logs(db, "run-1")
+
+    sink, lines = asyncio.run(run())
+    assert sink.dropped_lines == 2
+    assert [line['message'] for line in lines[:3]] == ["line 0", "line 1", "line 2"]
+    assert "2 log lines dropped" in lines[-1]['message']
@@ -0,0 +1,119 @@
+"""Tests for run queueing: priority order and fair sharing of worker slots."""
+
+import asyncio
+
+from services.task_manager import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_SCHEDULED,
+    TaskManager,
+    priority_for_origin,
+)
+
+
+def test_scheduler_runs_yield_to_everything_else():
+    assert priority_for_origin("Scheduler") == PRIORITY_SCHEDULED
+    assert priority_for_origin("Web") == PRIORITY_INTERACTIVE
+    assert priority_for_origin("API") == PRIORITY_INTERACTIVE
+
+
+def _queue(manager, runs, started):
+    """Queue (run_id, user_id, priority) runs that record their start and wait to be released."""
+    release = asyncio.Event()
+
+    async def job(run_id):
+        started.append(run_id)
+        await release.wait()
+
+    async def queue_all():
+        for run_id, user_id, priority in runs:
+            await manager.start_task(run_id, job(run_id), user_id=user_id, priority=priority)
+
+    return release, queue_all
+
+
+def test_interactive_runs_are_dispatched_before_scheduled_ones():
+    async def run():
+        manager = TaskManager(max_concurrent=1)
+        started = []
+        release, queue_all = _queue(manager, [
+            ("blocker", "u1", PRIORITY_INTERACTIVE),
+            ("scheduled", "u1", PRIORITY_SCHEDULED),
+            ("interactive", "u2", PRIORITY_INTERACTIVE),
+        ], started)
+        await queue_all()
+        order = manager.get_queue_order()
+        release.set()
+        while manager.get_running_count() or manager.get_queued_count():
+            await asyncio.sleep(0)
+        return order, started
+
+    order, started = asyncio.run(run())
+    assert order == ["interactive", "scheduled"]
+    assert started == ["blocker", "interactive", "scheduled"]
+
+
+def test_users_share_slots_round_robin():
+    async def run():
+        manager = TaskManager(max_concurrent=1)
+        started = []
+        release, queue_all = _queue(manager, [
+            ("blocker", "carol", PRIORITY_INTERACTIVE),
+            ("a1", "alice", PRIORITY_INTERACTIVE),
+            ("a2", "alice", PRIORITY_INTERACTIVE),
+            ("a3", "alice", PRIORITY_INTERACTIVE),
+            ("b1", "bob", PRIORITY_INTERACTIVE),
+            ("b2", "bob", PRIORITY_INTERACTIVE),
+        ], started)
+        await queue_all()
+        order = manager.get_queue_order()
+        release.set()
+        while manager.get_running_count() or manager.get_queued_count():
+            await asyncio.sleep(0)
+        return order, started
+
+    order, started = asyncio.run(run())
+    # Alice queued all her runs first, but Bob's are interleaved with them
+    assert order == ["a1", "b1", "a2", "b2", "a3"]
+    assert started == ["blocker"] + order
+
+
+def test_users_with_running_tasks_wait_for_those_without():
+    async def run():
+        manager = TaskManager(max_concurrent=1)
+        started = []
+        release, queue_all = _queue(manager, [
+            ("a1", "alice", PRIORITY_INTERACTIVE),
+            ("a2", "alice", PRIORITY_INTERACTIVE),
+            ("b1", "bob", PRIORITY_INTERACTIVE),
+        ], started)
+        await queue_all()
+        order = manager.get_queue_order()
+        release.set()
+        while manager.get_running_count() or manager.get_queued_count():
+            await asyncio.sleep(0)
+        return order
+
+    # a1 holds the slot, so Bob goes next even though a2 was queued first
+    assert asyncio.run(run()) == ["b1", "a2"]
+
+
+def test_a_queued_run_can_be_cancelled_before_it_starts():
+    async def run():
+        manager = TaskManager(max_concurrent=1)
+        started = []
+        release, queue_all = _queue(manager, [
+            ("first", "u1", PRIORITY_INTERACTIVE),
+            ("second", "u1", PRIORITY_INTERACTIVE),
+        ], started)
+        await queue_all()
+        cancelled = await manager.cancel_task("second")
+        queued = manager.get_queued_count()
+        release.set()
+        while manager.get_running_count():
+            await asyncio.sleep(0)
+        return cancelled, queued, started
+
+    cancelled, queued, started = asyncio.run(run())
+    assert cancelled is True
+    assert queued == 0
+    assert started == ["first"]
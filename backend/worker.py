@@ -0,0 +1,67 @@
+"""
+Scraper worker entry point for distributed run execution.
+Run with RUN_EXECUTION_MODE=distributed on the API nodes and start any number
+of workers with: python worker.py
+"""
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import os
+import signal
+import logging
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Set Playwright browsers path for containerized environment
+os.environ['PLAYWRIGHT_BROWSERS_PATH'] = '/pw-browsers'
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    # MongoDB connection
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    from routes import set_db
+    from routes.routes import execute_scraping_job
+    from services import RunQueue, RunWorker, get_proxy_manager
+    from scrapers import get_browser_pool, get_parse_executor
+
+    set_db(db)
+
+    worker = RunWorker(db, RunQueue(db), execute_scraping_job)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await get_browser_pool().start()
+        # The API process doesn't check proxies in distributed mode
+        get_proxy_manager(db).health_checker.start()
+        await worker.run()
+    finally:
+        try:
+            await get_browser_pool().close()
+            logger.info("✅ Browser pool closed")
+        except Exception as e:
+            logger.warning(f"Failed to close browser pool: {str(e)}")
+        get_parse_executor().shutdown()
+        await get_proxy_manager(db).close()
+
+        client.close()
+        logger.info("✅ MongoDB connection closed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())